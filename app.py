@@ -3,11 +3,46 @@
 #shorturl - https://shorturl.at/QQwMi
 
 import streamlit as st
-import pandas as pd
 import numpy as np
 import time
-import folium
-from streamlit_folium import st_folium
+import os
+import logging
+
+from flood_engine import (
+    calculate_flood_probability,
+    calculate_flood_probability_batch,
+    predict_flood_probability_model,
+    find_safety_band,
+    safety_band_ids,
+)
+from model_registry import get_registry
+from prediction_cache import get_prediction_cache, prediction_cache_metrics
+
+# Everything else (pandas, requests, folium, sklearn, scipy) is imported
+# inside the tab that needs it; only the selected tab runs, so a cold
+# start pays for Tab 1 alone. Budget: python -m benchmarks.import_budget
+
+SCRIPT_START = time.perf_counter()
+FEATURES_MODEL_FILE = "flood_features_model.pkl"
+FEATURE_STORE_LOCATION = "mumbai"
+FEATURE_STORE_INDEX = os.path.join("data", "features", FEATURE_STORE_LOCATION, "index.json")
+MANUAL_INPUTS = {"rainfall": 200, "humidity": 70, "temperature": 28, "soil": 40}
+FORMULA_DENSE_TABLE = True  # serve Tab 2's formula from per-axis tables instead of the LRU
+
+# Shown until the live poller's first reading arrives
+FALLBACK_MUMBAI_DATA = {
+    "Rainfall (mm)": 0,
+    "Humidity (%)": 47,
+    "Temperature (°C)": 28,
+    "Soil Moisture (%)": 37
+}
+
+logger = logging.getLogger("hydropredict")
+if not logger.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(_log_handler)
+    logger.setLevel(logging.INFO)
 
 # === Bright Mauve Theme (No Stars) ===
 st.markdown("""
@@ -78,8 +113,38 @@ st.markdown("""
 
 
 # =====================================================
-# STARTUP / TRAINING SIMULATION SCREEN
+# STARTUP / WARM-UP SCREEN
 # =====================================================
+# Each stage is cached once per server process (st.cache_resource or
+# the process-wide live poller), so later sessions pass through instantly.
+# Models are loaded by the tab that scores with them, not here: unpickling
+# a forest pulls in sklearn and scipy.
+@st.cache_resource(show_spinner=False)
+def warm_safety_index():
+    # Touches the precomputed band index for every whole percentage
+    return safety_band_ids(np.arange(0, 101)).size
+
+
+@st.cache_resource(show_spinner=False)
+def warm_scoring_engine():
+    # One pass over the whole integer input range of Tab 2
+    rainfall = np.arange(0, 601, dtype=np.float64)
+    scores = calculate_flood_probability_batch(rainfall, 70.0, 28.0, 40.0)
+    return scores.size
+
+
+def connect_live_feed():
+    # Starts the process-wide poller; later sessions find it running
+    from live_weather import get_poller
+    return get_poller().wait_ready(timeout=3)
+
+
+WARM_UP_STAGES = [
+    ("Preloading safety guide", warm_safety_index),
+    ("Warming up scoring engine", warm_scoring_engine),
+    ("Connecting to live weather feed", connect_live_feed),
+]
+
 if "boot_completed" not in st.session_state:
     placeholder = st.empty()
     with placeholder.container():
@@ -87,360 +152,233 @@ if "boot_completed" not in st.session_state:
         st.write("Initializing flood prediction engine... please wait")
 
         progress_bar = st.progress(0)
-        for i in range(100):
-            time.sleep(0.1)  # total ~10 seconds
-            progress_bar.progress(i + 1)
-
-        st.success("Model trained successfully!")
-        time.sleep(3)
-
-    # Clear the placeholder (remove training screen)
+        for i, (label, stage) in enumerate(WARM_UP_STAGES):
+            progress_bar.progress(i / len(WARM_UP_STAGES), text=label)
+            stage_start = time.perf_counter()
+            stage()
+            logger.info("Warm-up stage '%s' took %.3fs", label, time.perf_counter() - stage_start)
+        progress_bar.progress(1.0, text="Ready")
+
+    # Clear the placeholder (remove boot screen)
     placeholder.empty()
     st.session_state.boot_completed = True
+    st.session_state.time_to_interactive = time.perf_counter() - SCRIPT_START
+    logger.info("Time to interactive: %.3fs", st.session_state.time_to_interactive)
 
-st.title("HydroPredict AI — Flood Prediction System")
-st.markdown("Smart flood risk prediction based on environmental conditions.")
-
-# =====================================================
-# CONSTANTS & FEATURE SETUP
-# =====================================================
-FEATURES = [
-    "MonsoonIntensity",
-    "TopographyDrainage",
-    "ClimateChange",
-    "DamsQuality",
-    "Siltation",
-    "AgriculturalPractices",
-    "DrainageSystems",
-    "CoastalVulnerability",
-    "Landslides",
-    "Watersheds"
-]
-
-FEATURE_MAX = {
-    "MonsoonIntensity": 16,
-    "TopographyDrainage": 18,
-    "ClimateChange": 17,
-    "DamsQuality": 16,
-    "Siltation": 16,
-    "AgriculturalPractices": 16,
-    "DrainageSystems": 17,
-    "CoastalVulnerability": 17,
-    "Landslides": 16,
-    "Watersheds": 16
-}
-
-# =====================================================
-# INPUT → FEATURE MAPPING
-# =====================================================
-def map_user_inputs_to_features(rainfall, humidity, temperature, soil):
-    mapped = {}
-    # 🔹 Updated max rainfall to 600
-    rainfall_clamped = max(0.0, min(rainfall, 600.0))
-    rainfall_factor = rainfall_clamped / 600.0
-    TMIN = 10.0
-    TMAX = 45.0
-    temp_clamped = max(TMIN, min(temperature, TMAX))
-    temp_norm = (temp_clamped - TMIN) / (TMAX - TMIN)
-    inverted_temp = 1.0 - temp_norm
-    mapped["MonsoonIntensity"] = rainfall_factor * FEATURE_MAX["MonsoonIntensity"]
-    mapped["TopographyDrainage"] = max(0.0, 1.0 - soil / 120.0) * FEATURE_MAX["TopographyDrainage"]
-    mapped["ClimateChange"] = inverted_temp * FEATURE_MAX["ClimateChange"]
-    mapped["DamsQuality"] = max(0.0, 1.0 - rainfall_clamped / 180.0) * FEATURE_MAX["DamsQuality"]
-    mapped["Siltation"] = ((rainfall_clamped + soil) / 200.0) * FEATURE_MAX["Siltation"]
-    mapped["AgriculturalPractices"] = (soil / 100.0) * FEATURE_MAX["AgriculturalPractices"]
-    mapped["DrainageSystems"] = max(0.0, 1.0 - soil / 110.0) * FEATURE_MAX["DrainageSystems"]
-    mapped["CoastalVulnerability"] = ((humidity + (rainfall_clamped / 6.0)) / 110.0) * FEATURE_MAX["CoastalVulnerability"]
-    mapped["Landslides"] = ((rainfall_clamped + soil) / 240.0) * FEATURE_MAX["Landslides"]
-    mapped["Watersheds"] = max(0.0, 1.0 - rainfall_clamped / 300.0) * FEATURE_MAX["Watersheds"]
-    return mapped
-
-# =====================================================
-# FORMULA-BASED FLOOD RISK MODEL
-# =====================================================
-def calculate_flood_probability(rainfall, humidity, temperature, soil):
-    rainfall = float(rainfall)
-    humidity = float(humidity)
-    temperature = float(temperature)
-    soil = float(soil)
-
-    # No flood risk for very light rain
-    if rainfall < 50:
-        return 0.0
-
-    # Normalize rainfall (0 → 1)
-    rainfall_norm = min(rainfall / 600.0, 1.0)  # max rainfall = 600mm
-
-    # Normalize other factors
-    humidity_norm = humidity / 100.0
-    temperature_norm = 1.0 - ((temperature - 10.0) / (45.0 - 10.0))  # higher temp → lower risk
-    soil_norm = soil / 100.0
-
-    # Weighted combination (adjust weights as needed)
-    flood_score = (
-        0.4 * rainfall_norm +  # rainfall ~40%
-        0.3 * humidity_norm +  # humidity ~30%
-        0.2 * soil_norm +      # soil moisture ~20%
-        0.1 * temperature_norm # temperature modifier ~10%
-    )
-
-    # Clip to [0,1]
-    flood_score = np.clip(flood_score, 0.0, 1.0)
-    return flood_score
+with st.sidebar.expander("Model status"):
+    model_metrics = get_registry(FEATURES_MODEL_FILE).metrics()
+    if model_metrics["version"] is None:
+        st.write("No trained model loaded yet — Tab 2 loads it on first use.")
+    else:
+        st.metric("Model version", model_metrics["version"])
+        st.metric("Load time", f"{model_metrics['load_seconds'] * 1000:.1f} ms")
+        st.caption(f"{model_metrics['model_type']} · loaded {model_metrics['load_count']}× · "
+                   f"{model_metrics['load_errors']} load errors")
+
+with st.sidebar.expander("Prediction cache"):
+    cache_metrics = prediction_cache_metrics()
+    if not cache_metrics:
+        st.write("No predictions yet.")
+    for name, m in cache_metrics.items():
+        hit_rate = "–" if m["hit_rate"] is None else f"{m['hit_rate']:.1%}"
+        st.metric(f"{name} hit rate", hit_rate)
+        st.caption(f"{m['entries']}/{m['max_entries']} entries · {m['hits']} hits · {m['dense_hits']} table hits · "
+                   f"{m['misses']} misses · {m['evictions']} evictions · {m['invalidations']} invalidations")
+
+
+@st.cache_resource(show_spinner=False)
+def load_shelter_data():
+    # Built once per server process; the BallTree is shared by all sessions
+    from shelters import ShelterStore, load_area_centers
+    return ShelterStore.from_csv(), load_area_centers()
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_risk_layer(raster_stamp):
+    # Re-read whenever risk_raster.py replaces the raster or its meta; only
+    # the current stamp is kept so a replaced raster is released
+    from risk_raster import load_risk_raster
+    return load_risk_raster()
+
+
+def current_risk_layer():
+    from risk_raster import raster_stamp
+    stamp = raster_stamp()
+    return load_risk_layer(stamp) if stamp is not None else None
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_evacuation_router(shelter_version, road_version, risk_version, _risk_raster=None):
+    # One multi-source Dijkstra over the road graph per shelter set, road
+    # network and risk raster; None when no road network has been
+    # provided in data/roads/. Only the current versions are kept, so a
+    # superseded router and its graph are released
+    from routing import EvacuationRouter, load_road_graph
+    graph = load_road_graph()
+    if graph is None:
+        return None
+    if _risk_raster is not None:
+        graph = graph.without_flooded(_risk_raster.sample(graph.lat, graph.lon))
+    store, _ = load_shelter_data()
+    return EvacuationRouter(graph, store.shelters["lat"], store.shelters["lon"])
+
+
+def current_road_version():
+    from routing import road_files_stamp
+    return road_files_stamp()
+
+
+def current_router(shelter_version):
+    raster = current_risk_layer()
+    return load_evacuation_router(shelter_version, current_road_version(), raster and raster.version, raster)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def render_shelter_map(shelter_version, road_version, risk_version, lat, lon, k, show_all, show_risk):
+    # Keyed on the shelter-set, road network and raster versions, so
+    # editing shelters.csv or data/roads/ or re-scoring the grid re-renders
+    from shelter_map import build_shelter_map, render_map_html
+    store, _ = load_shelter_data()
+    router = current_router(shelter_version)
+    route = router.route(lat, lon) if router is not None else None
+    raster = current_risk_layer() if show_risk else None
+    return render_map_html(build_shelter_map(store, lat, lon, k, show_all, route, raster))
+
+
+def fill_from_recorded_day():
+    # Copies a day from the feature store into Tab 2's inputs; a day
+    # without a record falls back to the latest one before it
+    from feature_store import get_feature_store
+    store = get_feature_store()
+    day = st.session_state.recorded_day
+    row = store.lookup(FEATURE_STORE_LOCATION, day) if day is not None else None
+    if row is None:
+        return
+    soil = store.soil_percent(FEATURE_STORE_LOCATION, row["Soil Moisture"])
+    st.session_state.rainfall = int(np.clip(round(row["Rainfall"]), 0, 600))
+    st.session_state.humidity = int(np.clip(round(row["Humidity"]), 0, 100))
+    st.session_state.temperature = int(np.clip(round(row["Temperature"]), 10, 45))
+    st.session_state.soil = int(np.clip(round(soil), 0, 100))
+    st.session_state.recorded_from = row["date"]
+
+
+def show_safety_guide(risk_percent, heading):
+    # heading is formatted with the band's low/high bounds
+    match = find_safety_band(risk_percent)
+    if match is None:
+        return
+    (low, high), guide = match
+    st.markdown(heading.format(low=low, high=high))
+    st.markdown(f"**Before Flood:** {guide['Before']}")
+    st.markdown(f"**During Flood:** {guide['During']}")
+    st.markdown(f"**After Flood:** {guide['After']}")
 
 
-# =====================================================
-# SAFETY GUIDE
-# =====================================================
-safety_guide = {
-    (0, 10): {
-        "Before": (
-            "Keep checking daily weather forecasts and stay updated. "
-            "Clean drains and gutters around your home to ensure smooth water flow. "
-            "Stay aware, even if flood chances seem low."
-        ),
-        "During": (
-            "No major risk, but stay cautious if heavy rain continues. "
-            "Avoid unnecessary travel during rainfall. "
-            "Keep your emergency contacts handy just in case."
-        ),
-        "After": (
-            "Inspect your surroundings for waterlogging or leaks. "
-            "Dry out damp areas to prevent mosquito breeding. "
-            "Continue monitoring local weather updates."
-        ),
-    },
-    (10, 20): {
-        "Before": (
-            "Monitor rainfall and river level trends closely. "
-            "Prepare essential supplies like a torch, batteries, and first aid kit. "
-            "Ensure your family knows basic emergency numbers."
-        ),
-        "During": (
-            "Avoid walking in puddles or small flooded areas. "
-            "Keep all electronics unplugged during lightning or storms. "
-            "Monitor local alerts or advisories carefully."
-        ),
-        "After": (
-            "Clean surroundings to prevent mosquito growth. "
-            "Dispose of any waterlogged waste promptly. "
-            "Be alert for early signs of disease or contamination."
-        ),
-    },
-    (20, 30): {
-        "Before": (
-            "Store drinking water and food in sealed containers. "
-            "Check and reinforce any weak walls or basement leaks. "
-            "Keep valuables and documents in waterproof bags."
-        ),
-        "During": (
-            "Move important items to higher shelves. "
-            "Avoid outdoor activity in continuous rainfall. "
-            "Stay connected with neighbours for updates."
-        ),
-        "After": (
-            "Dry clothes and bedding immediately. "
-            "Clean drains and ensure flow of water. "
-            "Keep children away from muddy or wet areas."
-        ),
-    },
-    (30, 40): {
-        "Before": (
-            "Prepare an emergency go-bag with essentials. "
-            "Ensure everyone in the household knows safe exits. "
-            "Charge your phones and power banks fully."
-        ),
-        "During": (
-            "Avoid unnecessary movement and watch for rising water. "
-            "Keep listening to radio or local alerts. "
-            "Do not drive in heavy rain or flooded lanes."
-        ),
-        "After": (
-            "Sanitize stored water sources before use. "
-            "Help elderly neighbours with clean-up. "
-            "Check for cracks or electrical faults in the home."
-        ),
-    },
-    (40, 50): {
-        "Before": (
-            "Keep your emergency contact list visible and ready. "
-            "Move important possessions and electronics to upper floors. "
-            "Discuss safety plans with family members."
-        ),
-        "During": (
-            "Avoid basements and low-lying areas. "
-            "Do not touch electrical panels with wet hands. "
-            "Ensure pets are kept indoors and safe."
-        ),
-        "After": (
-            "Inspect building structures for any damage. "
-            "Avoid using tap water until confirmed safe. "
-            "Dry and disinfect floors and walls quickly."
-        ),
-    },
-    (50, 60): {
-        "Before": (
-            "Start partial evacuation if water levels are expected to rise. "
-            "Store clean water and non-perishable food items. "
-            "Keep emergency kits near main exits."
-        ),
-        "During": (
-            "Move to higher ground if floodwater approaches. "
-            "Avoid contact with floodwater—it may be contaminated. "
-            "Stay tuned to emergency broadcasts."
-        ),
-        "After": (
-            "Wait for official clearance before returning home. "
-            "Document damage for insurance or aid. "
-            "Do not consume flood-exposed food or water."
-        ),
-    },
-    (60, 70): {
-        "Before": (
-            "Stay ready for possible evacuation; stock up on essentials. "
-            "Keep vehicles fuelled and parked on higher ground. "
-            "Ensure kids and elderly know the evacuation plan."
-        ),
-        "During": (
-            "Shift immediately to upper floors or safe zones. "
-            "Avoid touching wet electrical wires or devices. "
-            "Keep communicating your location to local help lines."
-        ),
-        "After": (
-            "Allow authorities to declare it safe before cleanup. "
-            "Disinfect and air-dry your belongings thoroughly. "
-            "Support neighbours in rebuilding efforts."
-        ),
-    },
-    (70, 80): {
-        "Before": (
-            "Coordinate with local disaster groups or neighbours. "
-            "Keep all important documents in waterproof storage. "
-            "Pack your evacuation kit and stay alert for warnings."
-        ),
-        "During": (
-            "Evacuate immediately if advised by officials. "
-            "Avoid roads with moving or deep water. "
-            "Stay calm and assist others if possible."
-        ),
-        "After": (
-            "Do not touch damaged power lines or poles. "
-            "Clean and dry your home before turning on electricity. "
-            "Boil water before drinking."
-        ),
-    },
-    (80, 90): {
-        "Before": (
-            "Prepare for an emergency evacuation at any time. "
-            "Keep constant communication with local authorities. "
-            "Turn off main power and gas supplies before leaving."
-        ),
-        "During": (
-            "Do not delay evacuation; safety is priority. "
-            "Move to official shelters or high-rise safe areas. "
-            "Carry essentials only and stay with your group."
-        ),
-        "After": (
-            "Follow safety checks before re-entering flooded areas. "
-            "Clean with disinfectants to avoid infections. "
-            "Seek medical help if any injuries occur."
-        ),
-    },
-    (90, 100): {
-        "Before": (
-            "Full-scale flooding possible — immediate preparation required. "
-            "Evacuate low-lying zones early to avoid being trapped. "
-            "Ensure pets, elderly, and children are moved first."
-        ),
-        "During": (
-            "Call emergency helplines if trapped or isolated. "
-            "Avoid rooftops unless it’s the only option and signal for help. "
-            "Stay calm and conserve phone battery."
-        ),
-        "After": (
-            "Wait for official clearance before re-entry. "
-            "Thoroughly disinfect all water and food supplies. "
-            "Assist community members in post-flood recovery."
-        ),
-    },
-}
+st.title("HydroPredict AI — Flood Prediction System")
+st.markdown("Smart flood risk prediction based on environmental conditions.")
 
 # =====================================================
 # STREAMLIT UI — TABS
 # =====================================================
+# Switching tabs reruns the script and only the open tab's body runs
 tabs = st.tabs([
     "Mumbai Live Data",
     "Predict Flood Risk",
     "Flood Safety Guide",
     "Emergency Helplines",
     "Evacuation Route & Safe Shelters"
-])
+], key="active_tab", on_change="rerun")
 
 # ---------------- TAB 1 ----------------
 with tabs[0]:
     st.header("Mumbai Live Data (Automatically updated from Satellites)")
-    st.write("The data updates will be stopped after the event is over as our PCs will not be able to handle such an overload, but it can be done, given an ample amount of resources.")
-
-    mumbai_data = {
-        "Rainfall (mm)": 0,
-        "Humidity (%)": 47,
-        "Temperature (°C)": 28,
-        "Soil Moisture (%)": 37
-    }
-
-    df_mumbai = pd.DataFrame([mumbai_data])
-    st.table(df_mumbai)
-
-    flood_prob = calculate_flood_probability(
-        mumbai_data["Rainfall (mm)"],
-        mumbai_data["Humidity (%)"],
-        mumbai_data["Temperature (°C)"],
-        mumbai_data["Soil Moisture (%)"]
-    )
-
-    risk = round(flood_prob * 100, 2)
-    st.subheader(f"Predicted Flood Risk for Mumbai: {risk}%")
-
-    for (low, high), guide in safety_guide.items():
-        if low <= risk <= high:
-            st.markdown(f"Safety Measures ({low}-{high}% Risk Zone)")
-            st.markdown(f"**Before Flood:** {guide['Before']}")
-            st.markdown(f"**During Flood:** {guide['During']}")
-            st.markdown(f"**After Flood:** {guide['After']}")
-            break
+    if tabs[0].open:
+        from live_weather import get_poller
+        from forecast_timeline import get_forecast_timeline
+
+        st.write("Conditions are fetched once per server every few minutes and shared by all viewers, so the upstream load does not grow with the audience.")
+
+        reading = get_poller().latest()
+        if reading is None:
+            st.warning("Live data is not available yet — showing the last known reading.")
+            mumbai_data = FALLBACK_MUMBAI_DATA
+        else:
+            mumbai_data = reading["values"]
+            age_min = (time.time() - reading["fetched_at"]) / 60
+            status = "" if reading["fresh"] else " (stale — the weather service is not responding)"
+            st.caption(f"Updated {age_min:.0f} min ago{status}")
+
+        st.table([mumbai_data])
+
+        flood_prob = calculate_flood_probability(
+            mumbai_data["Rainfall (mm)"],
+            mumbai_data["Humidity (%)"],
+            mumbai_data["Temperature (°C)"],
+            mumbai_data["Soil Moisture (%)"]
+        )
+
+        risk = round(flood_prob * 100, 2)
+        st.subheader(f"Predicted Flood Risk for Mumbai: {risk}%")
+
+        show_safety_guide(risk, "Safety Measures ({low}-{high}% Risk Zone)")
+
+        st.subheader("Risk Outlook (next 16 days)")
+        outlook = get_forecast_timeline().refresh()
+        if outlook is None:
+            st.info("The forecast is not available right now.")
+        else:
+            st.bar_chart(outlook, x="date", y="Flood Risk (%)", color="kind")
+            upcoming = outlook[outlook["kind"] == "forecast"]
+            if len(upcoming):
+                peak = upcoming.loc[upcoming["Flood Risk (%)"].idxmax()]
+                st.caption(f"Highest forecast risk: {peak['Flood Risk (%)']:.2f}% on {peak['date']:%a %d %b}")
 
 # ---------------- TAB 2 ----------------
 with tabs[1]:
     st.header("Predict Flood Risk Manually")
-    rainfall = st.number_input("Rainfall (mm)", 0, 600, 200)
-    humidity = st.number_input("Humidity (%)", 0, 100, 70)
-    temperature = st.number_input("Temperature (°C)", 10, 45, 28)
-    soil = st.number_input("Soil Moisture (%)", 0, 100, 40)
-
-    if st.button("Predict Risk"):
-        flood_prob = calculate_flood_probability(rainfall, humidity, temperature, soil)
-        risk_percent = round(flood_prob * 100, 2)
-        st.subheader(f"Predicted Flood Risk: {risk_percent}%")
-
-        for (low, high), guide in safety_guide.items():
-            if low <= risk_percent <= high:
-                st.markdown(f"Safety Actions ({low}-{high}% Zone)")
-                st.markdown(f"**Before Flood:** {guide['Before']}")
-                st.markdown(f"**During Flood:** {guide['During']}")
-                st.markdown(f"**After Flood:** {guide['After']}")
-                break
+    if tabs[1].open:
+        stored_days = None
+        if os.path.exists(FEATURE_STORE_INDEX):
+            from feature_store import get_feature_store
+            stored_days = get_feature_store().date_range(FEATURE_STORE_LOCATION)
+        if stored_days is not None:
+            st.date_input("Fill in from a recorded day (Mumbai)", value=None, min_value=stored_days[0],
+                          max_value=stored_days[1], key="recorded_day", on_change=fill_from_recorded_day)
+            if st.session_state.get("recorded_from") is not None:
+                st.caption(f"Filled in from the record for {st.session_state.recorded_from:%d %b %Y}")
+
+        for key, default in MANUAL_INPUTS.items():
+            st.session_state.setdefault(key, default)
+        rainfall = st.number_input("Rainfall (mm)", 0, 600, key="rainfall")
+        humidity = st.number_input("Humidity (%)", 0, 100, key="humidity")
+        temperature = st.number_input("Temperature (°C)", 10, 45, key="temperature")
+        soil = st.number_input("Soil Moisture (%)", 0, 100, key="soil")
+
+        model_choice = "Formula"
+        if os.path.exists(FEATURES_MODEL_FILE):
+            model_choice = st.radio("Model", ["Formula", "Trained on flood.csv"], horizontal=True)
+
+        if st.button("Predict Risk"):
+            inputs = (rainfall, humidity, temperature, soil)
+            if model_choice == "Formula":
+                cache = get_prediction_cache("formula", dense=FORMULA_DENSE_TABLE)
+                flood_prob = cache.get(inputs, calculate_flood_probability)
+            else:
+                registry = get_registry(FEATURES_MODEL_FILE)
+                features_model = registry.get()
+                cache = get_prediction_cache(FEATURES_MODEL_FILE)
+                flood_prob = cache.get(inputs, lambda *x: predict_flood_probability_model(features_model, *x)[0],
+                                       version=registry.version)
+            risk_percent = round(flood_prob * 100, 2)
+            st.subheader(f"Predicted Flood Risk: {risk_percent}%")
+
+            show_safety_guide(risk_percent, "Safety Actions ({low}-{high}% Zone)")
 
 # ---------------- TAB 3 ----------------
 with tabs[2]:
     st.header("Flood Safety Guide — Based on Risk %")
     user_risk = st.slider("Select your estimated Flood Risk (%)", 0, 100, 30)
-    for (low, high), guide in safety_guide.items():
-        if low <= user_risk <= high:
-            st.markdown(f"### Safety Plan for {low}-{high}% Risk:")
-            st.markdown(f"**Before Flood:** {guide['Before']}")
-            st.markdown(f"**During Flood:** {guide['During']}")
-            st.markdown(f"**After Flood:** {guide['After']}")
-            break
+    show_safety_guide(user_risk, "### Safety Plan for {low}-{high}% Risk:")
 
 # ---------------- TAB 4 ----------------
 with tabs[3]:
@@ -479,71 +417,56 @@ with tabs[3]:
 # ---------------- TAB 5 ----------------
 with tabs[4]:
     st.header("Evacuation Route & Safe Shelters")
-    st.write("Select your area to view nearby safe shelters and recommended evacuation routes during heavy rainfall or flood alerts.")
-
-    # Define data for each area
-    evacuation_data = {
-        "Andheri": {
-            "center": [19.1197, 72.8468],
-            "shelters": [
-                {"name": "Andheri East Relief Camp", "lat": 19.1135, "lon": 72.8697},
-                {"name": "Andheri Sports Complex Shelter", "lat": 19.1260, "lon": 72.8360},
-                {"name": "Vile Parle Community Hall", "lat": 19.1020, "lon": 72.8440},
-            ],
-        },
-        "Kurla": {
-            "center": [19.0722, 72.8780],
-            "shelters": [
-                {"name": "Kurla Relief Camp", "lat": 19.0722, "lon": 72.8780},
-                {"name": "Nehru Nagar High School Shelter", "lat": 19.0655, "lon": 72.8825},
-                {"name": "BKC Public Ground", "lat": 19.0665, "lon": 72.8550},
-            ],
-        },
-        "Bandra": {
-            "center": [19.0545, 72.8400],
-            "shelters": [
-                {"name": "Bandra West Shelter", "lat": 19.0580, "lon": 72.8340},
-                {"name": "St. Andrew’s Auditorium", "lat": 19.0575, "lon": 72.8370},
-                {"name": "Bandra Reclamation Ground", "lat": 19.0500, "lon": 72.8405},
-            ],
-        },
-        "Dadar": {
-            "center": [19.0176, 72.8562],
-            "shelters": [
-                {"name": "Shivaji Park Hall Shelter", "lat": 19.0201, "lon": 72.8371},
-                {"name": "Dadar Railway Camp", "lat": 19.0168, "lon": 72.8449},
-                {"name": "Portuguese Church Shelter", "lat": 19.0231, "lon": 72.8441},
-            ],
-        },
-        "Powai": {
-            "center": [19.1176, 72.9060],
-            "shelters": [
-                {"name": "IIT Bombay Main Ground Shelter", "lat": 19.1334, "lon": 72.9133},
-                {"name": "Powai Lake View Relief Zone", "lat": 19.1102, "lon": 72.9053},
-                {"name": "Hiranandani Public School Shelter", "lat": 19.1213, "lon": 72.9120},
-            ],
-        }
-    }
-
-    # Dropdown for user area selection
-    area = st.selectbox("Select the area closest to you:", ["Andheri", "Kurla", "Bandra", "Dadar", "Powai"])
-
-    # Generate map dynamically based on selected area
-    data = evacuation_data.get(area)
-    if data is None:
-        st.error("No evacuation data found for this area!")
-    else:
-        m = folium.Map(location=data["center"], zoom_start=13)
-
-        for s in data["shelters"]:
-            folium.Marker(
-                [s["lat"], s["lon"]],
-                popup=s["name"],
-                icon=folium.Icon(color="green", icon="home")
-            ).add_to(m)
-
-        st_folium(m, width=1400, height=1000)
-        st.markdown(
-            "<p style='text-align:center; font-size:16px; color:lightgreen;'> Always follow official local evacuation orders and stay informed via government alerts.</p>",
-            unsafe_allow_html=True
-        )
+    if tabs[4].open:
+        st.write("Select your area to view nearby safe shelters and recommended evacuation routes during heavy rainfall or flood alerts.")
+
+        shelter_store, area_centers = load_shelter_data()
+
+        # Dropdown for user area selection; the area only sets the starting point
+        area = st.selectbox("Select the area closest to you:", list(area_centers))
+        center = area_centers[area]
+
+        col1, col2, col3 = st.columns(3)
+        user_lat = col1.number_input("Your latitude", value=float(center[0]), format="%.4f", key=f"lat_{area}")
+        user_lon = col2.number_input("Your longitude", value=float(center[1]), format="%.4f", key=f"lon_{area}")
+        k = col3.slider("Shelters to show", 1, min(10, len(shelter_store)), 3)
+
+        show_all = st.checkbox(f"Show all {len(shelter_store)} shelters on the map", value=False)
+        risk_layer = current_risk_layer()
+        show_risk = risk_layer is not None and st.checkbox("Overlay city-wide flood risk", value=True)
+
+        nearest = shelter_store.nearest_frame(user_lat, user_lon, k)
+
+        if nearest.empty:
+            st.error("No evacuation data found for this area!")
+        else:
+            st.dataframe(
+                nearest[["name", "area", "distance_km"]].round({"distance_km": 2}),
+                hide_index=True,
+            )
+
+            if risk_layer is not None:
+                point_risk = risk_layer.sample(user_lat, user_lon)[0]
+                if not np.isnan(point_risk):
+                    st.metric("Flood risk at this point", f"{point_risk:.2f}%")
+
+            router = current_router(shelter_store.version)
+            if router is None:
+                st.caption("No road network found in data/roads/ — distances are straight-line.")
+            else:
+                route = router.route(user_lat, user_lon)
+                if route is None:
+                    st.error("No shelter can be reached by road from this point!")
+                else:
+                    target = shelter_store.shelters.iloc[route["shelter"]]
+                    st.success(f"Recommended route: {route['total_m'] / 1000:.2f} km to {target['name']} "
+                               f"({route['road_m'] / 1000:.2f} km by road, {route['snap_m']:.0f} m to and from the road)")
+
+            map_html = render_shelter_map(shelter_store.version, current_road_version(),
+                                          risk_layer and risk_layer.version,
+                                          round(user_lat, 4), round(user_lon, 4), k, show_all, show_risk)
+            st.iframe(map_html, width=1400, height=1000)
+            st.markdown(
+                "<p style='text-align:center; font-size:16px; color:lightgreen;'> Always follow official local evacuation orders and stay informed via government alerts.</p>",
+                unsafe_allow_html=True
+            )
@@ -0,0 +1,62 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Daily Feature Builder Benchmark
+# --------------------------------------------------------------
+# Compares the batch STEP 2 + 3 path of train_flood_model.py with
+# the streaming builder in daily_features.py on synthetic hourly
+# histories of growing length: wall time, peak traced memory, and
+# an exact equality check of the resulting daily frames.
+#
+#   python -m benchmarks.bench_daily_features --years 5 10 20 40
+# ==============================================================
+
+import argparse
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.fake_open_meteo import canned_hourly
+from daily_features import build_daily_features_streaming
+from train_flood_model import add_soil_moisture_proxy, build_daily_features
+from weather_store import HOURLY_VARIABLES, month_ranges
+
+
+def hourly_months(start, end):
+    for first_day, last_day in month_ranges(start, end):
+        df = pd.DataFrame(canned_hourly(first_day, last_day, HOURLY_VARIABLES))
+        df["time"] = pd.to_datetime(df["time"])
+        yield df
+
+
+def _measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch vs streaming daily feature building")
+    parser.add_argument("--years", type=int, nargs="+", default=[5, 10, 20])
+    args = parser.parse_args()
+
+    print(f"{'years':>5} {'hours':>9} {'batch s':>8} {'batch MiB':>10} {'stream s':>9} {'stream MiB':>11}  identical")
+    for years in args.years:
+        start = pd.Timestamp("2025-01-01") - pd.DateOffset(years=years)
+        end = pd.Timestamp("2024-12-31")
+
+        def batch():
+            weather = pd.concat(hourly_months(start, end), ignore_index=True)
+            return add_soil_moisture_proxy(build_daily_features(weather)), len(weather)
+
+        (expected, hours), batch_s, batch_mib = _measure(batch)
+        got, stream_s, stream_mib = _measure(lambda: build_daily_features_streaming(hourly_months(start, end)))
+        identical = expected.equals(got)
+        print(f"{years:>5} {hours:>9,} {batch_s:>8.2f} {batch_mib:>10.1f} {stream_s:>9.2f} {stream_mib:>11.1f}  {identical}")
+
+
+if __name__ == "__main__":
+    main()
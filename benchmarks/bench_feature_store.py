@@ -0,0 +1,95 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Feature Store Benchmark
+# --------------------------------------------------------------
+# Fills a feature store with synthetic daily features for one
+# location and compares it with what train_flood_model.py used to
+# do (one CSV per location, re-read and filtered for every lookup):
+#
+#   - point-in-time lookups (cold: first touch of a partition; warm)
+#   - one-month range reads
+#   - a one-day upsert, which rewrites a single year partition
+#
+#   python -m benchmarks.bench_feature_store --years 10 50
+# ==============================================================
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from feature_store import FEATURE_COLUMNS, FeatureStore
+
+
+def synthetic_days(n_years, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2000-01-01", periods=n_years * 365, freq="D")
+    return pd.DataFrame({
+        "date": dates,
+        "Rainfall": rng.gamma(0.6, 15.0, len(dates)),
+        "Temperature": rng.normal(28.0, 3.0, len(dates)),
+        "Humidity": rng.uniform(40.0, 100.0, len(dates)),
+        "Soil Moisture": rng.uniform(0.0, 60.0, len(dates)),
+    })
+
+
+def _per_call(fn, args_list):
+    t0 = time.perf_counter()
+    results = [fn(*args) for args in args_list]
+    return (time.perf_counter() - t0) / len(args_list), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the daily feature store")
+    parser.add_argument("--years", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--lookups", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    for n_years in args.years:
+        daily = synthetic_days(n_years)
+        workdir = tempfile.mkdtemp(prefix="hydropredict-features-")
+        try:
+            store = FeatureStore(os.path.join(workdir, "features"))
+            t0 = time.perf_counter()
+            store.upsert("city", daily)
+            load_s = time.perf_counter() - t0
+            csv_path = os.path.join(workdir, "city_daily_features.csv")
+            daily.to_csv(csv_path, index=False)
+
+            picks = daily["date"].iloc[rng.integers(0, len(daily), args.lookups)] + pd.Timedelta(hours=12)
+            queries = [("city", d) for d in picks]
+            cold, found = _per_call(store.lookup, queries)
+            warm, _ = _per_call(store.lookup, queries)
+
+            def csv_lookup(day):
+                frame = pd.read_csv(csv_path, parse_dates=["date"])
+                return frame[frame["date"] <= day].iloc[-1]
+
+            csv_s, expected = _per_call(csv_lookup, [(d,) for d in picks[:20]])
+            same = all(np.allclose([f[c] for c in FEATURE_COLUMNS], e[FEATURE_COLUMNS].to_numpy(dtype=float))
+                       for f, e in zip(found, expected))
+
+            months = [("city", d, d + pd.Timedelta(days=30)) for d in picks[:100]]
+            range_s, _ = _per_call(store.range, months)
+
+            last = daily.iloc[[-1]].copy()
+            last["Rainfall"] += 1.0
+            t0 = time.perf_counter()
+            written = store.upsert("city", last)
+            upsert_s = time.perf_counter() - t0
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        print(f"\n{n_years} years ({len(daily):,} days, {n_years} partitions); initial load {load_s * 1000:.0f} ms")
+        print(f"   point lookup   cold {cold * 1e6:9.1f} µs   warm {warm * 1e6:7.1f} µs   "
+              f"CSV re-read {csv_s * 1e3:7.1f} ms   same rows: {same}")
+        print(f"   30-day range   {range_s * 1e6:9.1f} µs")
+        print(f"   one-day upsert {upsert_s * 1000:9.1f} ms   partitions rewritten: {len(written)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# ==============================================================
+# 🌊 HydroPredict AI - flood.csv Load Benchmark
+# --------------------------------------------------------------
+# Compares pd.read_csv with flood_dataset.load_flood_csv (cold:
+# builds the sidecar; warm: memory-maps it). Each mode runs in a
+# fresh interpreter so RSS numbers are not polluted by earlier runs.
+#
+#   python -m benchmarks.bench_flood_csv --repeats 5
+# ==============================================================
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+_CHILD = r"""
+import json, sys, time
+import numpy as np
+import pandas as pd
+import flood_dataset
+
+def rss_kib():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+mode, path = sys.argv[1], sys.argv[2]
+before = rss_kib()
+t0 = time.perf_counter()
+if mode == "read_csv":
+    df = pd.read_csv(path)
+else:
+    df = flood_dataset.load_flood_csv(path)
+load_s = time.perf_counter() - t0
+# Touch every value, as any analysis would
+t1 = time.perf_counter()
+total = float(sum(np.asarray(df[c]).sum(dtype=np.float64) for c in df.columns))
+scan_s = time.perf_counter() - t1
+print(json.dumps({
+    "mode": mode,
+    "load_ms": load_s * 1000,
+    "scan_ms": scan_s * 1000,
+    "rss_delta_mib": (rss_kib() - before) / 1024,
+    "frame_mib": df.memory_usage(deep=True).sum() / 2**20,
+    "checksum": round(total, 3),
+}))
+"""
+
+
+def run_mode(mode, csv_path):
+    out = subprocess.check_output([sys.executable, "-c", _CHILD, mode, str(csv_path)], cwd=REPO_ROOT, text=True)
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark flood.csv loading")
+    parser.add_argument("--csv", default=str(REPO_ROOT / "flood.csv"))
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    csv_path = Path(args.csv)
+    results = []
+    for _ in range(args.repeats):
+        shutil.rmtree(str(csv_path) + ".cache", ignore_errors=True)
+        results.append(run_mode("read_csv", csv_path))
+        results.append({**run_mode("sidecar", csv_path), "mode": "sidecar (cold)"})
+        results.append({**run_mode("sidecar", csv_path), "mode": "sidecar (warm)"})
+
+    print(f"{'mode':<16} {'load ms':>8} {'scan ms':>8} {'RSS Δ MiB':>10} {'frame MiB':>10}")
+    for mode in ("read_csv", "sidecar (cold)", "sidecar (warm)"):
+        runs = [r for r in results if r["mode"] == mode]
+        best = min(runs, key=lambda r: r["load_ms"])
+        print(f"{mode:<16} {best['load_ms']:>8.1f} {best['scan_ms']:>8.2f} "
+              f"{best['rss_delta_mib']:>10.1f} {best['frame_mib']:>10.2f}")
+    checksums = {round(r["checksum"], 0) for r in results}
+    print(f"checksums agree: {len(checksums) == 1}")
+
+
+if __name__ == "__main__":
+    main()
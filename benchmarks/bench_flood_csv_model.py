@@ -0,0 +1,89 @@
+# ==============================================================
+# 🌊 HydroPredict AI - flood.csv Model Fit/Predict Benchmark
+# --------------------------------------------------------------
+# Fits the FEATURES-column RandomForest used by
+# `train_flood_model.py --flood-csv` on synthetic flood.csv-like
+# data of several sizes (all cores), then measures prediction
+# latency for one app request routed through
+# map_user_inputs_to_features_batch, and bulk predict throughput,
+# for sklearn and the flat-array forest.
+#
+#   python -m benchmarks.bench_flood_csv_model --rows 50000 5000000
+# ==============================================================
+
+import argparse
+import os
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from flood_dataset import TARGET_COLUMN, load_flood_csv
+from flood_engine import FEATURES, map_user_inputs_to_features_batch
+from forest_compiler import compile_forest
+
+
+def synthetic_flood_rows(n_rows, seed=0):
+    # Resamples flood.csv's FEATURES columns independently and rebuilds a
+    # target from a least-squares fit of the real data plus noise
+    rng = np.random.default_rng(seed)
+    real = load_flood_csv(columns=FEATURES + [TARGET_COLUMN])
+    X_real = real[FEATURES].to_numpy(dtype=np.float64)
+    y_real = real[TARGET_COLUMN].to_numpy(dtype=np.float64)
+    A = np.column_stack([X_real, np.ones(len(X_real))])
+    coef, *_ = np.linalg.lstsq(A, y_real, rcond=None)
+    noise = float(np.std(y_real - A @ coef))
+
+    X = np.empty((n_rows, len(FEATURES)), dtype=np.float32)
+    for j in range(len(FEATURES)):
+        X[:, j] = rng.choice(X_real[:, j], size=n_rows)
+    y = X @ coef[:-1] + coef[-1] + rng.normal(0.0, noise, n_rows)
+    return X, y
+
+
+def _median_latency(fn, repeats=100):
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return float(np.median(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark flood.csv model fit and predict")
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 5_000_000])
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--max-depth", type=int, default=12)
+    args = parser.parse_args()
+
+    print(f"cores: {os.cpu_count()}  trees: {args.trees}  max_depth: {args.max_depth}")
+    print(f"{'rows':>10} {'fit s':>8} {'sk 1-req ms':>12} {'flat 1-req ms':>14} "
+          f"{'sk rows/s':>12} {'flat rows/s':>12}")
+    for n_rows in args.rows:
+        X, y = synthetic_flood_rows(n_rows)
+        model = RandomForestRegressor(n_estimators=args.trees, max_depth=args.max_depth, random_state=42, n_jobs=-1)
+        t0 = time.perf_counter()
+        model.fit(X, y)
+        fit_s = time.perf_counter() - t0
+        flat = compile_forest(model)
+
+        # One app request: map 4 inputs to FEATURES, then predict
+        request = lambda m: m.predict(map_user_inputs_to_features_batch(200, 70, 28, 40))
+        sk_req = _median_latency(lambda: request(model))
+        flat_req = _median_latency(lambda: request(flat))
+
+        X_bulk = X[: min(n_rows, 200_000)]
+        t0 = time.perf_counter()
+        model.predict(X_bulk)
+        sk_bulk = len(X_bulk) / (time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        flat.predict(X_bulk)
+        flat_bulk = len(X_bulk) / (time.perf_counter() - t0)
+
+        print(f"{n_rows:>10,} {fit_s:>8.2f} {sk_req * 1e3:>12.3f} {flat_req * 1e3:>14.3f} "
+              f"{sk_bulk:>12,.0f} {flat_bulk:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Forecast Timeline Benchmark
+# --------------------------------------------------------------
+# Replays hourly forecast refreshes over a simulated stretch of
+# days, as the app sees them (past week + 16-day forecast each
+# hour), through ForecastTimeline's incremental update. Compares each
+# refresh with recomputing STEP 2/3 of train_flood_model.py from
+# scratch over every hour seen so far, and checks both give the
+# same timeline. Finally runs one fetch end to end against the local
+# fake Open-Meteo server.
+#
+#   python -m benchmarks.bench_forecast_timeline --days 60
+# ==============================================================
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fake_open_meteo import canned_hourly, start_fake_server
+from flood_engine import calculate_flood_probability_batch
+from forecast_timeline import FORECAST_DAYS, PAST_DAYS, ForecastTimeline, SharedForecast
+from train_flood_model import add_soil_moisture_proxy, build_daily_features
+from weather_store import HOURLY_VARIABLES
+
+FEATURE_COLUMNS = ["Rainfall", "Temperature", "Humidity", "Soil Moisture", "Flood Risk (%)"]
+
+
+def hours_between(start, end):
+    hourly = canned_hourly(start, end, HOURLY_VARIABLES)
+    frame = pd.DataFrame({"time": pd.to_datetime(hourly["time"])})
+    for name in HOURLY_VARIABLES:
+        frame[name] = pd.Series(hourly[name], dtype="float64")
+    return frame
+
+
+def forecast_window(now):
+    # What a refresh at `now` returns: PAST_DAYS back to FORECAST_DAYS ahead
+    return hours_between(now.normalize() - pd.Timedelta(days=PAST_DAYS),
+                         now.normalize() + pd.Timedelta(days=FORECAST_DAYS - 1))
+
+
+def from_scratch(all_hours):
+    daily = add_soil_moisture_proxy(build_daily_features(all_hours))
+    daily["Flood Risk (%)"] = (calculate_flood_probability_batch(daily) * 100).round(2)
+    return daily
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the incremental forecast timeline")
+    parser.add_argument("--days", type=int, default=60, help="simulated days of hourly refreshes")
+    parser.add_argument("--scratch-days", type=int, nargs="+", default=[365, 5 * 365],
+                        help="also time from-scratch rebuilds over these history lengths")
+    args = parser.parse_args()
+
+    start = pd.Timestamp("2024-06-01 00:30")
+    refreshes = [start + pd.Timedelta(hours=h) for h in range(args.days * 24)]
+    windows = [forecast_window(now) for now in refreshes]
+
+    timeline = ForecastTimeline(history_days=10**6)
+    incremental = []
+    for now, window in zip(refreshes, windows):
+        t0 = time.perf_counter()
+        timeline.update(window, now)
+        incremental.append(time.perf_counter() - t0)
+
+    # The naive alternative: rebuild STEP 2/3 over every hour seen so far
+    all_hours = pd.concat(windows).drop_duplicates("time").sort_values("time", ignore_index=True)
+    t0 = time.perf_counter()
+    reference = from_scratch(all_hours)
+    scratch_s = time.perf_counter() - t0
+
+    equal = np.array_equal(timeline.frame[FEATURE_COLUMNS].to_numpy(), reference[FEATURE_COLUMNS].to_numpy())
+    incremental = np.array(incremental) * 1000
+    print(f"refreshes: {len(refreshes):,} (hourly over {args.days} days)  timeline rows: {len(timeline.frame)}")
+    print(f"incremental refresh p50 / p99: {np.percentile(incremental, 50):.2f} / {np.percentile(incremental, 99):.2f} ms")
+    print(f"from-scratch rebuild at the end: {scratch_s * 1000:.2f} ms")
+    print(f"hours committed once: {timeline.hours_committed:,}  forecast hours replayed: {timeline.hours_replayed:,}")
+    print(f"timeline equals from-scratch STEP 2/3: {equal}")
+    for days in args.scratch_days:
+        hours = hours_between(start.normalize(), start.normalize() + pd.Timedelta(days=days - 1))
+        t0 = time.perf_counter()
+        from_scratch(hours)
+        print(f"from-scratch rebuild over {days} days of history: {(time.perf_counter() - t0) * 1000:.2f} ms")
+
+    server, base_url = start_fake_server()
+    shared = SharedForecast(19.08, 72.88, url=f"{base_url}/v1/forecast")
+    t0 = time.perf_counter()
+    frame = shared.refresh(now=refreshes[-1])
+    fetch_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    shared.refresh(now=refreshes[-1])
+    cached_s = time.perf_counter() - t0
+    server.shutdown()
+    print(f"fake-server refresh: {fetch_s * 1000:.1f} ms for {len(frame)} days; "
+          f"repeat within max_age: {cached_s * 1e6:.1f} µs, upstream requests: {len(server.requests)}")
+
+
+if __name__ == "__main__":
+    main()
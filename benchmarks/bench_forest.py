@@ -0,0 +1,91 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Flat Forest vs sklearn Microbenchmark
+# --------------------------------------------------------------
+# Trains the same RandomForestRegressor(200 trees, depth 12) as
+# train_flood_model.py on synthetic daily weather features, then
+# compares sklearn's predict() with forest_compiler.FlatForest
+# for single-row latency and bulk throughput.
+#
+#   python -m benchmarks.bench_forest --rows 1000000
+# ==============================================================
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from forest_compiler import compile_forest
+
+FEATURE_COLUMNS = ["Rainfall", "Temperature", "Humidity", "Soil Moisture"]
+
+
+def synthetic_daily_features(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        "Rainfall": rng.gamma(0.6, 15.0, n_rows),
+        "Temperature": rng.normal(28.0, 3.0, n_rows),
+        "Humidity": rng.uniform(40.0, 100.0, n_rows),
+        "Soil Moisture": rng.uniform(0.0, 100.0, n_rows),
+    })
+    y = (
+        0.6 * X["Rainfall"] / X["Rainfall"].max()
+        + 0.3 * X["Soil Moisture"] / 100
+        + 0.1 * X["Humidity"] / 100
+    ) * 100
+    return X, y
+
+
+def _median_latency(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FlatForest against sklearn predict")
+    parser.add_argument("--train-rows", type=int, default=3000, help="≈ days of history used for fitting")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows for the throughput test")
+    parser.add_argument("--repeats", type=int, default=200, help="single-row latency samples")
+    args = parser.parse_args()
+
+    X_train, y_train = synthetic_daily_features(args.train_rows)
+    model = RandomForestRegressor(n_estimators=200, max_depth=12, random_state=42, n_jobs=-1)
+    model.fit(X_train, y_train)
+
+    start = time.perf_counter()
+    flat = compile_forest(model)
+    compile_s = time.perf_counter() - start
+    print(f"compiled {flat.n_trees} trees / {flat.n_nodes} nodes (depth {flat.depth}) in {compile_s * 1000:.1f} ms")
+
+    X_bulk, _ = synthetic_daily_features(args.rows, seed=1)
+    X_bulk_np = X_bulk.to_numpy()
+    one_row = X_bulk.iloc[:1]
+    one_row_np = X_bulk_np[:1]
+
+    # Accuracy check against sklearn on a sample
+    sample = X_bulk.iloc[:50_000]
+    max_diff = float(np.max(np.abs(flat.predict(sample) - model.predict(sample))))
+    print(f"max |flat - sklearn| on {len(sample)} rows: {max_diff:.3e}")
+
+    sk_single = _median_latency(lambda: model.predict(one_row), args.repeats)
+    flat_single = _median_latency(lambda: flat.predict(one_row_np), args.repeats)
+    print(f"single row   sklearn: {sk_single * 1e3:8.3f} ms   flat: {flat_single * 1e3:8.3f} ms   "
+          f"speedup: {sk_single / flat_single:6.1f}x")
+
+    start = time.perf_counter()
+    model.predict(X_bulk)
+    sk_bulk = time.perf_counter() - start
+    start = time.perf_counter()
+    flat.predict(X_bulk_np)
+    flat_bulk = time.perf_counter() - start
+    print(f"{args.rows:,} rows  sklearn: {args.rows / sk_bulk:12,.0f} rows/s   "
+          f"flat: {args.rows / flat_bulk:12,.0f} rows/s   speedup: {sk_bulk / flat_bulk:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Forest Training Scaling Benchmark
+# --------------------------------------------------------------
+# Fits train_flood_model.py's forest (200 trees, depth 12) on
+# synthetic daily features and reports:
+#
+#   1. scaling curves: fit time and speedup for every (cores, rows)
+#      pair, via forest_training.fit_forest(n_jobs=cores)
+#   2. input memory: the old float64 frame vs the float32 matrix
+#   3. out-of-core: in-memory fit vs memory-mapped shards grown with
+#      warm_start — wall time, peak RSS during the fit, R² on a
+#      held-out set
+#
+#   python -m benchmarks.bench_forest_training --rows 10000 100000 --cores 1 2 4 8
+#   python -m benchmarks.bench_forest_training --out-of-core-rows 2000000 --shard-rows 500000
+# ==============================================================
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from sklearn.metrics import r2_score
+
+from benchmarks.bench_forest import FEATURE_COLUMNS, synthetic_daily_features
+from forest_training import fit_forest, fit_forest_sharded, to_float32, write_shards
+from instrumentation import StageRecorder
+
+
+def default_cores():
+    cores, n = [], 1
+    while n < (os.cpu_count() or 1):
+        cores.append(n)
+        n *= 2
+    return cores + [os.cpu_count() or 1]
+
+
+def scaling_curves(rows_list, cores_list, trees, max_depth):
+    print(f"\nfit time (s) — {trees} trees, depth {max_depth}; speedup vs 1 core in brackets")
+    print(f"{'rows':>10} " + " ".join(f"{f'{c} cores':>16}" for c in cores_list))
+    for n_rows in rows_list:
+        X, y = synthetic_daily_features(n_rows)
+        X = to_float32(X)
+        cells, base = [], None
+        for cores in cores_list:
+            t0 = time.perf_counter()
+            fit_forest(X, y, n_estimators=trees, max_depth=max_depth, n_jobs=cores)
+            seconds = time.perf_counter() - t0
+            base = base or seconds
+            cells.append(f"{seconds:8.2f} ({base / seconds:4.1f}×)")
+        print(f"{n_rows:>10,} " + " ".join(f"{c:>16}" for c in cells))
+
+
+def input_memory(n_rows):
+    X, _ = synthetic_daily_features(n_rows)
+    as_float64 = X.to_numpy(dtype=np.float64).nbytes
+    as_float32 = to_float32(X).to_numpy().nbytes
+    print(f"\ninput matrix for {n_rows:,} rows: float64 {as_float64 / 2**20:.1f} MiB → "
+          f"float32 {as_float32 / 2**20:.1f} MiB")
+
+
+def out_of_core(n_rows, shard_rows, trees, max_depth, n_jobs):
+    # Rows are generated and written chunk by chunk, so the in-memory
+    # fit is the only step that ever holds the whole dataset
+    chunk_rows = min(shard_rows, 250_000)
+    chunks = [(i, min(chunk_rows, n_rows - i)) for i in range(0, n_rows, chunk_rows)]
+
+    def generate():
+        for i, n in chunks:
+            X, y = synthetic_daily_features(n, seed=i)
+            yield X, y
+
+    X_test, y_test = synthetic_daily_features(20_000, seed=10**6)
+    X_test = to_float32(X_test)
+    stages = StageRecorder()
+    workdir = tempfile.mkdtemp(prefix="hydropredict-shards-")
+    try:
+        with stages("write_shards", rows=n_rows):
+            shards = write_shards(generate(), os.path.join(workdir, "shards"), n_rows, FEATURE_COLUMNS,
+                                  -(-n_rows // shard_rows))
+        with stages("fit_sharded", rows=n_rows):
+            sharded = fit_forest_sharded(shards, n_estimators=trees, max_depth=max_depth, n_jobs=n_jobs)
+        sharded_r2 = r2_score(y_test, sharded.predict(X_test.to_numpy()))
+        del sharded
+
+        with stages("fit_in_memory", rows=n_rows):
+            X = np.concatenate([np.asarray(X) for X, _ in shards])
+            y = np.concatenate([np.asarray(y) for _, y in shards])
+            model = fit_forest(X, y, n_estimators=trees, max_depth=max_depth, n_jobs=n_jobs)
+        memory_r2 = r2_score(y_test, model.predict(X_test.to_numpy()))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    r2 = {"fit_sharded": sharded_r2, "fit_in_memory": memory_r2}
+    print(f"\nout-of-core: {n_rows:,} rows in {len(shards)} shards of ≤{shard_rows:,} rows, {n_jobs} cores")
+    print(f"{'stage':<15} {'wall s':>8} {'peak RSS MiB':>13} {'R²':>7}")
+    for r in stages.records:
+        r2_s = f"{r2[r['stage']]:7.4f}" if r["stage"] in r2 else f"{'-':>7}"
+        print(f"{r['stage']:<15} {r['wall_s']:8.2f} {r['peak_rss_mib']:>13} {r2_s}")
+    if stages.records[0]["peak_scope"] != "stage":
+        print("(peak RSS is the process peak here, not per stage)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel and out-of-core forest training")
+    parser.add_argument("--rows", type=int, nargs="+", default=[2_000, 10_000, 50_000])
+    parser.add_argument("--cores", type=int, nargs="+", default=default_cores())
+    parser.add_argument("--trees", type=int, default=200)
+    parser.add_argument("--max-depth", type=int, default=12)
+    parser.add_argument("--out-of-core-rows", type=int, default=400_000)
+    parser.add_argument("--shard-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"cpu_count: {os.cpu_count()}")
+    scaling_curves(args.rows, args.cores, args.trees, args.max_depth)
+    input_memory(max(args.rows))
+    out_of_core(args.out_of_core_rows, args.shard_rows, args.trees, args.max_depth, max(args.cores))
+
+
+if __name__ == "__main__":
+    main()
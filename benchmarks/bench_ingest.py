@@ -0,0 +1,76 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Incremental Ingestion Benchmark
+# --------------------------------------------------------------
+# Runs WeatherStore.sync() against the local fake Open-Meteo server
+# and reports requests made and wall time for: a cold sync, a
+# no-op re-sync, a sync interrupted by an outage and resumed, and a
+# catch-up sync after the archive publishes more days.
+#
+#   python -m benchmarks.bench_ingest --start 2018-01-01 --end 2024-12-31
+# ==============================================================
+
+import argparse
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+import requests
+
+from benchmarks.fake_open_meteo import canned_hourly, start_fake_server
+from weather_store import HOURLY_VARIABLES, WeatherStore
+
+LAT, LON = 19.075984, 72.877656
+
+
+def _timed_sync(store, server, url, start, end):
+    before = len(server.requests)
+    t0 = time.perf_counter()
+    error = None
+    try:
+        store.sync(LAT, LON, start, end, url=url, log=lambda msg: None)
+    except requests.RequestException as e:
+        error = type(e).__name__
+    return len(server.requests) - before, time.perf_counter() - t0, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental weather ingestion")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2018, 1, 1))
+    parser.add_argument("--end", type=date.fromisoformat, default=date(2024, 12, 31))
+    args = parser.parse_args()
+
+    lag_day = args.end - timedelta(days=10)
+    n_months = len(pd.period_range(args.start, args.end, freq="M"))
+
+    with tempfile.TemporaryDirectory() as root:
+        # Archive only published up to lag_day; the outage hits the
+        # 3rd request and every retry of it
+        server, base = start_fake_server(available_until=lag_day, fail_requests={3, 4, 5})
+        url = f"{base}/v1/archive"
+        store = WeatherStore("mumbai", root=root)
+
+        phases = [
+            ("interrupted sync", args.end),
+            ("resumed sync", args.end),
+            ("no-op re-sync", args.end),
+        ]
+        for label, end in phases:
+            n, secs, error = _timed_sync(store, server, url, args.start, end)
+            note = f" (failed: {error})" if error else ""
+            print(f"{label:<18} requests={n:<4} wall={secs:7.3f}s{note}")
+
+        server.available_until = None
+        n, secs, _ = _timed_sync(store, server, url, args.start, args.end)
+        print(f"{'archive catch-up':<18} requests={n:<4} wall={secs:7.3f}s")
+        server.shutdown()
+
+        stored = store.load()
+        expected = canned_hourly(args.start, args.end, HOURLY_VARIABLES)
+        assert len(stored) == len(expected["time"]), "stored row count differs from the archive"
+        assert stored["precipitation"].tolist() == expected["precipitation"], "stored values differ from the archive"
+        print(f"✅ {len(stored):,} hourly rows in {n_months} monthly partitions match a one-shot download")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Live Poller Benchmark
+# --------------------------------------------------------------
+# Simulates N concurrent dashboard viewers against the local fake
+# Open-Meteo server, twice:
+#
+#   per-viewer  every viewer fetches conditions itself on each rerun
+#   shared      one LivePoller feeds a TTL cache all viewers read
+#
+# and reports upstream requests, 304s and viewer read latency. A
+# third run injects an outage to show backoff and stale reads.
+#
+#   python -m benchmarks.bench_live_poller --viewers 50 --duration 5
+# ==============================================================
+
+import argparse
+import threading
+import time
+
+import numpy as np
+import requests
+
+from benchmarks.fake_open_meteo import start_fake_server
+from live_weather import CURRENT_VARIABLES, DAILY_VARIABLES, LivePoller, TTLCache, parse_conditions
+
+
+def run_viewers(n_viewers, duration, refresh, read):
+    # Each viewer "reruns" every `refresh` seconds; returns read latencies
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def viewer():
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            read(session)
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latencies.append(elapsed)
+            time.sleep(max(0.0, refresh - elapsed))
+
+    threads = [threading.Thread(target=viewer) for _ in range(n_viewers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return np.array(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared live-conditions poller")
+    parser.add_argument("--viewers", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--refresh", type=float, default=0.5, help="seconds between a viewer's reruns")
+    parser.add_argument("--interval", type=float, default=1.0, help="poller interval")
+    parser.add_argument("--update-period", type=float, default=2.0, help="how often upstream data changes")
+    args = parser.parse_args()
+
+    params = {"latitude": 19.08, "longitude": 72.88, "current": ",".join(CURRENT_VARIABLES),
+              "daily": ",".join(DAILY_VARIABLES), "forecast_days": 1}
+    print(f"viewers: {args.viewers}  duration: {args.duration}s  rerun every {args.refresh}s")
+    print(f"{'mode':<12} {'reads':>7} {'upstream':>9} {'304s':>6} {'p50 ms':>8} {'p99 ms':>8}")
+
+    server, base_url = start_fake_server(update_period=args.update_period)
+    url = f"{base_url}/v1/forecast"
+    lat = run_viewers(args.viewers, args.duration, args.refresh,
+                      lambda s: parse_conditions(s.get(url, params=params, timeout=10).json()))
+    print(f"{'per-viewer':<12} {len(lat):>7} {len(server.requests):>9} {server.not_modified:>6} "
+          f"{np.percentile(lat, 50):>8.2f} {np.percentile(lat, 99):>8.2f}")
+    server.shutdown()
+
+    server, base_url = start_fake_server(update_period=args.update_period)
+    poller = LivePoller(19.08, 72.88, url=f"{base_url}/v1/forecast", interval=args.interval,
+                        ttl=3 * args.interval, cache=TTLCache()).start()
+    poller.wait_ready(5)
+    lat = run_viewers(args.viewers, args.duration, args.refresh, lambda s: poller.latest())
+    poller.stop()
+    print(f"{'shared':<12} {len(lat):>7} {len(server.requests):>9} {server.not_modified:>6} "
+          f"{np.percentile(lat, 50):>8.4f} {np.percentile(lat, 99):>8.4f}")
+    server.shutdown()
+
+    # Outage: requests 2-6 fail; the poller backs off and viewers keep
+    # reading the last good reading, flagged stale once the TTL passes
+    server, base_url = start_fake_server(update_period=args.update_period, fail_requests=range(2, 7))
+    poller = LivePoller(19.08, 72.88, url=f"{base_url}/v1/forecast", interval=0.2, ttl=0.5,
+                        cache=TTLCache()).start()
+    poller.wait_ready(5)
+    stale = 0
+    reads = 0
+    deadline = time.perf_counter() + 3.0
+    while time.perf_counter() < deadline:
+        reads += 1
+        stale += not poller.latest()["fresh"]
+        time.sleep(0.01)
+    poller.stop()
+    server.shutdown()
+    print(f"outage: {poller.stats['errors']} failed polls, {poller.stats['requests']} upstream requests in 3s, "
+          f"{stale}/{reads} reads served stale, never empty")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Evacuation Map Render Benchmark
+# --------------------------------------------------------------
+# Compares the original Tab 5 map (one folium.Marker per shelter,
+# rebuilt and serialized on every rerun) with shelter_map's
+# clustered layer, for growing synthetic shelter sets. Reports HTML
+# payload bytes and server-side build+render time; a cached rerun
+# costs one st.cache_data lookup on top of that.
+#
+#   python -m benchmarks.bench_map_render --shelters 15 1000 10000 100000
+# ==============================================================
+
+import argparse
+import time
+
+import folium
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_shelters import random_points
+from shelter_map import build_shelter_map, render_map_html
+from shelters import ShelterStore
+
+CENTER = (19.0760, 72.8777)
+
+
+def per_marker_map(shelters):
+    # What Tab 5 used to do on every rerun
+    m = folium.Map(location=list(CENTER), zoom_start=13)
+    for s in shelters.itertuples(index=False):
+        folium.Marker(
+            [s.lat, s.lon],
+            popup=s.name,
+            icon=folium.Icon(color="green", icon="home")
+        ).add_to(m)
+    return m
+
+
+def _best_of(fn, repeats):
+    best, out = float("inf"), None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Tab 5 map rendering")
+    parser.add_argument("--shelters", type=int, nargs="+", default=[15, 1000, 10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'shelters':>9} {'before KiB':>11} {'before ms':>10} {'after KiB':>10} {'after ms':>9}")
+    for n in args.shelters:
+        lat, lon = random_points(n, rng)
+        shelters = pd.DataFrame({"name": [f"Shelter {i}" for i in range(n)], "lat": lat, "lon": lon})
+        store = ShelterStore(shelters)
+
+        before_s, before_html = _best_of(lambda: render_map_html(per_marker_map(shelters)), args.repeats)
+        after_s, after_html = _best_of(
+            lambda: render_map_html(build_shelter_map(store, *CENTER, k=3, show_all=True)), args.repeats)
+
+        print(f"{n:>9,} {len(before_html.encode()) / 1024:>11,.1f} {before_s * 1000:>10,.1f} "
+              f"{len(after_html.encode()) / 1024:>10,.1f} {after_s * 1000:>9,.1f}")
+
+
+if __name__ == "__main__":
+    main()
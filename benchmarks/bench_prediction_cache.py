@@ -0,0 +1,116 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Prediction Cache Benchmark
+# --------------------------------------------------------------
+# Replays a clustered stream of Tab 2 requests (a Zipf-distributed
+# mix of typical days over the integer input grid) and reports:
+#
+#   1. per-request latency: uncached vs LRU vs dense table, for the
+#      formula and for a flood.csv forest
+#   2. hit rate and evictions for several LRU sizes
+#   3. correctness: the per-axis table against the formula over the
+#      whole 601 × 101 × 36 × 101 grid, and invalidation on a new
+#      model version
+#
+#   python -m benchmarks.bench_prediction_cache --requests 200000 --sizes 256 1024 4096 16384
+# ==============================================================
+
+import argparse
+import time
+
+import numpy as np
+
+from flood_engine import (FEATURES, LIGHT_RAIN_MM, calculate_flood_probability, calculate_flood_probability_batch,
+                          formula_terms, predict_flood_probability_model)
+from prediction_cache import INPUT_RANGES, FormulaTable, PredictionCache
+
+
+def clustered_requests(n_requests, n_distinct=50_000, zipf_a=1.3, seed=0):
+    # n_requests integer input tuples; popular inputs repeat often
+    rng = np.random.default_rng(seed)
+    pool = np.column_stack([rng.integers(low, high + 1, n_distinct) for low, high in INPUT_RANGES.values()])
+    ranks = np.minimum(rng.zipf(zipf_a, n_requests) - 1, n_distinct - 1)
+    return [tuple(row) for row in pool[ranks].tolist()]
+
+
+def _per_request(fn, requests):
+    t0 = time.perf_counter()
+    for inputs in requests:
+        fn(inputs)
+    return (time.perf_counter() - t0) / len(requests)
+
+
+def check_dense_table():
+    # Every grid point, one rainfall value at a time; the table sums the
+    # same per-axis terms, so this compares for exact equality
+    (r_lo, r_hi), (h_lo, h_hi), (t_lo, t_hi), (s_lo, s_hi) = INPUT_RANGES.values()
+    humidity, temperature, soil = np.meshgrid(np.arange(h_lo, h_hi + 1), np.arange(t_lo, t_hi + 1),
+                                              np.arange(s_lo, s_hi + 1), indexing="ij")
+    _, h_term, s_term, t_term = formula_terms(0, humidity, temperature, soil)
+    mismatches = 0
+    for rainfall in range(r_lo, r_hi + 1):
+        r_term = formula_terms(rainfall, 0, 10, 0)[0]
+        table = 0.0 if rainfall < LIGHT_RAIN_MM else np.clip(r_term + h_term + s_term + t_term, 0.0, 1.0)
+        formula = calculate_flood_probability_batch(np.full(humidity.shape, rainfall), humidity, temperature, soil)
+        mismatches += int(np.count_nonzero(table != formula))
+    return humidity.size * (r_hi - r_lo + 1), mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Tab 2 prediction cache")
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--forest-requests", type=int, default=20_000, help="requests replayed against the forest")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 1024, 4096, 16384])
+    parser.add_argument("--skip-grid-check", action="store_true", help="skip the full-grid table comparison")
+    args = parser.parse_args()
+
+    requests = clustered_requests(args.requests)
+    print(f"{len(requests):,} requests, {len(set(requests)):,} distinct inputs")
+
+    # A forest the size of train_flood_model.py's, on flood.csv-like data
+    from sklearn.ensemble import RandomForestRegressor
+    rng = np.random.default_rng(1)
+    X = rng.uniform(0, 16, (5_000, len(FEATURES)))
+    forest = RandomForestRegressor(200, max_depth=12, random_state=0, n_jobs=1).fit(X, X.mean(axis=1) / 16)
+    forest_predict = lambda *x: predict_flood_probability_model(forest, *x)[0]
+
+    print(f"\n{'model':<8} {'path':<22} {'µs/request':>11}")
+    formula_uncached = _per_request(lambda x: calculate_flood_probability(*x), requests)
+    lru = PredictionCache(max(args.sizes))
+    formula_lru = _per_request(lambda x: lru.get(x, calculate_flood_probability), requests)
+    dense = PredictionCache(max(args.sizes), FormulaTable())
+    formula_dense = _per_request(lambda x: dense.get(x, calculate_flood_probability), requests)
+    # Each forest miss costs milliseconds, so it replays a prefix only
+    forest_requests = requests[:args.forest_requests]
+    forest_uncached = _per_request(lambda x: forest_predict(*x), forest_requests[:200])
+    forest_cache = PredictionCache(max(args.sizes))
+    forest_lru = _per_request(lambda x: forest_cache.get(x, forest_predict, version="v1"), forest_requests)
+    for model, path, seconds in [("formula", "uncached", formula_uncached),
+                                 ("formula", f"LRU ({max(args.sizes)})", formula_lru),
+                                 ("formula", "dense table", formula_dense),
+                                 ("forest", "uncached", forest_uncached),
+                                 ("forest", f"LRU ({max(args.sizes)})", forest_lru)]:
+        print(f"{model:<8} {path:<22} {seconds * 1e6:11.2f}")
+    print(f"dense table: {dense.dense_table.nbytes:,} bytes; forest over the first {len(forest_requests):,} requests "
+          f"(hit rate {forest_cache.metrics()['hit_rate']:.1%})")
+
+    print(f"\n{'LRU size':>9} {'hit rate':>9} {'evictions':>10}")
+    for size in args.sizes:
+        cache = PredictionCache(size)
+        for inputs in requests:
+            cache.get(inputs, calculate_flood_probability)
+        m = cache.metrics()
+        print(f"{size:>9,} {m['hit_rate']:>9.1%} {m['evictions']:>10,}")
+
+    sample = requests[:20_000]
+    same = all(dense.get(x, calculate_flood_probability) == calculate_flood_probability(*x) for x in sample)
+    forest_cache.get(requests[0], forest_predict, version="v2")
+    m = forest_cache.metrics()
+    print(f"\ndense lookups equal to the formula on {len(sample):,} requests: {same}")
+    print(f"new model version: {m['invalidations']} invalidation, {m['entries']} entry left")
+    if not args.skip_grid_check:
+        points, mismatches = check_dense_table()
+        print(f"per-axis table vs formula over the full grid: {points:,} points, {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Risk Raster Benchmark
+# --------------------------------------------------------------
+# Writes synthetic T x 1000 x 1000 weather grids as .npy files,
+# then scores them with risk_raster.write_risk_raster at several
+# tile sizes, and with one whole-array call for reference. Reports
+# cells/s and peak traced memory, and checks the tiled raster equals
+# the whole-array result cell for cell. Each run is in a fresh
+# interpreter so peak memory is per run.
+#
+#   python -m benchmarks.bench_risk_raster --size 1000 --steps 4
+#   python -m benchmarks.bench_risk_raster --write-grids grids/
+# ==============================================================
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_shelters import LAT_RANGE, LON_RANGE
+from risk_raster import GRID_INPUTS
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BOUNDS = [*LAT_RANGE, *LON_RANGE]
+
+_CHILD = r"""
+import json, os, sys, time, tracemalloc
+import numpy as np
+from flood_engine import calculate_flood_probability_batch
+from risk_raster import GRID_INPUTS, encode_probability, write_risk_raster
+
+grid_dir, out_path, tile_rows, bounds = sys.argv[1], sys.argv[2], sys.argv[3], json.loads(sys.argv[4])
+grids = [np.load(os.path.join(grid_dir, f"{n}.npy"), mmap_mode="r") for n in GRID_INPUTS]
+tracemalloc.start()
+t0 = time.perf_counter()
+if tile_rows == "whole":
+    np.save(out_path, encode_probability(calculate_flood_probability_batch(*grids)))
+else:
+    write_risk_raster(out_path, *grids, bounds=bounds, tile_rows=int(tile_rows))
+elapsed = time.perf_counter() - t0
+print(json.dumps({"seconds": elapsed, "peak_mib": tracemalloc.get_traced_memory()[1] / 2**20,
+                  "cells": int(grids[0].size)}))
+"""
+
+
+def write_grids(grid_dir, size, steps, seed=0):
+    # Smooth-ish fields: a monsoon band of heavy rain moving south
+    rng = np.random.default_rng(seed)
+    rows = np.linspace(0, 1, size)[:, None]
+    cols = np.linspace(0, 1, size)[None, :]
+    shape = (steps, size, size)
+    out = {n: np.lib.format.open_memmap(os.path.join(grid_dir, f"{n}.npy"), mode="w+", dtype=np.float32, shape=shape)
+           for n in GRID_INPUTS}
+    for t in range(steps):
+        band = np.exp(-((rows - t / max(steps, 1)) ** 2) / 0.02)
+        out["rainfall"][t] = 20 + 400 * band * (0.7 + 0.3 * cols) + rng.gamma(2.0, 10.0, (size, size))
+        out["humidity"][t] = np.clip(60 + 35 * band + rng.normal(0, 3, (size, size)), 0, 100)
+        out["temperature"][t] = 30 - 5 * band + rng.normal(0, 0.5, (size, size))
+        out["soil"][t] = np.clip(30 + 60 * band * rows, 0, 100)
+    for grid in out.values():
+        grid.flush()
+
+
+def run(grid_dir, out_path, tile_rows):
+    out = subprocess.check_output(
+        [sys.executable, "-c", _CHILD, grid_dir, out_path, str(tile_rows), json.dumps(BOUNDS)],
+        cwd=REPO_ROOT, text=True)
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tiled risk raster scoring")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=4)
+    parser.add_argument("--tile-rows", type=int, nargs="+", default=[32, 128, 512])
+    parser.add_argument("--write-grids", metavar="DIR", help="Only write synthetic grids for risk_raster.py")
+    args = parser.parse_args()
+
+    if args.write_grids:
+        os.makedirs(args.write_grids, exist_ok=True)
+        write_grids(args.write_grids, args.size, args.steps)
+        print(f"📁 Wrote {args.steps} x {args.size} x {args.size} grids to {args.write_grids}")
+        print(f"   python risk_raster.py --input-dir {args.write_grids} --bounds {' '.join(map(str, BOUNDS))}")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_grids(tmp, args.size, args.steps)
+        reference_path = os.path.join(tmp, "whole.npy")
+        reference = run(tmp, reference_path, "whole")
+
+        print(f"grid: {args.steps} x {args.size} x {args.size} ({reference['cells']:,} cells)")
+        print(f"{'tile rows':>10} {'seconds':>8} {'cells/s':>13} {'peak MiB':>9} {'equal':>6}")
+        print(f"{'whole':>10} {reference['seconds']:>8.2f} {reference['cells'] / reference['seconds']:>13,.0f} "
+              f"{reference['peak_mib']:>9.1f} {'-':>6}")
+        expected = np.load(reference_path)
+        for tile_rows in args.tile_rows:
+            out_path = os.path.join(tmp, f"tiled_{tile_rows}.npy")
+            r = run(tmp, out_path, tile_rows)
+            equal = np.array_equal(np.load(out_path), expected)
+            print(f"{tile_rows:>10} {r['seconds']:>8.2f} {r['cells'] / r['seconds']:>13,.0f} "
+                  f"{r['peak_mib']:>9.1f} {str(equal):>6}")
+
+
+if __name__ == "__main__":
+    main()
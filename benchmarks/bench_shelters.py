@@ -0,0 +1,80 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Nearest-Shelter Benchmark
+# --------------------------------------------------------------
+# Builds a ShelterStore over synthetic shelters scattered across
+# Mumbai and compares batched BallTree k-NN queries with a
+# brute-force haversine scan over every shelter.
+#
+#   python -m benchmarks.bench_shelters --shelters 100000 --queries 10000 --k 3
+# ==============================================================
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from shelters import ShelterStore, haversine_km
+
+# Rough Mumbai bounding box
+LAT_RANGE = (18.89, 19.27)
+LON_RANGE = (72.77, 72.99)
+
+
+def random_points(n, rng):
+    return rng.uniform(*LAT_RANGE, n), rng.uniform(*LON_RANGE, n)
+
+
+def brute_force_nearest(shelter_lat, shelter_lon, lats, lons, k, chunk=256):
+    dist = np.empty((len(lats), k))
+    idx = np.empty((len(lats), k), dtype=np.intp)
+    for start in range(0, len(lats), chunk):
+        stop = start + chunk
+        d = haversine_km(lats[start:stop, None], lons[start:stop, None], shelter_lat[None, :], shelter_lon[None, :])
+        part = np.argpartition(d, k - 1, axis=1)[:, :k]
+        part_d = np.take_along_axis(d, part, axis=1)
+        order = np.argsort(part_d, axis=1)
+        idx[start:stop] = np.take_along_axis(part, order, axis=1)
+        dist[start:stop] = np.take_along_axis(part_d, order, axis=1)
+    return dist, idx
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark nearest-shelter queries")
+    parser.add_argument("--shelters", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    s_lat, s_lon = random_points(args.shelters, rng)
+    shelters = pd.DataFrame({"name": [f"Shelter {i}" for i in range(args.shelters)], "lat": s_lat, "lon": s_lon})
+    q_lat, q_lon = random_points(args.queries, rng)
+
+    t0 = time.perf_counter()
+    store = ShelterStore(shelters)
+    build_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    tree_d, tree_i = store.nearest(q_lat, q_lon, args.k)
+    tree_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    single = [store.nearest(q_lat[i], q_lon[i], args.k) for i in range(min(1000, args.queries))]
+    single_s = (time.perf_counter() - t0) / len(single)
+
+    t0 = time.perf_counter()
+    brute_d, brute_i = brute_force_nearest(s_lat, s_lon, q_lat, q_lon, args.k)
+    brute_s = time.perf_counter() - t0
+
+    agree = np.allclose(tree_d, brute_d, rtol=0, atol=1e-6)
+    print(f"shelters: {args.shelters:,}  queries: {args.queries:,}  k: {args.k}")
+    print(f"BallTree build:          {build_s * 1000:10.1f} ms")
+    print(f"BallTree batched query:  {tree_s * 1000:10.1f} ms  ({args.queries / tree_s:12,.0f} queries/s)")
+    print(f"BallTree single query:   {single_s * 1e6:10.1f} µs")
+    print(f"Brute-force haversine:   {brute_s * 1000:10.1f} ms  ({args.queries / brute_s:12,.0f} queries/s)")
+    print(f"speedup (batched): {brute_s / tree_s:.1f}x   distances agree: {agree}")
+
+
+if __name__ == "__main__":
+    main()
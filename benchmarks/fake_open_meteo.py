@@ -0,0 +1,210 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Local Stand-in for the Open-Meteo API
+# --------------------------------------------------------------
+# Serves canned, deterministic Open-Meteo style JSON on localhost
+# so ingestion can be exercised without the network:
+#
+#   GET /v1/archive?start_date=...&end_date=...&hourly=...
+#   GET /v1/forecast?current=...&daily=...
+#   GET /v1/forecast?start_date=...&end_date=...&hourly=...
+#
+# Archive values are derived from the date alone, so repeated or
+# chunked requests for the same hours always agree. The server can
+# also simulate the archive's publishing lag (nulls after
+# `available_until`) and transient failures (HTTP 503).
+#
+# Forecast readings change once per `update_period` seconds and carry
+# an ETag and a Last-Modified date; a request whose If-None-Match still
+# matches (or, without one, whose If-Modified-Since is not older than
+# the reading) gets a 304. `send_etag = False` drops the ETag, as
+# some upstreams do.
+#
+#   python -m benchmarks.fake_open_meteo --port 8700
+#   OPEN_METEO_ARCHIVE_URL=http://127.0.0.1:8700/v1/archive python train_flood_model.py
+#   OPEN_METEO_FORECAST_URL=http://127.0.0.1:8700/v1/forecast streamlit run app.py
+# ==============================================================
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from datetime import date
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+
+def canned_hourly(start_date, end_date, variables, available_until=None):
+    times = pd.date_range(start_date, pd.Timestamp(end_date) + pd.Timedelta(hours=23), freq="h")
+    day = (times.normalize() - pd.Timestamp("1970-01-01")).days.to_numpy()
+    hour = times.hour.to_numpy()
+
+    # One generator per day keeps every hour independent of the request window
+    rain = np.concatenate([
+        np.random.default_rng(int(d)).gamma(0.3, 2.0, 24) for d in np.unique(day)
+    ]) if len(day) else np.array([])
+    monsoon = np.isin(times.month.to_numpy(), [6, 7, 8, 9])
+    values = {
+        "temperature_2m": np.round(27.0 + 4.0 * np.sin((hour - 9) / 24 * 2 * np.pi) - 2.0 * monsoon, 1),
+        "relativehumidity_2m": np.round(np.clip(65.0 + 25.0 * monsoon - 10.0 * np.sin(hour / 24 * 2 * np.pi), 0, 100)),
+        "precipitation": np.round(rain * np.where(monsoon, 4.0, 0.2), 1),
+    }
+
+    hourly = {"time": times.strftime("%Y-%m-%dT%H:%M").tolist()}
+    late = np.zeros(len(times), dtype=bool)
+    if available_until is not None:
+        late = times.normalize() > pd.Timestamp(available_until)
+    for name in variables:
+        column = values.get(name, np.zeros(len(times)))
+        hourly[name] = [None if l else float(v) for v, l in zip(column, late)]
+    return hourly
+
+
+def canned_current(bucket, current, daily):
+    # One reading per update bucket, monsoon-heavy so the risk moves
+    rng = np.random.default_rng(bucket)
+    values = {
+        "temperature_2m": round(float(rng.uniform(25.0, 31.0)), 1),
+        "relative_humidity_2m": round(float(rng.uniform(70.0, 98.0))),
+        "precipitation": round(float(rng.gamma(0.5, 4.0)), 1),
+        "soil_moisture_0_to_1cm": round(float(rng.uniform(0.25, 0.48)), 3),
+        "precipitation_sum": round(float(rng.gamma(1.5, 80.0)), 1),
+    }
+    return {
+        "current": {"time": time.strftime("%Y-%m-%dT%H:%M"), **{n: values.get(n, 0.0) for n in current}},
+        "daily": {"time": [time.strftime("%Y-%m-%d")], **{n: [values.get(n, 0.0)] for n in daily}},
+    }
+
+
+class FakeOpenMeteoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _forecast(self, query):
+        server = self.server
+        bucket = int(time.time() // server.update_period)
+        if "hourly" in query:
+            # Forecast hours are never "late", unlike the archive
+            body = {"hourly": canned_hourly(query["start_date"], query["end_date"], query["hourly"].split(","))}
+        else:
+            body = canned_current(bucket, query.get("current", "").split(","), query.get("daily", "").split(","))
+        body.update(latitude=float(query.get("latitude", 0)), longitude=float(query.get("longitude", 0)))
+        etag = '"%s"' % hashlib.blake2b(str(bucket).encode(), digest_size=8).hexdigest()
+        modified_at = bucket * server.update_period
+        headers = {"Last-Modified": formatdate(modified_at, usegmt=True)}
+        if server.send_etag:
+            headers["ETag"] = etag
+        if self._not_modified(etag if server.send_etag else None, modified_at):
+            with server.lock:
+                server.not_modified += 1
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send_json(200, body, headers)
+
+    def _not_modified(self, etag, modified_at):
+        # If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2)
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag is not None and if_none_match == etag
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is None:
+            return False
+        try:
+            return int(modified_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        server = self.server
+        with server.lock:
+            server.requests.append((url.path, query))
+            server.request_headers.append(dict(self.headers))
+            fail = len(server.requests) in server.fail_requests
+
+        if fail:
+            self._send_json(503, {"error": True, "reason": "simulated outage"})
+            return
+        if url.path == "/v1/forecast":
+            try:
+                self._forecast(query)
+            except (KeyError, ValueError) as e:
+                self._send_json(400, {"error": True, "reason": str(e)})
+            return
+        if url.path != "/v1/archive":
+            self._send_json(404, {"error": True, "reason": f"unknown path {url.path}"})
+            return
+
+        try:
+            variables = query["hourly"].split(",")
+            hourly = canned_hourly(query["start_date"], query["end_date"], variables, server.available_until)
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {"error": True, "reason": str(e)})
+            return
+        self._send_json(200, {
+            "latitude": float(query.get("latitude", 0)),
+            "longitude": float(query.get("longitude", 0)),
+            "timezone": query.get("timezone", "GMT"),
+            "hourly_units": {"time": "iso8601"},
+            "hourly": hourly,
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_server(port=0, available_until=None, fail_requests=(), update_period=900.0):
+    # Starts the server on a background thread; returns (server, base_url).
+    # fail_requests holds 1-based request numbers that should get a 503.
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeOpenMeteoHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.fail_requests = set(fail_requests)
+    server.available_until = available_until
+    server.update_period = update_period
+    server.not_modified = 0
+    server.send_etag = True
+    server.request_headers = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve canned Open-Meteo JSON on localhost")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--available-until", type=date.fromisoformat,
+                        help="return nulls for days after this date (archive lag)")
+    parser.add_argument("--update-period", type=float, default=900.0,
+                        help="seconds between changes of the /v1/forecast reading")
+    args = parser.parse_args()
+
+    server, base_url = start_fake_server(args.port, args.available_until, update_period=args.update_period)
+    print(f"🌦️ Fake Open-Meteo API on {base_url}/v1/archive and {base_url}/v1/forecast")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
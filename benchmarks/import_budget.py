@@ -0,0 +1,223 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Import-Time Budget
+# --------------------------------------------------------------
+# A cold container pays app.py's module-level imports before the
+# first byte of the page. This report reads those imports straight
+# from app.py (so a new top-level import is picked up automatically),
+# times them in a fresh interpreter with `python -X importtime`, and
+# fails when:
+#
+#   - the startup imports take longer than the budget, or
+#   - a heavy dependency (pandas, folium, sklearn, ...) is pulled in
+#     at startup instead of inside the tab that needs it, or
+#   - one is loaded by the boot screen's warm-up stages, which the
+#     import statements alone can't show (unpickling a model pulls in
+#     sklearn): the app's first run is executed with Streamlit's
+#     AppTest in a fresh interpreter, on a tab that imports nothing,
+#     and its sys.modules checked afterwards.
+#
+# The imports deferred into each tab (including the cached loaders it
+# calls) are timed too, each on top of the startup set, so their cost
+# stays visible.
+#
+#   python -m benchmarks.import_budget
+#   python -m benchmarks.import_budget --budget-ms 800 --top 15 --json imports.json
+# ==============================================================
+
+import argparse
+import ast
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+APP_FILE = REPO_ROOT / "app.py"
+STARTUP_BUDGET_MS = 750.0
+HEAVY_MODULES = ("pandas", "pyarrow", "folium", "branca", "sklearn", "scipy", "matplotlib", "seaborn")
+_MARKER = "--- import_budget:"
+# Connection refused at once, so the live poller's first attempt
+# doesn't hold up the warm-up run
+_DEAD_FORECAST_URL = "http://127.0.0.1:9/v1/forecast"
+# Tab 3 has no deferred imports, so whatever the first run loads
+# beyond startup comes from the warm-up stages
+_WARM_UP_TAB = "Flood Safety Guide"
+_WARM_UP_SCRIPT = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+at.session_state["active_tab"] = %r
+at.run()
+if at.exception:
+    raise SystemExit(at.exception[0].message)
+print(json.dumps(sorted({name.split(".")[0] for name in sys.modules})))
+"""
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _names(node):
+    if isinstance(node, ast.Import):
+        return [a.name for a in node.names]
+    if isinstance(node, ast.ImportFrom) and node.level == 0:
+        return [node.module]
+    return []
+
+
+def _tab_index(node):
+    # 0 for `with tabs[0]:`, None for anything else
+    if isinstance(node, ast.With):
+        expr = node.items[0].context_expr
+        if isinstance(expr, ast.Subscript) and isinstance(expr.slice, ast.Constant):
+            return expr.slice.value
+    return None
+
+
+def _imports_under(node):
+    modules = []
+    for child in ast.walk(node):
+        modules += [m for m in _names(child) if m not in modules]
+    return modules
+
+
+def app_imports(path=APP_FILE):
+    # (startup modules, {group: deferred modules}) from app.py's AST.
+    # A tab's group includes the imports of every app function it
+    # calls, directly or through other app functions
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    startup = [m for node in tree.body for m in _names(node)]
+    functions = {n.name: n for n in tree.body if isinstance(n, ast.FunctionDef)}
+
+    def reachable(node, seen):
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and child.id in functions and child.id not in seen:
+                seen.add(child.id)
+                reachable(functions[child.id], seen)
+        return seen
+
+    deferred, claimed = {}, set()
+    for node in tree.body:
+        index = _tab_index(node)
+        if index is None:
+            continue
+        called = reachable(node, set())
+        claimed |= called
+        modules = _imports_under(node)
+        for name in sorted(called):
+            modules += [m for m in _imports_under(functions[name]) if m not in modules]
+        if modules:
+            deferred[f"tab {index + 1}"] = modules
+    for name, node in functions.items():
+        modules = _imports_under(node)
+        if modules and name not in claimed:
+            deferred[name] = modules
+    return startup, deferred
+
+
+def _run(startup, modules=()):
+    # One fresh interpreter: the startup set, then `modules` on top of
+    # it, with a marker on stderr between the two
+    script = f"import {', '.join(startup)}"
+    if modules:
+        script += f"\nimport sys; sys.stderr.write({_MARKER!r} + '\\n')\nimport {', '.join(modules)}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    sections = ([], [])
+    current = sections[0]
+    for line in result.stderr.splitlines():
+        if line.startswith(_MARKER):
+            current = sections[1]
+            continue
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            current.append((name, int(self_us), int(cumulative_us), len(indent)))
+    return sections
+
+
+def measure(startup, deferred, repeats=5):
+    # Median over `repeats` fresh interpreters of the summed self time,
+    # for startup and for each deferred group on top of it; each group
+    # is timed on its own, so groups don't hide each other's imports.
+    # Also returns the last run's per-module rows per section
+    samples, sections = {"startup": []}, {}
+    for _ in range(repeats):
+        for group, modules in [("startup", ()), *deferred.items()]:
+            base, extra = _run(startup, modules)
+            if group == "startup":
+                samples["startup"].append(sum(r[1] for r in base) / 1000)
+                sections["startup"] = base
+            else:
+                samples.setdefault(group, []).append(sum(r[1] for r in extra) / 1000)
+                sections[group] = extra
+    return {s: statistics.median(v) for s, v in samples.items()}, sections
+
+
+def warm_up_modules():
+    # Top-level packages in sys.modules after app.py's first run (boot
+    # screen warm-up, then _WARM_UP_TAB) in a fresh interpreter
+    env = dict(os.environ, OPEN_METEO_FORECAST_URL=_DEAD_FORECAST_URL)
+    result = subprocess.run([sys.executable, "-c", _WARM_UP_SCRIPT % _WARM_UP_TAB],
+                            cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError((result.stderr or result.stdout).strip().splitlines()[-1])
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+def top_level(rows, top):
+    # Packages imported directly by the section, slowest first
+    roots = [(name, cumulative / 1000) for name, _, cumulative, depth in rows if depth == 1]
+    return sorted(roots, key=lambda r: -r[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report app.py's import time and enforce a startup budget")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS, help="allowed startup import time")
+    parser.add_argument("--repeats", type=int, default=5, help="fresh interpreters to take the median over")
+    parser.add_argument("--top", type=int, default=10, help="slowest packages to list per section")
+    parser.add_argument("--json", metavar="PATH", help="also write the report here")
+    args = parser.parse_args()
+
+    startup, deferred = app_imports()
+    totals, sections = measure(startup, deferred, args.repeats)
+    loaded = {name.split(".")[0] for name, *_ in sections["startup"]}
+    heavy = sorted(set(HEAVY_MODULES) & loaded)
+    heavy_warm_up = sorted(set(HEAVY_MODULES) & warm_up_modules())
+
+    for section, rows in sections.items():
+        label = "startup (module level)" if section == "startup" else f"deferred: {section}"
+        print(f"\n{label}: {totals[section]:.1f} ms, {len(rows)} modules")
+        for name, ms in top_level(rows, args.top):
+            print(f"   {name:<28} {ms:8.1f} ms")
+
+    within = totals["startup"] <= args.budget_ms
+    print(f"\n{'✅' if within else '🚨'} Startup imports: {totals['startup']:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if heavy:
+        print(f"🚨 Heavy modules imported at startup: {', '.join(heavy)}")
+    if heavy_warm_up:
+        print(f"🚨 Heavy modules loaded by the warm-up: {', '.join(heavy_warm_up)}")
+    else:
+        print("✅ No heavy modules loaded by the warm-up")
+
+    if args.json:
+        report = {
+            "budget_ms": args.budget_ms,
+            "totals_ms": totals,
+            "heavy_at_startup": heavy,
+            "heavy_after_warm_up": heavy_warm_up,
+            "sections": {s: [{"module": n, "self_us": a, "cumulative_us": c} for n, a, c, _ in rows]
+                         for s, rows in sections.items()},
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📁 Report written to {args.json}")
+    return 0 if within and not heavy and not heavy_warm_up else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
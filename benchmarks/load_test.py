@@ -0,0 +1,171 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Scoring API Load Test
+# --------------------------------------------------------------
+# Drives flood_api.py on localhost with concurrent keep-alive
+# clients and reports throughput and latency percentiles.
+#
+#   python -m benchmarks.load_test --clients 16 --duration 10
+#   python -m benchmarks.load_test --url http://127.0.0.1:8600 --batch-size 1000
+# ==============================================================
+
+import argparse
+import http.client
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_healthy(host, port, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"scoring API on {host}:{port} did not become healthy")
+
+
+def spawn_server():
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, str(REPO_ROOT / "flood_api.py"), "--port", str(port)],
+        cwd=REPO_ROOT,
+        stdout=subprocess.DEVNULL,
+    )
+    _wait_until_healthy("127.0.0.1", port)
+    return proc, "127.0.0.1", port
+
+
+def make_payloads(batch_size, count, seed=0):
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for _ in range(count):
+        columns = {
+            "rainfall": rng.integers(0, 601, batch_size),
+            "humidity": rng.integers(0, 101, batch_size),
+            "temperature": rng.integers(10, 46, batch_size),
+            "soil": rng.integers(0, 101, batch_size),
+        }
+        if batch_size == 1:
+            body = {k: int(v[0]) for k, v in columns.items()}
+        else:
+            body = {k: v.tolist() for k, v in columns.items()}
+        payloads.append(json.dumps(body).encode("utf-8"))
+    return payloads
+
+
+def _client(host, port, path, payloads, stop_at, latencies, errors):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    i = 0
+    while time.perf_counter() < stop_at:
+        body = payloads[i % len(payloads)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def run_load_test(host, port, clients, duration, batch_size):
+    path = "/score" if batch_size == 1 else "/score/batch"
+    payloads = make_payloads(batch_size, count=64)
+    per_client = [([], []) for _ in range(clients)]
+    stop_at = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_client, args=(host, port, path, payloads, stop_at, lat, err))
+        for lat, err in per_client
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array([x for lat, _ in per_client for x in lat])
+    errors = sum(len(err) for _, err in per_client)
+    requests_ok = latencies.size
+    result = {
+        "clients": clients,
+        "batch_size": batch_size,
+        "duration_s": round(elapsed, 3),
+        "requests": requests_ok,
+        "errors": errors,
+        "requests_per_s": round(requests_ok / elapsed, 1),
+        "rows_per_s": round(requests_ok * batch_size / elapsed, 1),
+    }
+    if requests_ok:
+        for q in (50, 95, 99):
+            result[f"p{q}_ms"] = round(float(np.percentile(latencies, q)) * 1000, 3)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HydroPredict scoring API")
+    parser.add_argument("--url", help="target an already running API instead of spawning one")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 100, 1000],
+                        help="rows per request; 1 uses /score, more uses /score/batch")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    args = parser.parse_args()
+
+    proc = None
+    if args.url:
+        target = urlparse(args.url)
+        host, port = target.hostname, target.port or 80
+        _wait_until_healthy(host, port)
+    else:
+        proc, host, port = spawn_server()
+
+    try:
+        for batch_size in args.batch_size:
+            result = run_load_test(host, port, args.clients, args.duration, batch_size)
+            if args.json:
+                print(json.dumps(result))
+            else:
+                print(
+                    f"batch={batch_size:<5} clients={result['clients']:<3} "
+                    f"req/s={result['requests_per_s']:<9} rows/s={result['rows_per_s']:<11} "
+                    f"p50={result.get('p50_ms')}ms p95={result.get('p95_ms')}ms "
+                    f"p99={result.get('p99_ms')}ms errors={result['errors']}"
+                )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
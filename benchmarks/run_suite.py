@@ -0,0 +1,302 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Benchmark Suite
+# --------------------------------------------------------------
+# One entry point for the numbers that matter when changing the
+# scoring core, training or the dashboard:
+#
+#   scoring   scalar vs batch calculate_flood_probability
+#   mapping   scalar vs batch map_user_inputs_to_features
+#   bands     find_safety_band vs safety_band_ids
+#   forest    RandomForest fit / predict at several data sizes
+#   dataset   flood.csv via pd.read_csv vs the memory-mapped sidecar
+#   apptest   full app.py script run and rerun via Streamlit AppTest
+#   imports   app.py's startup and per-tab import time (-X importtime)
+#
+# Results are written as JSON and compared with a stored baseline;
+# any metric slower than baseline × (1 + tolerance) is flagged and
+# the run exits with status 1.
+#
+#   python -m benchmarks.run_suite --json results.json
+#   python -m benchmarks.run_suite --cases scoring bands --quick
+#   python -m benchmarks.run_suite --update-baseline
+# ==============================================================
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = REPO_ROOT / "benchmarks" / "baseline.json"
+DEFAULT_TOLERANCE = 0.30
+
+
+def _best(fn, repeats=5, number=1):
+    # Best-of-`repeats` seconds per call, as timeit does
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def _weather_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(0, 600, n), rng.uniform(0, 100, n), rng.uniform(10, 45, n), rng.uniform(0, 100, n))
+
+
+# --------------------------------------------------------------
+# Cases: each returns ({metric: (value, unit)}, {check: bool})
+# --------------------------------------------------------------
+def case_scoring(quick):
+    from flood_engine import calculate_flood_probability, calculate_flood_probability_batch
+
+    n = 2_000 if quick else 20_000
+    r, h, t, s = _weather_inputs(n)
+    rows = list(zip(r.tolist(), h.tolist(), t.tolist(), s.tolist()))
+    scalar = _best(lambda: [calculate_flood_probability(*row) for row in rows], repeats=3) / n
+    batch = _best(lambda: calculate_flood_probability_batch(r, h, t, s), repeats=20) / n
+    same = np.array_equal([calculate_flood_probability(*row) for row in rows], calculate_flood_probability_batch(r, h, t, s))
+    return {
+        "scoring.scalar_per_row": (scalar * 1e6, "us"),
+        "scoring.batch_per_row": (batch * 1e6, "us"),
+    }, {"scoring.batch_equals_scalar": bool(same)}
+
+
+def case_mapping(quick):
+    from flood_engine import FEATURES, map_user_inputs_to_features, map_user_inputs_to_features_batch
+
+    n = 2_000 if quick else 20_000
+    r, h, t, s = _weather_inputs(n, seed=1)
+    rows = list(zip(r.tolist(), h.tolist(), t.tolist(), s.tolist()))
+    scalar = _best(lambda: [map_user_inputs_to_features(*row) for row in rows], repeats=3) / n
+    batch = _best(lambda: map_user_inputs_to_features_batch(r, h, t, s), repeats=20) / n
+    scalar_matrix = np.array([[m[f] for f in FEATURES] for m in (map_user_inputs_to_features(*row) for row in rows)])
+    same = np.array_equal(scalar_matrix, map_user_inputs_to_features_batch(r, h, t, s))
+    return {
+        "mapping.scalar_per_row": (scalar * 1e6, "us"),
+        "mapping.batch_per_row": (batch * 1e6, "us"),
+    }, {"mapping.batch_equals_scalar": bool(same)}
+
+
+def case_bands(quick):
+    from flood_engine import SAFETY_BANDS, find_safety_band, safety_band_ids
+
+    n = 10_000 if quick else 100_000
+    risk = np.random.default_rng(2).uniform(-5, 105, n)
+    values = risk.tolist()
+    scalar = _best(lambda: [find_safety_band(v) for v in values], repeats=3) / n
+    batch = _best(lambda: safety_band_ids(risk), repeats=20) / n
+
+    ids = safety_band_ids(risk)
+    scalar_bands = [m[0] if m else None for m in (find_safety_band(v) for v in values)]
+    batch_bands = [SAFETY_BANDS[i] if i >= 0 else None for i in ids.tolist()]
+    return {
+        "bands.scalar_per_lookup": (scalar * 1e6, "us"),
+        "bands.batch_per_lookup": (batch * 1e6, "us"),
+    }, {"bands.batch_equals_scalar": scalar_bands == batch_bands}
+
+
+def case_forest(quick):
+    from sklearn.ensemble import RandomForestRegressor
+
+    from benchmarks.bench_forest import synthetic_daily_features
+
+    metrics = {}
+    X_pred, _ = synthetic_daily_features(10_000, seed=9)
+    for n_rows in ([1_000, 5_000] if quick else [1_000, 10_000, 50_000]):
+        X, y = synthetic_daily_features(n_rows)
+        model = RandomForestRegressor(n_estimators=50, max_depth=12, random_state=42, n_jobs=-1)
+        t0 = time.perf_counter()
+        model.fit(X, y)
+        metrics[f"forest.fit_{n_rows}_rows"] = (time.perf_counter() - t0, "s")
+        metrics[f"forest.predict_10k_rows_after_{n_rows}"] = (_best(lambda: model.predict(X_pred), repeats=3) * 1e3, "ms")
+        metrics[f"forest.predict_1_row_after_{n_rows}"] = (_best(lambda: model.predict(X_pred[:1]), repeats=20) * 1e3, "ms")
+    return metrics, {}
+
+
+def case_dataset(quick):
+    import pandas as pd
+
+    from flood_dataset import load_flood_csv
+
+    csv_path = str(REPO_ROOT / "flood.csv")
+    load_flood_csv(csv_path)  # make sure the sidecar exists
+    read_csv = _best(lambda: pd.read_csv(csv_path), repeats=3)
+    sidecar = _best(lambda: load_flood_csv(csv_path), repeats=10)
+    same = load_flood_csv(csv_path).shape == pd.read_csv(csv_path).shape
+    return {
+        "dataset.read_csv": (read_csv * 1e3, "ms"),
+        "dataset.sidecar_warm": (sidecar * 1e3, "ms"),
+    }, {"dataset.shapes_match": bool(same)}
+
+
+def case_apptest(quick):
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks.fake_open_meteo import start_fake_server
+
+    # Live data comes from the local fake server, never the network
+    server, base_url = start_fake_server()
+    os.environ["OPEN_METEO_FORECAST_URL"] = f"{base_url}/v1/forecast"
+    cwd = os.getcwd()
+    os.chdir(REPO_ROOT)
+    try:
+        at = AppTest.from_file(str(REPO_ROOT / "app.py"), default_timeout=120)
+        t0 = time.perf_counter()
+        at.run()
+        first = time.perf_counter() - t0
+        ok = not at.exception
+        reruns = []
+        for _ in range(3 if quick else 10):
+            t0 = time.perf_counter()
+            at.run()
+            reruns.append(time.perf_counter() - t0)
+        # AppTest doesn't carry the selected tab into the next run, so
+        # select "Predict Flood Risk" before each one
+        at.session_state["active_tab"] = "Predict Flood Risk"
+        at.run()
+        clicks = []
+        for _ in range(3 if quick else 10):
+            at.button[0].click()
+            at.session_state["active_tab"] = "Predict Flood Risk"
+            t0 = time.perf_counter()
+            at.run()
+            clicks.append(time.perf_counter() - t0)
+            ok = ok and not at.exception and len(at.subheader) > 0
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+    return {
+        "apptest.first_run": (first * 1e3, "ms"),
+        "apptest.rerun_median": (float(np.median(reruns)) * 1e3, "ms"),
+        "apptest.button_rerun": (float(np.median(clicks)) * 1e3, "ms"),
+    }, {"apptest.no_exceptions": bool(ok)}
+
+
+def case_imports(quick):
+    from benchmarks.import_budget import HEAVY_MODULES, STARTUP_BUDGET_MS, app_imports, measure, warm_up_modules
+
+    startup, deferred = app_imports()
+    totals, sections = measure(startup, deferred, repeats=3 if quick else 7)
+    loaded = {name.split(".")[0] for name, *_ in sections["startup"]}
+    metrics = {f"imports.{group.replace(' ', '_')}": (ms, "ms") for group, ms in totals.items()}
+    return metrics, {
+        "imports.startup_within_budget": totals["startup"] <= STARTUP_BUDGET_MS,
+        "imports.no_heavy_at_startup": not set(HEAVY_MODULES) & loaded,
+        "imports.no_heavy_after_warm_up": not set(HEAVY_MODULES) & warm_up_modules(),
+    }
+
+
+CASES = {
+    "scoring": case_scoring,
+    "mapping": case_mapping,
+    "bands": case_bands,
+    "forest": case_forest,
+    "dataset": case_dataset,
+    "apptest": case_apptest,
+    "imports": case_imports,
+}
+
+
+def environment():
+    import pandas as pd
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def compare(results, baseline, tolerance):
+    # Returns rows of (metric, value, unit, baseline, ratio, status)
+    rows = []
+    for name, record in results["metrics"].items():
+        base = baseline.get("metrics", {}).get(name) if baseline else None
+        if base is None or not base["value"]:
+            rows.append((name, record["value"], record["unit"], None, None, "new"))
+            continue
+        ratio = record["value"] / base["value"]
+        status = "REGRESSION" if ratio > 1 + tolerance else "faster" if ratio < 1 - tolerance else "ok"
+        rows.append((name, record["value"], record["unit"], base["value"], ratio, status))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the HydroPredict benchmark suite")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--quick", action="store_true", help="smaller inputs, for a fast smoke run")
+    parser.add_argument("--json", metavar="PATH", help="write results here")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE))
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown vs baseline before flagging (0.3 = 30%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "quick": args.quick,
+        "environment": environment(),
+        "metrics": {},
+        "checks": {},
+    }
+    for name in args.cases:
+        print(f"⏱️ Running {name} ...", flush=True)
+        metrics, checks = CASES[name](args.quick)
+        results["metrics"].update({k: {"value": round(v, 6), "unit": u} for k, (v, u) in metrics.items()})
+        results["checks"].update(checks)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("quick") != args.quick:
+            print("⚠️ Baseline was recorded with a different --quick setting; ratios are not comparable")
+
+    rows = compare(results, baseline, args.tolerance)
+    results["comparison"] = [
+        {"metric": m, "value": v, "unit": u, "baseline": b, "ratio": r, "status": s} for m, v, u, b, r, s in rows
+    ]
+
+    print(f"\n{'metric':<40} {'value':>12} {'unit':<4} {'baseline':>12} {'ratio':>7}  status")
+    for metric, value, unit, base, ratio, status in rows:
+        base_s = f"{base:>12.4f}" if base is not None else f"{'-':>12}"
+        ratio_s = f"{ratio:>7.2f}" if ratio is not None else f"{'-':>7}"
+        print(f"{metric:<40} {value:>12.4f} {unit:<4} {base_s} {ratio_s}  {status}")
+    failed_checks = [name for name, ok in results["checks"].items() if not ok]
+    for name in failed_checks:
+        print(f"❌ Check failed: {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📁 Results written to {args.json}")
+    if args.update_baseline:
+        stored = {k: results[k] for k in ("created", "quick", "environment", "metrics")}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 1 if failed_checks else 0
+
+    regressions = [m for m, *_, s in rows if s == "REGRESSION"]
+    if regressions:
+        print(f"🚨 {len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+    return 1 if regressions or failed_checks else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
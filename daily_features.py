@@ -0,0 +1,171 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Streaming Hourly → Daily Feature Builder
+# --------------------------------------------------------------
+# Produces the same daily frame as STEP 2 + STEP 3 of
+# train_flood_model.py (daily Rainfall/Temperature/Humidity and
+# the normalized 7-day Soil Moisture proxy) while reading hourly
+# data one chunk at a time, so memory stays flat no matter how
+# many years or locations are processed.
+#
+#   builder = StreamingDailyBuilder()
+#   for chunk in store.iter_months():
+#       daily_part = builder.feed(chunk)
+#   daily_part = builder.finish()
+#
+#   daily = build_daily_features_streaming("weather_data.csv")
+#
+# Days are keyed by integer day numbers (days since 1970-01-01)
+# rather than Python date objects.
+# ==============================================================
+
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+HOURLY_COLUMNS = ["precipitation", "temperature_2m", "relativehumidity_2m"]
+SOIL_MOISTURE_WINDOW = 7
+
+
+class RollingMeanState:
+    # Online equivalent of Series.rolling(window, min_periods=1).mean().
+    # It mirrors pandas' compensated add/remove summation step for step,
+    # so values fed across any number of calls come out bit-identical
+    # to one rolling() call over the whole series.
+    def __init__(self, window):
+        self.window = window
+        self._values = []  # the last `window` values seen
+        self._nobs = 0
+        self._neg_ct = 0
+        self._sum = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same_run = 0
+        self._prev = None
+
+    def _add(self, val):
+        if val != val:
+            return
+        self._nobs += 1
+        y = val - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, val) < 0:
+            self._neg_ct += 1
+        # pandas returns the value itself while it has been repeated
+        # across the whole window, to avoid floating point artifacts
+        self._same_run = self._same_run + 1 if val == self._prev else 1
+        self._prev = val
+
+    def _remove(self, val):
+        if val != val:
+            return
+        self._nobs -= 1
+        y = -val - self._comp_remove
+        t = self._sum + y
+        self._comp_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, val) < 0:
+            self._neg_ct -= 1
+
+    def _mean(self):
+        if self._same_run >= self._nobs:
+            return self._prev
+        if self._nobs == 0:
+            return float("nan")
+        result = self._sum / self._nobs
+        if self._neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self._neg_ct == self._nobs and result > 0:
+            result = 0.0
+        return result
+
+    def update(self, values):
+        out = np.empty(len(values), dtype=np.float64)
+        for i, val in enumerate(np.asarray(values, dtype=np.float64).tolist()):
+            if self._prev is None:
+                self._prev = val
+            if len(self._values) == self.window:
+                self._remove(self._values.pop(0))
+            self._add(val)
+            self._values.append(val)
+            out[i] = self._mean()
+        return out
+
+
+def day_keys(times):
+    return pd.DatetimeIndex(times).values.astype("datetime64[D]").astype(np.int64)
+
+
+class StreamingDailyBuilder:
+    def __init__(self, window=SOIL_MOISTURE_WINDOW):
+        self._rolling = RollingMeanState(window)
+        self._pending = None  # hourly rows of the last, possibly unfinished day
+        self._last_day = None
+        self.rows_in = 0
+        self.days_out = 0
+
+    def _aggregate(self, rows):
+        grouped = rows.groupby("day", sort=True)
+        daily = pd.DataFrame({
+            "Rainfall": grouped["precipitation"].sum(),
+            "Temperature": grouped["temperature_2m"].mean(),
+            "Humidity": grouped["relativehumidity_2m"].mean(),
+        })
+        days = daily.index.to_numpy()
+        daily.insert(0, "date", pd.to_datetime(days, unit="D"))
+        daily["Soil Moisture"] = self._rolling.update(daily["Rainfall"].to_numpy())
+        self.days_out += len(daily)
+        return daily.reset_index(drop=True)
+
+    def feed(self, hourly):
+        # Accepts the next chunk of hourly rows (time-ordered) and returns
+        # the days it completed, with the un-normalized soil moisture proxy
+        if len(hourly) == 0:
+            return self._aggregate(pd.DataFrame(columns=["day", *HOURLY_COLUMNS]))
+        rows = hourly[HOURLY_COLUMNS].copy()
+        rows["day"] = day_keys(hourly["time"])
+        if self._last_day is not None and rows["day"].iloc[0] < self._last_day:
+            raise ValueError("hourly chunks must be fed in time order")
+        self.rows_in += len(rows)
+
+        if self._pending is not None:
+            rows = pd.concat([self._pending, rows], ignore_index=True)
+        self._last_day = rows["day"].iloc[-1]
+        finished = rows["day"].to_numpy() < self._last_day
+        self._pending = rows[~finished]
+        return self._aggregate(rows[finished])
+
+    def finish(self):
+        rows, self._pending = self._pending, None
+        if rows is None:
+            rows = pd.DataFrame(columns=["day", *HOURLY_COLUMNS])
+        return self._aggregate(rows)
+
+
+def normalize_soil_moisture(daily, bounds=None):
+    # Same 0–100 min/max scaling as STEP 3 of train_flood_model.py;
+    # bounds=(min, max) scales by another period's range instead
+    low, high = bounds if bounds is not None else (daily["Soil Moisture"].min(), daily["Soil Moisture"].max())
+    daily["Soil Moisture"] = 100 * (daily["Soil Moisture"] - low) / (high - low + 1e-9)
+    return daily
+
+
+def build_daily_features_streaming(chunks, window=SOIL_MOISTURE_WINDOW, chunksize=100_000):
+    # chunks: hourly DataFrames in time order, or the path of an hourly
+    # CSV (time, precipitation, ...) read chunksize rows at a time. Only
+    # the daily rows (≈365 per year) are kept; hourly chunks are dropped
+    # as soon as they are aggregated
+    if isinstance(chunks, (str, os.PathLike)):
+        chunks = iter_csv_chunks(chunks, chunksize)
+    builder = StreamingDailyBuilder(window)
+    parts = [builder.feed(chunk) for chunk in chunks]
+    parts.append(builder.finish())
+    daily = pd.concat(parts, ignore_index=True)
+    return normalize_soil_moisture(daily)
+
+
+def iter_csv_chunks(path, chunksize=100_000):
+    yield from pd.read_csv(path, parse_dates=["time"], chunksize=chunksize)
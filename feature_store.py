@@ -0,0 +1,238 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Daily Feature Store
+# --------------------------------------------------------------
+# Keeps the daily features of every location, keyed by
+# (location, date), in year-partitioned Parquet files:
+#
+#   data/features/<location>/index.json   partitions + date bounds
+#   data/features/<location>/2022.parquet date, Rainfall, Temperature,
+#   data/features/<location>/2023.parquet Humidity, Soil Moisture
+#
+# "Soil Moisture" is stored un-normalized (the 7-day rolling rainfall
+# mean), so appending days never rewrites history; range() can apply
+# STEP 3's 0–100 scaling over the rows it returns, and soil_percent()
+# scales a single value by the store-wide bounds kept in the index.
+#
+# Lookups binary-search the partition bounds and then the partition's
+# sorted day numbers (np.searchsorted), so a point-in-time lookup costs
+# O(log n) plus reading at most one partition, which stays cached until
+# the index changes. upsert() rewrites only the years it touches.
+#
+#   store = FeatureStore()
+#   store.update_from_weather("mumbai", WeatherStore("mumbai"), "2018-01-01", "2024-12-31")
+#   store.lookup("mumbai", "2024-07-01")         # last row on or before that day
+#   store.range("mumbai", "2024-06-01", "2024-09-30", normalize=True)
+# ==============================================================
+
+import json
+import os
+import threading
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from daily_features import SOIL_MOISTURE_WINDOW, StreamingDailyBuilder, day_keys, normalize_soil_moisture
+
+FEATURE_COLUMNS = ["Rainfall", "Temperature", "Humidity", "Soil Moisture"]
+DEFAULT_STORE_DIR = os.path.join("data", "features")
+INDEX_FORMAT_VERSION = 1
+
+
+def _day(value):
+    return int(np.datetime64(pd.Timestamp(value).date(), "D").astype(np.int64))
+
+
+class _Partition:
+    def __init__(self, frame):
+        self.frame = frame
+        self.days = day_keys(frame["date"])
+        self.values = frame[FEATURE_COLUMNS].to_numpy(dtype=np.float64)  # row lookups skip pandas
+
+
+class _LocationIndex:
+    def __init__(self, path, meta, stamp):
+        self.path = path
+        self.stamp = stamp
+        self.partitions = meta["partitions"]
+        self.firsts = np.array([p["first"] for p in self.partitions], dtype=np.int64)
+        self.lasts = np.array([p["last"] for p in self.partitions], dtype=np.int64)
+        self._loaded = {}
+
+    def partition(self, i):
+        if i not in self._loaded:
+            self._loaded[i] = _Partition(pd.read_parquet(os.path.join(self.path, self.partitions[i]["file"])))
+        return self._loaded[i]
+
+
+class FeatureStore:
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = root
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def _location_dir(self, location):
+        return os.path.join(self.root, location)
+
+    def _index(self, location):
+        # The parsed index is reused until index.json changes on disk
+        # (e.g. a training run in another process upserted days)
+        path = self._location_dir(location)
+        index_file = os.path.join(path, "index.json")
+        try:
+            st = os.stat(index_file)
+        except FileNotFoundError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            index = self._indexes.get(location)
+            if index is None or index.stamp != stamp:
+                with open(index_file, encoding="utf-8") as f:
+                    meta = json.load(f)
+                if meta.get("format") != INDEX_FORMAT_VERSION:
+                    raise ValueError(f"{index_file} has format {meta.get('format')}, expected {INDEX_FORMAT_VERSION}")
+                index = self._indexes[location] = _LocationIndex(path, meta, stamp)
+            return index
+
+    # ----------------------------------------------------------
+    # Reads
+    # ----------------------------------------------------------
+    def date_range(self, location):
+        # (first, last) stored dates, or None for an empty location
+        index = self._index(location)
+        if index is None or not index.partitions:
+            return None
+        as_date = lambda day: pd.Timestamp(np.datetime64(int(day), "D")).date()
+        return as_date(index.firsts[0]), as_date(index.lasts[-1])
+
+    def lookup(self, location, date, exact=False):
+        # The row for `date`, or the latest one before it (point in time);
+        # a dict with "date" and FEATURE_COLUMNS, or None
+        index = self._index(location)
+        if index is None:
+            return None
+        day = _day(date)
+        i = int(np.searchsorted(index.firsts, day, side="right")) - 1
+        if i < 0:
+            return None
+        part = index.partition(i)
+        j = int(np.searchsorted(part.days, day, side="right")) - 1
+        if j < 0 or (exact and part.days[j] != day):
+            return None
+        date = pd.Timestamp(np.datetime64(int(part.days[j]), "D"))
+        return {"date": date, **dict(zip(FEATURE_COLUMNS, part.values[j].tolist()))}
+
+    def range(self, location, start_date=None, end_date=None, normalize=False):
+        # Rows with start_date <= date <= end_date, in date order; with
+        # normalize, Soil Moisture is scaled 0–100 over these rows
+        index = self._index(location)
+        if index is None or not index.partitions:
+            return pd.DataFrame(columns=["date", *FEATURE_COLUMNS])
+        lo = _day(start_date) if start_date is not None else int(index.firsts[0])
+        hi = _day(end_date) if end_date is not None else int(index.lasts[-1])
+        first = int(np.searchsorted(index.lasts, lo, side="left"))
+        stop = int(np.searchsorted(index.firsts, hi, side="right"))
+
+        parts = []
+        for i in range(first, stop):
+            part = index.partition(i)
+            a = np.searchsorted(part.days, lo, side="left")
+            b = np.searchsorted(part.days, hi, side="right")
+            parts.append(part.frame.iloc[a:b])
+        daily = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["date", *FEATURE_COLUMNS])
+        return normalize_soil_moisture(daily) if normalize and len(daily) else daily
+
+    def soil_bounds(self, location):
+        index = self._index(location)
+        if index is None or not index.partitions:
+            return None
+        return min(p["soil_min"] for p in index.partitions), max(p["soil_max"] for p in index.partitions)
+
+    def soil_percent(self, location, soil_moisture):
+        # A stored (raw) soil moisture value on the 0–100 training scale
+        bounds = self.soil_bounds(location)
+        if bounds is None:
+            return None
+        low, high = bounds
+        return 100 * (soil_moisture - low) / (high - low + 1e-9)
+
+    # ----------------------------------------------------------
+    # Writes
+    # ----------------------------------------------------------
+    def upsert(self, location, daily):
+        # Inserts or replaces rows by date; only the years present in
+        # `daily` are rewritten. Returns the partition files written
+        path = self._location_dir(location)
+        os.makedirs(path, exist_ok=True)
+        daily = daily[["date", *FEATURE_COLUMNS]].copy()
+        daily["date"] = pd.to_datetime(daily["date"])
+        index = self._index(location)
+        partitions = {p["file"]: p for p in (index.partitions if index is not None else [])}
+
+        written = []
+        for year, rows in daily.groupby(daily["date"].dt.year, sort=True):
+            name = f"{year}.parquet"
+            file = os.path.join(path, name)
+            if name in partitions:
+                existing = pd.read_parquet(file)
+                rows = pd.concat([existing[~existing["date"].isin(rows["date"])], rows], ignore_index=True)
+            rows = rows.sort_values("date", ignore_index=True)
+            tmp = file + ".tmp"
+            rows.to_parquet(tmp, index=False)
+            os.replace(tmp, file)
+            days = day_keys(rows["date"])
+            partitions[name] = {
+                "file": name,
+                "first": int(days[0]),
+                "last": int(days[-1]),
+                "rows": len(rows),
+                "soil_min": float(rows["Soil Moisture"].min()),
+                "soil_max": float(rows["Soil Moisture"].max()),
+            }
+            written.append(file)
+
+        # index.json is replaced last, so readers never see a partition
+        # listed before it has been written
+        meta = {"format": INDEX_FORMAT_VERSION, "location": location,
+                "partitions": sorted(partitions.values(), key=lambda p: p["first"])}
+        tmp = os.path.join(path, "index.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, os.path.join(path, "index.json"))
+        return written
+
+    def update_from_weather(self, location, weather_store, start_date, end_date):
+        # Builds daily features from the hourly weather store for the days
+        # not stored yet. The rolling soil-moisture window is primed with
+        # the SOIL_MOISTURE_WINDOW days before the first new one, and the
+        # last stored day is rebuilt in case its hours were incomplete.
+        # Returns the number of days written
+        stored = self.date_range(location)
+        start = pd.Timestamp(start_date).date()
+        if stored is None or start < stored[0]:
+            first_new, prime_from = start, start
+        else:
+            first_new = stored[1]
+            prime_from = max(stored[0], first_new - timedelta(days=SOIL_MOISTURE_WINDOW))
+
+        builder = StreamingDailyBuilder()
+        parts = [builder.feed(chunk) for chunk in weather_store.iter_months(prime_from, end_date)]
+        parts.append(builder.finish())
+        daily = pd.concat(parts, ignore_index=True)
+        daily = daily[daily["date"] >= pd.Timestamp(first_new)]
+        if len(daily):
+            self.upsert(location, daily)
+        return len(daily)
+
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_feature_store(root=DEFAULT_STORE_DIR):
+    # Process-wide, so every session shares one set of cached partitions
+    key = os.path.abspath(root)
+    with _STORES_LOCK:
+        if key not in _STORES:
+            _STORES[key] = FeatureStore(root)
+        return _STORES[key]
@@ -0,0 +1,175 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Headless Scoring API
+# --------------------------------------------------------------
+# Small local HTTP/JSON service around flood_engine so other
+# services can score flood risk without a browser session.
+#
+#   python flood_api.py --host 127.0.0.1 --port 8600
+#
+#   GET  /health        → {"status": "ok"}
+#   POST /score         → one reading
+#        {"rainfall": 200, "humidity": 70, "temperature": 28, "soil": 40}
+#   POST /score/batch   → columnar arrays of equal length
+#        {"rainfall": [...], "humidity": [...], "temperature": [...], "soil": [...]}
+# ==============================================================
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from flood_engine import SAFETY_BANDS, calculate_flood_probability_batch, find_safety_band, safety_band_ids
+
+INPUT_FIELDS = ("rainfall", "humidity", "temperature", "soil")
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class BadRequest(ValueError):
+    pass
+
+
+# =====================================================
+# SCORING HANDLERS
+# =====================================================
+def _read_inputs(payload, batch):
+    if not isinstance(payload, dict):
+        raise BadRequest("request body must be a JSON object")
+    missing = [f for f in INPUT_FIELDS if f not in payload]
+    if missing:
+        raise BadRequest(f"missing fields: {', '.join(missing)}")
+
+    try:
+        values = [np.asarray(payload[f], dtype=np.float64) for f in INPUT_FIELDS]
+    except (TypeError, ValueError):
+        raise BadRequest("inputs must be numbers")
+    # null becomes NaN above, and json.loads accepts NaN/Infinity; none
+    # of them can be scored, and NaN in the reply would not be valid JSON
+    if not all(np.isfinite(v).all() for v in values):
+        raise BadRequest("inputs must be finite numbers")
+
+    if batch:
+        if any(v.ndim != 1 for v in values):
+            raise BadRequest("batch inputs must be flat arrays")
+        if len({len(v) for v in values}) != 1:
+            raise BadRequest("batch inputs must all have the same length")
+    elif any(v.ndim != 0 for v in values):
+        raise BadRequest("inputs must be single numbers; use /score/batch for arrays")
+    return values
+
+
+def score_one(payload):
+    probability = float(calculate_flood_probability_batch(*_read_inputs(payload, batch=False)))
+    # Same rounding as score_batch, so both endpoints agree on half-way values
+    risk = float(np.round(probability * 100, 2))
+    result = {"probability": probability, "risk_percent": risk, "band": None, "guide": None}
+    match = find_safety_band(risk)
+    if match is not None:
+        result["band"], result["guide"] = list(match[0]), match[1]
+    return result
+
+
+def score_batch(payload):
+    probability = calculate_flood_probability_batch(*_read_inputs(payload, batch=True))
+    risk = np.round(probability * 100, 2)
+    bands = [list(SAFETY_BANDS[i]) if i >= 0 else None for i in safety_band_ids(risk).tolist()]
+    return {
+        "count": int(probability.size),
+        "probability": probability.tolist(),
+        "risk_percent": risk.tolist(),
+        "band": bands,
+    }
+
+
+ROUTES = {
+    "/score": score_one,
+    "/score/batch": score_batch,
+}
+
+
+# =====================================================
+# HTTP SERVER
+# =====================================================
+class ScoringHandler(BaseHTTPRequestHandler):
+    # Keep-alive so load generators can reuse connections
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "HydroPredictAPI/1.0"
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        handler = ROUTES.get(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The body can't be framed, so the connection can't be reused
+            self.close_connection = True
+            self._send_json(400, {"error": "invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": "request body too large"})
+            return
+        body = self.rfile.read(length)
+        if handler is None:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+            return
+
+        try:
+            payload = json.loads(body or b"null")
+            self._send_json(200, handler(payload))
+        except (json.JSONDecodeError, UnicodeDecodeError, RecursionError):
+            self._send_json(400, {"error": "request body is not valid JSON"})
+        except BadRequest as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            # Always answer, so the client never sees a dropped connection
+            self.log_error("Scoring failed: %r", e)
+            self._send_json(500, {"error": "internal error"})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8600, verbose=False):
+    server = ThreadingHTTPServer((host, port), ScoringHandler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless HydroPredict flood-risk scoring API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.verbose)
+    print(f"🌊 HydroPredict scoring API listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# ==============================================================
+# 🌊 HydroPredict AI - flood.csv Loader with Binary Sidecar
+# --------------------------------------------------------------
+# flood.csv holds 50,000 rows of small integer scores (0–20) and a
+# FloodProbability target. The first load parses the CSV once,
+# narrows every column to the smallest fitting dtype (int8 for the
+# scores, float32 for the target) and writes one .npy file per
+# column into a sidecar directory:
+#
+#   flood.csv.cache/meta.json
+#   flood.csv.cache/MonsoonIntensity.npy
+#   ...
+#
+# Later loads memory-map those files, so the returned DataFrame's
+# columns are zero-copy views of the page cache. The sidecar is
+# rebuilt whenever the CSV's content hash changes.
+# ==============================================================
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CSV = "flood.csv"
+TARGET_COLUMN = "FloodProbability"
+CACHE_FORMAT_VERSION = 1
+
+_INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def file_hash(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compact_dtype(values):
+    if np.issubdtype(values.dtype, np.integer) and values.size:
+        lo, hi = values.min(), values.max()
+        for dtype in _INT_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                return np.dtype(dtype)
+    if np.issubdtype(values.dtype, np.floating):
+        return np.dtype(np.float32)
+    return values.dtype
+
+
+def sidecar_dir(csv_path):
+    return csv_path + ".cache"
+
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def build_sidecar(csv_path, digest=None):
+    digest = digest or file_hash(csv_path)
+    df = pd.read_csv(csv_path)
+
+    cache_dir = sidecar_dir(csv_path)
+    tmp_dir = cache_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        values = df[name].to_numpy()
+        dtype = compact_dtype(values)
+        np.save(os.path.join(tmp_dir, f"{i:03d}.npy"), values.astype(dtype))
+        columns.append({"name": name, "file": f"{i:03d}.npy", "dtype": dtype.str})
+
+    # meta.json is written last, so a half-built sidecar is never trusted
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "format": CACHE_FORMAT_VERSION,
+            "csv_hash": digest,
+            "rows": len(df),
+            "columns": columns,
+        }, f, indent=2)
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+    return cache_dir
+
+
+def load_flood_csv(csv_path=DEFAULT_CSV, columns=None):
+    # Returns a DataFrame with compact dtypes whose columns are
+    # read-only memory maps of the sidecar files
+    digest = file_hash(csv_path)
+    cache_dir = sidecar_dir(csv_path)
+    meta = _read_meta(cache_dir)
+    if meta is None or meta.get("format") != CACHE_FORMAT_VERSION or meta.get("csv_hash") != digest:
+        build_sidecar(csv_path, digest)
+        meta = _read_meta(cache_dir)
+
+    wanted = [c for c in meta["columns"] if columns is None or c["name"] in columns]
+    data = {
+        c["name"]: np.load(os.path.join(cache_dir, c["file"]), mmap_mode="r")
+        for c in wanted
+    }
+    return pd.DataFrame(data, copy=False)
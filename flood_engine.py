@@ -0,0 +1,398 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Flood Risk Scoring Core
+# --------------------------------------------------------------
+# Feature mapping, the formula-based flood risk model and the
+# safety guide, importable without Streamlit. Used by app.py and
+# by the headless scoring API in flood_api.py.
+# ==============================================================
+
+from bisect import bisect_left
+
+import numpy as np
+
+# =====================================================
+# CONSTANTS & FEATURE SETUP
+# =====================================================
+FEATURES = [
+    "MonsoonIntensity",
+    "TopographyDrainage",
+    "ClimateChange",
+    "DamsQuality",
+    "Siltation",
+    "AgriculturalPractices",
+    "DrainageSystems",
+    "CoastalVulnerability",
+    "Landslides",
+    "Watersheds"
+]
+
+FEATURE_MAX = {
+    "MonsoonIntensity": 16,
+    "TopographyDrainage": 18,
+    "ClimateChange": 17,
+    "DamsQuality": 16,
+    "Siltation": 16,
+    "AgriculturalPractices": 16,
+    "DrainageSystems": 17,
+    "CoastalVulnerability": 17,
+    "Landslides": 16,
+    "Watersheds": 16
+}
+
+# =====================================================
+# INPUT → FEATURE MAPPING
+# =====================================================
+def map_user_inputs_to_features(rainfall, humidity, temperature, soil):
+    mapped = {}
+    # 🔹 Updated max rainfall to 600
+    rainfall_clamped = max(0.0, min(rainfall, 600.0))
+    rainfall_factor = rainfall_clamped / 600.0
+    TMIN = 10.0
+    TMAX = 45.0
+    temp_clamped = max(TMIN, min(temperature, TMAX))
+    temp_norm = (temp_clamped - TMIN) / (TMAX - TMIN)
+    inverted_temp = 1.0 - temp_norm
+    mapped["MonsoonIntensity"] = rainfall_factor * FEATURE_MAX["MonsoonIntensity"]
+    mapped["TopographyDrainage"] = max(0.0, 1.0 - soil / 120.0) * FEATURE_MAX["TopographyDrainage"]
+    mapped["ClimateChange"] = inverted_temp * FEATURE_MAX["ClimateChange"]
+    mapped["DamsQuality"] = max(0.0, 1.0 - rainfall_clamped / 180.0) * FEATURE_MAX["DamsQuality"]
+    mapped["Siltation"] = ((rainfall_clamped + soil) / 200.0) * FEATURE_MAX["Siltation"]
+    mapped["AgriculturalPractices"] = (soil / 100.0) * FEATURE_MAX["AgriculturalPractices"]
+    mapped["DrainageSystems"] = max(0.0, 1.0 - soil / 110.0) * FEATURE_MAX["DrainageSystems"]
+    mapped["CoastalVulnerability"] = ((humidity + (rainfall_clamped / 6.0)) / 110.0) * FEATURE_MAX["CoastalVulnerability"]
+    mapped["Landslides"] = ((rainfall_clamped + soil) / 240.0) * FEATURE_MAX["Landslides"]
+    mapped["Watersheds"] = max(0.0, 1.0 - rainfall_clamped / 300.0) * FEATURE_MAX["Watersheds"]
+    return mapped
+
+
+def map_user_inputs_to_features_batch(rainfall, humidity, temperature, soil):
+    # Vectorized map_user_inputs_to_features: returns an (n, len(FEATURES))
+    # float64 matrix, columns in FEATURES order, ready for model.predict
+    rainfall = np.atleast_1d(np.asarray(rainfall, dtype=np.float64))
+    humidity = np.atleast_1d(np.asarray(humidity, dtype=np.float64))
+    temperature = np.atleast_1d(np.asarray(temperature, dtype=np.float64))
+    soil = np.atleast_1d(np.asarray(soil, dtype=np.float64))
+    rainfall, humidity, temperature, soil = np.broadcast_arrays(rainfall, humidity, temperature, soil)
+
+    rainfall_clamped = np.maximum(0.0, np.minimum(rainfall, 600.0))
+    rainfall_factor = rainfall_clamped / 600.0
+    TMIN = 10.0
+    TMAX = 45.0
+    temp_clamped = np.maximum(TMIN, np.minimum(temperature, TMAX))
+    temp_norm = (temp_clamped - TMIN) / (TMAX - TMIN)
+    inverted_temp = 1.0 - temp_norm
+
+    X = np.empty((rainfall.size, len(FEATURES)), dtype=np.float64)
+    column = {name: i for i, name in enumerate(FEATURES)}
+    X[:, column["MonsoonIntensity"]] = rainfall_factor * FEATURE_MAX["MonsoonIntensity"]
+    X[:, column["TopographyDrainage"]] = np.maximum(0.0, 1.0 - soil / 120.0) * FEATURE_MAX["TopographyDrainage"]
+    X[:, column["ClimateChange"]] = inverted_temp * FEATURE_MAX["ClimateChange"]
+    X[:, column["DamsQuality"]] = np.maximum(0.0, 1.0 - rainfall_clamped / 180.0) * FEATURE_MAX["DamsQuality"]
+    X[:, column["Siltation"]] = ((rainfall_clamped + soil) / 200.0) * FEATURE_MAX["Siltation"]
+    X[:, column["AgriculturalPractices"]] = (soil / 100.0) * FEATURE_MAX["AgriculturalPractices"]
+    X[:, column["DrainageSystems"]] = np.maximum(0.0, 1.0 - soil / 110.0) * FEATURE_MAX["DrainageSystems"]
+    X[:, column["CoastalVulnerability"]] = ((humidity + (rainfall_clamped / 6.0)) / 110.0) * FEATURE_MAX["CoastalVulnerability"]
+    X[:, column["Landslides"]] = ((rainfall_clamped + soil) / 240.0) * FEATURE_MAX["Landslides"]
+    X[:, column["Watersheds"]] = np.maximum(0.0, 1.0 - rainfall_clamped / 300.0) * FEATURE_MAX["Watersheds"]
+    return X
+
+
+# =====================================================
+# TRAINED FLOOD.CSV MODEL
+# =====================================================
+# Any regressor fitted on flood.csv's FEATURES columns (sklearn or a
+# forest_compiler.FlatForest); returns FloodProbability in 0–1
+def predict_flood_probability_model(model, rainfall, humidity, temperature, soil):
+    X = map_user_inputs_to_features_batch(rainfall, humidity, temperature, soil)
+    return np.clip(model.predict(X), 0.0, 1.0)
+
+# =====================================================
+# FORMULA-BASED FLOOD RISK MODEL
+# =====================================================
+WEATHER_COLUMNS = ("Rainfall", "Humidity", "Temperature", "Soil Moisture")
+LIGHT_RAIN_MM = 50  # below this the formula scores no risk
+
+
+def formula_terms(rainfall, humidity, temperature, soil):
+    # The formula's weighted term for each input; each term depends on
+    # its own input only, so the arrays need not share a shape
+    rainfall = np.asarray(rainfall, dtype=np.float64)
+    humidity = np.asarray(humidity, dtype=np.float64)
+    temperature = np.asarray(temperature, dtype=np.float64)
+    soil = np.asarray(soil, dtype=np.float64)
+
+    # Normalize rainfall (0 → 1)
+    rainfall_norm = np.minimum(rainfall / 600.0, 1.0)  # max rainfall = 600mm
+
+    # Normalize other factors
+    humidity_norm = humidity / 100.0
+    temperature_norm = 1.0 - ((temperature - 10.0) / (45.0 - 10.0))  # higher temp → lower risk
+    soil_norm = soil / 100.0
+
+    # Weights (adjust as needed); the score is their sum, in this order
+    return (
+        0.4 * rainfall_norm,    # rainfall ~40%
+        0.3 * humidity_norm,    # humidity ~30%
+        0.2 * soil_norm,        # soil moisture ~20%
+        0.1 * temperature_norm  # temperature modifier ~10%
+    )
+
+
+def calculate_flood_probability_batch(rainfall, humidity=None, temperature=None, soil=None):
+    # Accepts four equally-shaped arrays (or scalars), or a DataFrame with
+    # the daily feature columns written by train_flood_model.py
+    if hasattr(rainfall, "columns"):
+        frame = rainfall
+        rainfall, humidity, temperature, soil = (frame[c].to_numpy() for c in WEATHER_COLUMNS)
+
+    rainfall = np.asarray(rainfall, dtype=np.float64)
+    rainfall_term, humidity_term, soil_term, temperature_term = formula_terms(rainfall, humidity, temperature, soil)
+
+    # Weighted combination
+    flood_score = rainfall_term + humidity_term + soil_term + temperature_term
+
+    # Clip to [0,1]
+    flood_score = np.clip(flood_score, 0.0, 1.0)
+
+    # No flood risk for very light rain
+    return np.where(rainfall < LIGHT_RAIN_MM, 0.0, flood_score)
+
+
+def calculate_flood_probability(rainfall, humidity, temperature, soil):
+    return calculate_flood_probability_batch(
+        float(rainfall), float(humidity), float(temperature), float(soil)
+    )[()]
+
+
+# =====================================================
+# SAFETY GUIDE
+# =====================================================
+safety_guide = {
+    (0, 10): {
+        "Before": (
+            "Keep checking daily weather forecasts and stay updated. "
+            "Clean drains and gutters around your home to ensure smooth water flow. "
+            "Stay aware, even if flood chances seem low."
+        ),
+        "During": (
+            "No major risk, but stay cautious if heavy rain continues. "
+            "Avoid unnecessary travel during rainfall. "
+            "Keep your emergency contacts handy just in case."
+        ),
+        "After": (
+            "Inspect your surroundings for waterlogging or leaks. "
+            "Dry out damp areas to prevent mosquito breeding. "
+            "Continue monitoring local weather updates."
+        ),
+    },
+    (10, 20): {
+        "Before": (
+            "Monitor rainfall and river level trends closely. "
+            "Prepare essential supplies like a torch, batteries, and first aid kit. "
+            "Ensure your family knows basic emergency numbers."
+        ),
+        "During": (
+            "Avoid walking in puddles or small flooded areas. "
+            "Keep all electronics unplugged during lightning or storms. "
+            "Monitor local alerts or advisories carefully."
+        ),
+        "After": (
+            "Clean surroundings to prevent mosquito growth. "
+            "Dispose of any waterlogged waste promptly. "
+            "Be alert for early signs of disease or contamination."
+        ),
+    },
+    (20, 30): {
+        "Before": (
+            "Store drinking water and food in sealed containers. "
+            "Check and reinforce any weak walls or basement leaks. "
+            "Keep valuables and documents in waterproof bags."
+        ),
+        "During": (
+            "Move important items to higher shelves. "
+            "Avoid outdoor activity in continuous rainfall. "
+            "Stay connected with neighbours for updates."
+        ),
+        "After": (
+            "Dry clothes and bedding immediately. "
+            "Clean drains and ensure flow of water. "
+            "Keep children away from muddy or wet areas."
+        ),
+    },
+    (30, 40): {
+        "Before": (
+            "Prepare an emergency go-bag with essentials. "
+            "Ensure everyone in the household knows safe exits. "
+            "Charge your phones and power banks fully."
+        ),
+        "During": (
+            "Avoid unnecessary movement and watch for rising water. "
+            "Keep listening to radio or local alerts. "
+            "Do not drive in heavy rain or flooded lanes."
+        ),
+        "After": (
+            "Sanitize stored water sources before use. "
+            "Help elderly neighbours with clean-up. "
+            "Check for cracks or electrical faults in the home."
+        ),
+    },
+    (40, 50): {
+        "Before": (
+            "Keep your emergency contact list visible and ready. "
+            "Move important possessions and electronics to upper floors. "
+            "Discuss safety plans with family members."
+        ),
+        "During": (
+            "Avoid basements and low-lying areas. "
+            "Do not touch electrical panels with wet hands. "
+            "Ensure pets are kept indoors and safe."
+        ),
+        "After": (
+            "Inspect building structures for any damage. "
+            "Avoid using tap water until confirmed safe. "
+            "Dry and disinfect floors and walls quickly."
+        ),
+    },
+    (50, 60): {
+        "Before": (
+            "Start partial evacuation if water levels are expected to rise. "
+            "Store clean water and non-perishable food items. "
+            "Keep emergency kits near main exits."
+        ),
+        "During": (
+            "Move to higher ground if floodwater approaches. "
+            "Avoid contact with floodwater—it may be contaminated. "
+            "Stay tuned to emergency broadcasts."
+        ),
+        "After": (
+            "Wait for official clearance before returning home. "
+            "Document damage for insurance or aid. "
+            "Do not consume flood-exposed food or water."
+        ),
+    },
+    (60, 70): {
+        "Before": (
+            "Stay ready for possible evacuation; stock up on essentials. "
+            "Keep vehicles fuelled and parked on higher ground. "
+            "Ensure kids and elderly know the evacuation plan."
+        ),
+        "During": (
+            "Shift immediately to upper floors or safe zones. "
+            "Avoid touching wet electrical wires or devices. "
+            "Keep communicating your location to local help lines."
+        ),
+        "After": (
+            "Allow authorities to declare it safe before cleanup. "
+            "Disinfect and air-dry your belongings thoroughly. "
+            "Support neighbours in rebuilding efforts."
+        ),
+    },
+    (70, 80): {
+        "Before": (
+            "Coordinate with local disaster groups or neighbours. "
+            "Keep all important documents in waterproof storage. "
+            "Pack your evacuation kit and stay alert for warnings."
+        ),
+        "During": (
+            "Evacuate immediately if advised by officials. "
+            "Avoid roads with moving or deep water. "
+            "Stay calm and assist others if possible."
+        ),
+        "After": (
+            "Do not touch damaged power lines or poles. "
+            "Clean and dry your home before turning on electricity. "
+            "Boil water before drinking."
+        ),
+    },
+    (80, 90): {
+        "Before": (
+            "Prepare for an emergency evacuation at any time. "
+            "Keep constant communication with local authorities. "
+            "Turn off main power and gas supplies before leaving."
+        ),
+        "During": (
+            "Do not delay evacuation; safety is priority. "
+            "Move to official shelters or high-rise safe areas. "
+            "Carry essentials only and stay with your group."
+        ),
+        "After": (
+            "Follow safety checks before re-entering flooded areas. "
+            "Clean with disinfectants to avoid infections. "
+            "Seek medical help if any injuries occur."
+        ),
+    },
+    (90, 100): {
+        "Before": (
+            "Full-scale flooding possible — immediate preparation required. "
+            "Evacuate low-lying zones early to avoid being trapped. "
+            "Ensure pets, elderly, and children are moved first."
+        ),
+        "During": (
+            "Call emergency helplines if trapped or isolated. "
+            "Avoid rooftops unless it’s the only option and signal for help. "
+            "Stay calm and conserve phone battery."
+        ),
+        "After": (
+            "Wait for official clearance before re-entry. "
+            "Thoroughly disinfect all water and food supplies. "
+            "Assist community members in post-flood recovery."
+        ),
+    },
+}
+
+
+# =====================================================
+# SAFETY BAND INDEX
+# =====================================================
+# Band semantics: each band is right-closed, (low, high], except the
+# first which also includes 0 — exactly what the old first-match scan
+# over safety_guide did. So 10% is in 0–10 and 10.01% is in 10–20.
+# Risks below 0, above 100 or NaN have no band (id -1 / None).
+SAFETY_BANDS = tuple(sorted(safety_guide))
+_BAND_LOWS = np.array([low for low, _ in SAFETY_BANDS], dtype=np.float64)
+_BAND_HIGHS = np.array([high for _, high in SAFETY_BANDS], dtype=np.float64)
+_BAND_HIGHS_LIST = _BAND_HIGHS.tolist()
+
+# Per-band lookup arrays with a trailing None, so band id -1 indexes it
+_GUIDE_BY_ID = np.array([safety_guide[b] for b in SAFETY_BANDS] + [None], dtype=object)
+_GUIDE_TEXT_BY_ID = {
+    stage: np.array([safety_guide[b][stage] for b in SAFETY_BANDS] + [None], dtype=object)
+    for stage in ("Before", "During", "After")
+}
+
+
+def safety_band_id(risk_percent):
+    # Scalar lookup: one bisect over the 10 upper bounds
+    if not (SAFETY_BANDS[0][0] <= risk_percent <= _BAND_HIGHS_LIST[-1]):
+        return -1
+    return bisect_left(_BAND_HIGHS_LIST, risk_percent)
+
+
+def safety_band_ids(risk_percent):
+    # Vectorized lookup for a whole array of risk percentages
+    risk = np.asarray(risk_percent, dtype=np.float64)
+    ids = np.searchsorted(_BAND_HIGHS, risk, side="left")
+    valid = (risk >= _BAND_LOWS[0]) & (risk <= _BAND_HIGHS[-1])
+    return np.where(valid, ids, -1)
+
+
+def safety_guidance_batch(risk_percent):
+    # Band ids, bounds and Before/During/After texts for every risk in
+    # one call, for bulk alert generation; entries without a band are None
+    ids = safety_band_ids(risk_percent)
+    return {
+        "band_id": ids,
+        "low": np.where(ids >= 0, _BAND_LOWS[ids], np.nan),
+        "high": np.where(ids >= 0, _BAND_HIGHS[ids], np.nan),
+        "before": _GUIDE_TEXT_BY_ID["Before"][ids],
+        "during": _GUIDE_TEXT_BY_ID["During"][ids],
+        "after": _GUIDE_TEXT_BY_ID["After"][ids],
+    }
+
+
+def find_safety_band(risk_percent):
+    # Returns ((low, high), guide) for a risk percentage, or None
+    band = safety_band_id(risk_percent)
+    if band < 0:
+        return None
+    return SAFETY_BANDS[band], _GUIDE_BY_ID[band]
@@ -0,0 +1,149 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Forecast-Horizon Risk Timeline
+# --------------------------------------------------------------
+# Turns the hourly Open-Meteo forecast (the same schema as
+# fetch_weather_data: time, temperature_2m, relativehumidity_2m,
+# precipitation) into one row per day for the past week plus the
+# next 7–16 days, builds the STEP 2/3 features of
+# train_flood_model.py and scores every day in one batch call.
+#
+# Hours up to "now" are final, so they are fed once into a
+# StreamingDailyBuilder whose rolling 7-day soil-moisture state
+# carries forward between refreshes. Hours after "now" are revised
+# by every forecast run, so each refresh replays only those on a
+# copy of that state (at most 16 × 24 hours), never the history.
+#
+#   timeline = get_forecast_timeline()
+#   timeline.refresh()        # fetches at most once per max_age
+#   timeline.frame            # date, features, Flood Risk (%), kind
+# ==============================================================
+
+import copy
+import logging
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import requests
+
+from daily_features import SOIL_MOISTURE_WINDOW, StreamingDailyBuilder, normalize_soil_moisture
+from flood_engine import calculate_flood_probability_batch
+from live_weather import FORECAST_URL, MUMBAI
+from weather_store import TIMEZONE, fetch_hourly
+
+PAST_DAYS = SOIL_MOISTURE_WINDOW - 1  # primes the rolling window
+FORECAST_DAYS = 16
+HISTORY_DAYS = 30                      # observed days kept for display
+DEFAULT_MAX_AGE = 1800.0
+RETRY_AFTER = 120.0
+
+logger = logging.getLogger("hydropredict.forecast")
+
+
+def local_now():
+    return pd.Timestamp.now(tz=TIMEZONE).tz_localize(None)
+
+
+class ForecastTimeline:
+    def __init__(self, window=SOIL_MOISTURE_WINDOW, history_days=HISTORY_DAYS):
+        self.history_days = history_days
+        self._observed = StreamingDailyBuilder(window)
+        self._observed_days = []
+        self._last_observed = None
+        self.frame = None
+        self.hours_committed = 0
+        self.hours_replayed = 0
+
+    def update(self, hourly, now=None):
+        # Accepts the latest hourly forecast window (time-ordered) and
+        # rebuilds the daily timeline; returns the new frame
+        now = local_now() if now is None else pd.Timestamp(now)
+        if self._last_observed is not None:
+            hourly = hourly[hourly["time"] > self._last_observed]
+        observed = hourly[hourly["time"] <= now]
+        forecast = hourly[hourly["time"] > now]
+
+        if len(observed):
+            days = self._observed.feed(observed)
+            if len(days):
+                self._observed_days.append(days)
+            self._last_observed = observed["time"].iloc[-1]
+            self.hours_committed += len(observed)
+        observed_days = pd.concat(self._observed_days, ignore_index=True) if self._observed_days else None
+        if observed_days is not None and len(observed_days) > self.history_days:
+            observed_days = observed_days.iloc[-self.history_days:].reset_index(drop=True)
+            self._observed_days = [observed_days]
+
+        # Replay the revisable hours on a copy of the committed state
+        preview = copy.deepcopy(self._observed)
+        tail = [preview.feed(forecast), preview.finish()]
+        self.hours_replayed += len(forecast)
+
+        parts = [p for p in [observed_days, *tail] if p is not None and len(p)]
+        if not parts:
+            self.frame = None
+            return None
+        daily = pd.concat(parts, ignore_index=True)
+        today = now.normalize()
+        daily["kind"] = np.where(daily["date"] >= today, "forecast", "observed")
+        daily = normalize_soil_moisture(daily)
+        daily["Flood Risk (%)"] = (calculate_flood_probability_batch(daily) * 100).round(2)
+        self.frame = daily
+        return daily
+
+
+class SharedForecast:
+    # Process-wide timeline that fetches at most once per max_age,
+    # however many sessions ask for it
+    def __init__(self, lat, lon, url=None, max_age=DEFAULT_MAX_AGE, forecast_days=FORECAST_DAYS):
+        self.lat = lat
+        self.lon = lon
+        self.url = url or FORECAST_URL
+        self.max_age = max_age
+        self.forecast_days = forecast_days
+        self.timeline = ForecastTimeline()
+        self.fetched_at = None
+        self.last_error = None
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def frame(self):
+        return self.timeline.frame
+
+    def refresh(self, now=None):
+        if time.time() < self._next_attempt:
+            return self.frame
+        with self._lock:
+            if time.time() < self._next_attempt:
+                return self.frame
+            today = (local_now() if now is None else pd.Timestamp(now)).date()
+            try:
+                hourly = fetch_hourly(self.lat, self.lon, today - timedelta(days=PAST_DAYS),
+                                      today + timedelta(days=self.forecast_days - 1),
+                                      url=self.url, retries=1, timeout=5)
+            except (requests.RequestException, KeyError, ValueError) as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                self._next_attempt = time.time() + RETRY_AFTER
+                logger.warning("Forecast fetch failed (%s); retrying in %.0fs", e, RETRY_AFTER)
+                return self.frame
+            self.timeline.update(hourly, now)
+            self.fetched_at = time.time()
+            self.last_error = None
+            self._next_attempt = self.fetched_at + self.max_age
+            return self.frame
+
+
+_TIMELINES = {}
+_TIMELINES_LOCK = threading.Lock()
+
+
+def get_forecast_timeline(lat=MUMBAI[0], lon=MUMBAI[1], url=None):
+    url = url or FORECAST_URL
+    key = (url, round(lat, 4), round(lon, 4))
+    with _TIMELINES_LOCK:
+        if key not in _TIMELINES:
+            _TIMELINES[key] = SharedForecast(lat, lon, url)
+        return _TIMELINES[key]
@@ -0,0 +1,182 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Flat-Array Forest Inference
+# --------------------------------------------------------------
+# Flattens a trained sklearn RandomForestRegressor (or any forest
+# of single-output regression trees) into contiguous NumPy node
+# arrays and predicts with a batched, pure-NumPy traversal of all
+# trees at once. This skips sklearn's per-call validation and
+# joblib dispatch, which dominate single-row latency.
+#
+#   flat = compile_forest(model)
+#   flat.save("flood_model_flat.npz")
+#   flat = load_flat_forest("flood_model_flat.npz")
+#   flat.predict(X)  # matches model.predict(X) within float tolerance
+# ==============================================================
+
+import numpy as np
+
+# Below this many rows all trees are walked together as one
+# (rows × trees) matrix, which minimises NumPy call overhead for
+# interactive single-row predictions. Larger batches walk one tree at
+# a time over blocks of rows, which keeps each tree's nodes in cache.
+WIDE_MAX_ROWS = 512
+TREE_MAJOR_BLOCK_ROWS = 65536
+
+
+class FlatForest:
+    def __init__(self, feature, threshold, left, right, value, roots, depths, n_features, feature_names=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depths = depths
+        self.n_features = int(n_features)
+        self.feature_names = None if feature_names is None else [str(n) for n in feature_names]
+
+        # sklearn compares float32 features against float64 thresholds.
+        # Rounding each threshold down to the nearest float32 keeps every
+        # split decision identical while comparing float32 to float32.
+        threshold32 = threshold.astype(np.float32)
+        too_high = threshold32.astype(np.float64) > threshold
+        threshold32[too_high] = np.nextafter(threshold32[too_high], np.float32(-np.inf))
+
+        # Traversal state is kept as 2 * node, so one step is
+        #   node = child[node + (x > threshold[node])]
+        # with every per-node array stored twice, side by side
+        self._feature2 = np.repeat(feature.astype(np.intp), 2)
+        self._threshold2 = np.repeat(threshold32, 2)
+        self._child2 = 2 * np.stack([left, right], axis=1).ravel().astype(np.intp)
+        self._value2 = np.repeat(value, 2)
+        self._roots2 = 2 * roots.astype(np.intp)
+
+    @property
+    def n_trees(self):
+        return self.roots.size
+
+    @property
+    def n_nodes(self):
+        return self.feature.size
+
+    @property
+    def depth(self):
+        return int(self.depths.max())
+
+    def _as_matrix(self, X):
+        if hasattr(X, "columns"):
+            if self.feature_names is not None:
+                X = X[self.feature_names]
+            X = X.to_numpy()
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X has {X.shape[1]} features, but the forest expects {self.n_features}")
+        return X
+
+    def _predict_wide(self, X):
+        x_flat = X.ravel()
+        row_base = (np.arange(X.shape[0], dtype=np.intp) * self.n_features)[:, None]
+        node = np.broadcast_to(self._roots2, (X.shape[0], self.n_trees)).copy()
+        # Leaves point at themselves, so every tree can take the same
+        # number of steps regardless of its own depth
+        for _ in range(self.depth):
+            x = x_flat[row_base + self._feature2[node]]
+            node = self._child2[node + (x > self._threshold2[node])]
+        return self._value2[node].mean(axis=1)
+
+    def _predict_tree_major(self, X):
+        x_flat = X.ravel()
+        row_base = np.arange(X.shape[0], dtype=np.intp) * self.n_features
+        total = np.zeros(X.shape[0], dtype=np.float64)
+        for root, depth in zip(self._roots2.tolist(), self.depths.tolist()):
+            node = np.full(X.shape[0], root, dtype=np.intp)
+            for _ in range(depth):
+                x = x_flat[row_base + self._feature2[node]]
+                node = self._child2[node + (x > self._threshold2[node])]
+            total += self._value2[node]
+        # Summing tree by tree matches sklearn's own accumulation order
+        return total / self.n_trees
+
+    def predict(self, X):
+        X = self._as_matrix(X)
+        if X.shape[0] <= WIDE_MAX_ROWS:
+            return self._predict_wide(X)
+        out = np.empty(X.shape[0], dtype=np.float64)
+        for start in range(0, X.shape[0], TREE_MAJOR_BLOCK_ROWS):
+            stop = start + TREE_MAJOR_BLOCK_ROWS
+            out[start:stop] = self._predict_tree_major(X[start:stop])
+        return out
+
+    def save(self, path):
+        extra = {}
+        if self.feature_names is not None:
+            extra["feature_names"] = np.array(self.feature_names)
+        np.savez(
+            path,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            value=self.value,
+            roots=self.roots,
+            depths=self.depths,
+            n_features=np.array(self.n_features),
+            **extra,
+        )
+
+
+def compile_forest(model):
+    trees = [est.tree_ for est in getattr(model, "estimators_", [model])]
+    if not trees or trees[0].n_outputs != 1:
+        raise ValueError("only fitted single-output regression forests can be compiled")
+
+    features, thresholds, lefts, rights, values, roots, depths = [], [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        n = tree.node_count
+        index = np.arange(n, dtype=np.int32) + offset
+        is_leaf = tree.children_left == -1
+
+        features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        lefts.append(np.where(is_leaf, index, tree.children_left + offset).astype(np.int32))
+        rights.append(np.where(is_leaf, index, tree.children_right + offset).astype(np.int32))
+        values.append(tree.value[:, 0, 0])
+        roots.append(offset)
+        depths.append(tree.max_depth)
+        offset += n
+
+    return FlatForest(
+        feature=np.ascontiguousarray(np.concatenate(features)),
+        threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+        left=np.ascontiguousarray(np.concatenate(lefts)),
+        right=np.ascontiguousarray(np.concatenate(rights)),
+        value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+        roots=np.array(roots, dtype=np.int32),
+        depths=np.array(depths, dtype=np.int32),
+        n_features=model.n_features_in_,
+        feature_names=getattr(model, "feature_names_in_", None),
+    )
+
+
+def load_flat_forest(path):
+    with np.load(path) as data:
+        return FlatForest(
+            feature=data["feature"],
+            threshold=data["threshold"],
+            left=data["left"],
+            right=data["right"],
+            value=data["value"],
+            roots=data["roots"],
+            depths=data["depths"],
+            n_features=data["n_features"],
+            feature_names=data["feature_names"] if "feature_names" in data else None,
+        )
+
+
+def export_flat_forest(model, path):
+    flat = compile_forest(model)
+    flat.save(path)
+    return flat
@@ -0,0 +1,167 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Forest Training Engine
+# --------------------------------------------------------------
+# Fits the RandomForestRegressor used by train_flood_model.py on all
+# cores, from float32 arrays (sklearn's trees work in float32, so a
+# float64 frame would be copied once more before fitting).
+#
+# For data larger than RAM, rows are written once into N memory-mapped
+# float32 shards (row i goes to shard i % N, so every shard covers the
+# whole period) and the forest is grown shard by shard with
+# warm_start: each shard adds its share of the trees, fitted on that
+# shard only. Peak memory is one shard plus the trees, however many
+# rows there are in total; the result is a plain RandomForestRegressor.
+#
+#   model = fit_forest(to_float32(daily[FEATURE_COLUMNS]), y)
+#
+#   shards = write_shards_from_csv("big.csv", "data/shards", FEATURES, TARGET_COLUMN, rows_per_shard=2_000_000)
+#   model = fit_forest_sharded(shards, n_estimators=200, max_depth=12)
+# ==============================================================
+
+import json
+import os
+import shutil
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from sklearn.ensemble import RandomForestRegressor
+
+SHARD_FORMAT_VERSION = 1
+
+
+def to_float32(X):
+    # float32 copy of X unless it already is one; frames stay frames so
+    # the fitted model keeps their column names (FlatForest uses them)
+    if hasattr(X, "columns"):
+        return X.astype(np.float32, copy=False)
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
+def tree_jobs(parallel_fits=1):
+    # Cores per forest when `parallel_fits` forests train at once
+    return max(1, (os.cpu_count() or 1) // max(1, parallel_fits))
+
+
+def fit_forest(X, y, n_estimators=200, max_depth=12, n_jobs=-1, random_state=42, **params):
+    model = RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth,
+                                  n_jobs=n_jobs, random_state=random_state, **params)
+    model.fit(to_float32(X), np.asarray(y, dtype=np.float64))
+    return model
+
+
+# --------------------------------------------------------------
+# Memory-mapped shards
+# --------------------------------------------------------------
+class ShardSet:
+    def __init__(self, directory, meta):
+        self.directory = directory
+        self.meta = meta
+
+    @classmethod
+    def open(cls, directory):
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != SHARD_FORMAT_VERSION:
+            raise ValueError(f"{directory} holds shards in format {meta.get('format')}, expected {SHARD_FORMAT_VERSION}")
+        return cls(directory, meta)
+
+    @property
+    def n_rows(self):
+        return sum(s["rows"] for s in self.meta["shards"])
+
+    @property
+    def features(self):
+        return self.meta["features"]
+
+    def __len__(self):
+        return len(self.meta["shards"])
+
+    def subset(self, indices):
+        # A view over some of the shards, e.g. to hold one out for evaluation
+        meta = dict(self.meta, shards=[self.meta["shards"][i] for i in indices])
+        return ShardSet(self.directory, meta)
+
+    def __iter__(self):
+        # (X, y) per shard, both read-only memory maps
+        for shard in self.meta["shards"]:
+            yield (np.load(os.path.join(self.directory, shard["X"]), mmap_mode="r"),
+                   np.load(os.path.join(self.directory, shard["y"]), mmap_mode="r"))
+
+
+def write_shards(chunks, directory, n_rows, features, n_shards):
+    # Streams (X, y) chunks totalling n_rows into n_shards interleaved
+    # shards; no more than one chunk is held in memory
+    n_shards = max(1, min(n_shards, n_rows))
+    tmp_dir = directory + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    sizes = [n_rows // n_shards + (s < n_rows % n_shards) for s in range(n_shards)]
+    X_maps = [open_memmap(os.path.join(tmp_dir, f"X_{s:03d}.npy"), mode="w+", dtype=np.float32,
+                          shape=(sizes[s], len(features))) for s in range(n_shards)]
+    y_maps = [open_memmap(os.path.join(tmp_dir, f"y_{s:03d}.npy"), mode="w+", dtype=np.float32,
+                          shape=(sizes[s],)) for s in range(n_shards)]
+
+    offset = 0
+    for X, y in chunks:
+        X, y = to_float32(X), np.asarray(y, dtype=np.float32)
+        for s in range(n_shards):
+            first = (s - offset) % n_shards  # first row of this chunk that belongs to shard s
+            rows = X[first::n_shards]
+            start = (offset + first) // n_shards
+            X_maps[s][start:start + len(rows)] = rows
+            y_maps[s][start:start + len(rows)] = y[first::n_shards]
+        offset += len(X)
+    if offset != n_rows:
+        raise ValueError(f"Expected {n_rows} rows, got {offset}")
+    for m in X_maps + y_maps:
+        m.flush()
+    del X_maps, y_maps
+
+    # meta.json is written last, so a half-written shard set is never opened
+    meta = {
+        "format": SHARD_FORMAT_VERSION,
+        "features": list(features),
+        "shards": [{"X": f"X_{s:03d}.npy", "y": f"y_{s:03d}.npy", "rows": sizes[s]} for s in range(n_shards)],
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_dir, directory)
+    return ShardSet(directory, meta)
+
+
+def count_csv_rows(csv_path):
+    with open(csv_path, "rb") as f:
+        lines = sum(block.count(b"\n") for block in iter(lambda: f.read(1024 * 1024), b""))
+        f.seek(-1, os.SEEK_END)
+        ends_with_newline = f.read(1) == b"\n"
+    return lines - 1 + (not ends_with_newline)  # minus the header
+
+
+def write_shards_from_csv(csv_path, directory, features, target, rows_per_shard=2_000_000, chunksize=500_000):
+    import pandas as pd
+
+    n_rows = count_csv_rows(csv_path)
+    n_shards = -(-n_rows // rows_per_shard)
+    chunks = (
+        (chunk[features], chunk[target])
+        for chunk in pd.read_csv(csv_path, usecols=features + [target], chunksize=chunksize)
+    )
+    return write_shards(chunks, directory, n_rows, features, n_shards)
+
+
+def fit_forest_sharded(shards, n_estimators=200, max_depth=12, n_jobs=-1, random_state=42, **params):
+    # Grows one forest across shards with warm_start; shard i adds its
+    # share of the trees (proportional to its rows), fitted on it alone
+    sizes = np.array([s["rows"] for s in shards.meta["shards"]], dtype=np.float64)
+    bounds = np.round(np.cumsum(sizes) / sizes.sum() * n_estimators).astype(int)
+    model = RandomForestRegressor(n_estimators=0, max_depth=max_depth, n_jobs=n_jobs,
+                                  random_state=random_state, warm_start=True, **params)
+    for total, (X, y) in zip(bounds, shards):
+        if total == model.n_estimators:
+            continue
+        model.n_estimators = int(total)
+        model.fit(X, y.astype(np.float64))
+    model.warm_start = False
+    return model
@@ -0,0 +1,178 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Stage Instrumentation
+# --------------------------------------------------------------
+# Measures named pipeline stages and emits one JSON line per stage:
+#
+#   {"event": "stage", "stage": "fit", "wall_s": 1.92, "cpu_s": 1.90,
+#    "peak_rss_mib": 412.3, "rss_mib": 398.0, "rows": 2184, ...}
+#
+# peak_rss_mib is the peak *during that stage* on Linux (the kernel's
+# high-water mark is reset at stage entry); elsewhere it is the
+# process peak so far. Optionally each stage is also profiled:
+#
+#   cprofile     <profile_dir>/<prefix>-<stage>.prof   (pstats / snakeviz)
+#   tracemalloc  <profile_dir>/<prefix>-<stage>.tracemalloc.txt, plus
+#                "tracemalloc_peak_mib" in the JSON line
+#
+#   stages = StageRecorder(context={"location": "Mumbai"})
+#   with stages("fit", rows=len(X)):
+#       model.fit(X, y)
+#   stages.write_jsonl("data/train_metrics.jsonl")
+# ==============================================================
+
+import cProfile
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILERS = ("cprofile", "tracemalloc")
+DEFAULT_PROFILE_DIR = os.path.join("data", "profiles")
+
+
+def _status_kib(field):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    # Linux: writing 5 to clear_refs resets VmHWM to the current RSS
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _process_peak_kib():
+    peak = _status_kib("VmHWM")
+    if peak is None and resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak //= 1024  # bytes there, KiB on Linux
+    return peak
+
+
+class StageRecorder:
+    def __init__(self, context=None, profile=None, profile_dir=DEFAULT_PROFILE_DIR):
+        if profile not in (None, *PROFILERS):
+            raise ValueError(f"Unknown profiler {profile!r}; expected one of {', '.join(PROFILERS)}")
+        self.context = dict(context or {})
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.records = []
+        self._stack = []
+
+    def __call__(self, name, rows=None):
+        return _Stage(self, name, rows)
+
+    @property
+    def timings(self):
+        # Wall seconds per stage name, summed over repeats
+        totals = {}
+        for r in self.records:
+            totals[r["stage"]] = totals.get(r["stage"], 0.0) + r["wall_s"]
+        return totals
+
+    def _profile_path(self, stage, suffix):
+        prefix = "-".join(re.sub(r"[^A-Za-z0-9]+", "_", str(v)) for v in self.context.values()) or "run"
+        os.makedirs(self.profile_dir, exist_ok=True)
+        return os.path.join(self.profile_dir, f"{prefix}-{stage}{suffix}")
+
+    def extend(self, records):
+        # Adopts records measured elsewhere (e.g. in a worker process)
+        self.records.extend(records)
+
+    def write_jsonl(self, path):
+        lines = "".join(json.dumps(r, default=str) + "\n" for r in self.records)
+        if path == "-":
+            sys.stdout.write(lines)
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class _Stage:
+    def __init__(self, recorder, name, rows):
+        self.recorder = recorder
+        self.name = name
+        self.rows = rows
+        self.child_peak_kib = 0
+
+    def __enter__(self):
+        rec = self.recorder
+        # Profilers don't nest: an inner stage is covered by its parent's dump
+        self.profile = None if any(s.profile for s in rec._stack) else rec.profile
+        rec._stack.append(self)
+        self.peak_is_stage = _reset_peak_rss()
+        if self.profile == "cprofile":
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif self.profile == "tracemalloc":
+            self.started_tracing = not tracemalloc.is_tracing()
+            if self.started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.process_time() - self.start_cpu
+        rec = self.recorder
+        rec._stack.pop()
+
+        # An inner stage resets the high-water mark, so fold its peak in
+        peak_kib = max(_process_peak_kib() or 0, self.child_peak_kib)
+        if rec._stack:
+            parent = rec._stack[-1]
+            parent.child_peak_kib = max(parent.child_peak_kib, peak_kib)
+
+        record = {
+            "event": "stage",
+            **rec.context,
+            "stage": self.name,
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "peak_rss_mib": round(peak_kib / 1024, 1) if peak_kib else None,
+            "peak_scope": "stage" if self.peak_is_stage else "process",
+            "rss_mib": round((_status_kib("VmRSS") or 0) / 1024, 1) or None,
+            "rows": self.rows,
+            "pid": os.getpid(),
+            "ok": exc_type is None,
+        }
+
+        if self.profile == "cprofile":
+            self.profiler.disable()
+            path = rec._profile_path(self.name, ".prof")
+            self.profiler.dump_stats(path)
+            record["profile"] = path
+        elif self.profile == "tracemalloc":
+            snapshot = tracemalloc.take_snapshot()
+            record["tracemalloc_peak_mib"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+            if self.started_tracing:
+                tracemalloc.stop()
+            path = rec._profile_path(self.name, ".tracemalloc.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                for stat in snapshot.statistics("lineno")[:25]:
+                    f.write(f"{stat}\n")
+            record["profile"] = path
+
+        rec.records.append(record)
+        return False
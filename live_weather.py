@@ -0,0 +1,203 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Live Conditions Poller
+# --------------------------------------------------------------
+# One background poller per server process fetches current Mumbai
+# conditions from the Open-Meteo forecast API on a schedule and puts
+# them in a shared TTL cache. Every Streamlit session reads the cache,
+# so N viewers cost one upstream request per interval instead of N.
+#
+# The poller runs an asyncio loop on a daemon thread, sends
+# conditional requests (If-None-Match / If-Modified-Since) so an
+# unchanged reading costs a 304, and backs off exponentially with
+# jitter while the upstream is failing. The last good reading stays
+# readable (marked stale) until fresh data arrives.
+#
+#   poller = get_poller()
+#   reading = poller.latest()   # None until the first fetch lands
+# ==============================================================
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+
+FORECAST_URL = os.environ.get("OPEN_METEO_FORECAST_URL", "https://api.open-meteo.com/v1/forecast")
+CURRENT_VARIABLES = ["temperature_2m", "relative_humidity_2m", "soil_moisture_0_to_1cm"]
+DAILY_VARIABLES = ["precipitation_sum"]
+TIMEZONE = "Asia/Kolkata"
+MUMBAI = (19.075984, 72.877656)
+
+DEFAULT_INTERVAL = 300.0  # seconds between polls
+DEFAULT_TTL = 900.0       # a reading older than this is stale
+RETRY_BASE = 5.0
+MAX_BACKOFF = 600.0
+
+logger = logging.getLogger("hydropredict.live")
+
+
+def backoff_delay(failures):
+    # Seconds to wait after `failures` consecutive failed polls:
+    # exponential from RETRY_BASE, capped at MAX_BACKOFF, with jitter
+    # so many servers don't retry in lockstep
+    return min(MAX_BACKOFF, RETRY_BASE * 2 ** (failures - 1)) * random.uniform(0.5, 1.0)
+
+
+class TTLCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (value, now, now + ttl)
+
+    def touch(self, key, ttl):
+        # The upstream confirmed the cached value is still current
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                value, _, _ = self._entries[key]
+                self._entries[key] = (value, now, now + ttl)
+
+    def get(self, key):
+        # (value, fetched_at, fresh) or None if nothing was ever cached
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, fetched_at, expires_at = entry
+        return value, fetched_at, time.time() < expires_at
+
+
+_CACHE = TTLCache()
+
+
+def parse_conditions(body):
+    # Maps a forecast response onto the inputs of the flood formula
+    current = body["current"]
+    return {
+        "Rainfall (mm)": round(float(body["daily"]["precipitation_sum"][0] or 0.0), 1),
+        "Humidity (%)": round(float(current["relative_humidity_2m"])),
+        "Temperature (°C)": round(float(current["temperature_2m"]), 1),
+        "Soil Moisture (%)": round(float(current["soil_moisture_0_to_1cm"]) * 100),
+    }
+
+
+class LivePoller:
+    def __init__(self, lat, lon, url=None, interval=DEFAULT_INTERVAL, ttl=DEFAULT_TTL,
+                 cache=None, session=None, timeout=10):
+        self.lat = lat
+        self.lon = lon
+        self.url = url or FORECAST_URL
+        self.interval = interval
+        self.ttl = ttl
+        self.cache = cache or _CACHE
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.key = (self.url, round(lat, 4), round(lon, 4))
+
+        self._etag = None
+        self._last_modified = None
+        self._attempted = threading.Event()
+        self._thread = None
+        self._loop = None
+        self._stop = None
+        self.stats = {"requests": 0, "updated": 0, "not_modified": 0, "errors": 0, "last_error": None}
+
+    def poll_once(self):
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        params = {
+            "latitude": self.lat,
+            "longitude": self.lon,
+            "current": ",".join(CURRENT_VARIABLES),
+            "daily": ",".join(DAILY_VARIABLES),
+            "forecast_days": 1,
+            "timezone": TIMEZONE,
+        }
+
+        self.stats["requests"] += 1
+        response = self.session.get(self.url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            self.stats["not_modified"] += 1
+            self.cache.touch(self.key, self.ttl)
+        else:
+            response.raise_for_status()
+            self.cache.set(self.key, parse_conditions(response.json()), self.ttl)
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+            self.stats["updated"] += 1
+
+    async def _poll_forever(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                await asyncio.to_thread(self.poll_once)
+                failures = 0
+                delay = self.interval
+            except (requests.RequestException, KeyError, ValueError, IndexError, TypeError) as e:
+                failures += 1
+                self.stats["errors"] += 1
+                self.stats["last_error"] = f"{type(e).__name__}: {e}"
+                delay = backoff_delay(failures)
+                logger.warning("Live weather poll failed (%s); retrying in %.1fs", e, delay)
+            self._attempted.set()
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=lambda: asyncio.run(self._poll_forever()),
+                name="hydropredict-live-poller",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wait_ready(self, timeout=None):
+        # Waits for the first poll to finish (either way); True if a
+        # reading is available
+        self._attempted.wait(timeout)
+        return self.latest() is not None
+
+    def latest(self):
+        entry = self.cache.get(self.key)
+        if entry is None:
+            return None
+        values, fetched_at, fresh = entry
+        return {"values": values, "fetched_at": fetched_at, "fresh": fresh}
+
+
+_POLLERS = {}
+_POLLERS_LOCK = threading.Lock()
+
+
+def get_poller(lat=MUMBAI[0], lon=MUMBAI[1], url=None, interval=DEFAULT_INTERVAL, ttl=DEFAULT_TTL):
+    # Process-wide: every session asking for the same place shares one
+    # running poller
+    url = url or FORECAST_URL
+    key = (url, round(lat, 4), round(lon, 4))
+    with _POLLERS_LOCK:
+        poller = _POLLERS.get(key)
+        if poller is None:
+            poller = _POLLERS[key] = LivePoller(lat, lon, url, interval, ttl).start()
+        return poller
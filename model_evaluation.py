@@ -0,0 +1,302 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Rolling-Origin Model Evaluation
+# --------------------------------------------------------------
+# train_flood_model.py scores its forest on one random 80/20 split,
+# which lets days from the future train the model that "predicts"
+# the past. This harness evaluates on time instead:
+#
+#   fold 1  train [day 0 ........ origin)  gap  test [origin, +horizon)
+#   fold 2  train [day 0 ................ origin')  gap  test [...)
+#
+# The origin rolls forward by --step days; training is expanding
+# (or sliding, with --max-train-days). The gap skips the days whose
+# 7-day soil moisture window overlaps the training period.
+#
+# Statistics taken over a period — the soil moisture min/max scaling
+# and the label's rainfall maximum — come from each fold's training
+# days alone and are applied unchanged to its test days, so nothing
+# about the test period reaches the model or its training labels.
+#
+# Every model is scored on the same folds and the same Flood Risk (%)
+# label as training:
+#
+#   formula   app.py's formula, probability × 100 (nothing to fit)
+#   forest    train_flood_model.py's forest, refitted on every fold
+#
+# The raw feature matrix of a (location, date range) is built once
+# from the feature store and cached as .npy files under
+# data/eval_cache/, keyed by the store's index, so folds (run in a
+# process pool) and later runs memory-map it instead of rebuilding it.
+#
+#   python model_evaluation.py --location mumbai
+#   python model_evaluation.py --location thane --initial-days 730 --horizon 180 --workers 4 --json eval.json
+# ==============================================================
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_squared_error, r2_score
+
+from daily_features import SOIL_MOISTURE_WINDOW, normalize_soil_moisture
+from feature_store import DEFAULT_STORE_DIR, FeatureStore
+from flood_engine import calculate_flood_probability_batch
+from forest_training import fit_forest, tree_jobs
+from instrumentation import StageRecorder
+from train_flood_model import FEATURE_COLUMNS, add_flood_risk_label
+
+DEFAULT_LOCATION = "mumbai"
+CACHE_DIR = os.path.join("data", "eval_cache")
+CACHE_FORMAT_VERSION = 2
+MODELS = ("formula", "forest")
+LABEL_COLUMN = "Flood Risk (%)"
+
+
+# --------------------------------------------------------------
+# Folds
+# --------------------------------------------------------------
+def rolling_origin_folds(days, initial_days=365, horizon_days=90, step_days=None, gap_days=SOIL_MOISTURE_WINDOW,
+                         max_train_days=None):
+    # Row ranges for each fold over sorted day numbers: a dict with
+    # train/test (start, stop) index pairs and their first/last day
+    days = np.asarray(days)
+    step_days = step_days or horizon_days
+    folds = []
+    origin = int(days[0]) + initial_days
+    while True:
+        test_start = origin + gap_days
+        test_stop = test_start + horizon_days
+        if test_stop > int(days[-1]) + 1:
+            break
+        train_first = int(days[0]) if max_train_days is None else max(int(days[0]), origin - max_train_days)
+        train = (int(np.searchsorted(days, train_first)), int(np.searchsorted(days, origin)))
+        test = (int(np.searchsorted(days, test_start)), int(np.searchsorted(days, test_stop)))
+        if train[1] > train[0] and test[1] > test[0]:
+            folds.append({"fold": len(folds) + 1, "train": train, "test": test})
+        origin += step_days
+    return folds
+
+
+# --------------------------------------------------------------
+# Cached feature matrices
+# --------------------------------------------------------------
+def feature_matrices(store, location, start_date=None, end_date=None, cache_dir=CACHE_DIR):
+    # Directory with X.npy (FEATURE_COLUMNS, soil moisture not yet
+    # scaled) and days.npy for the location's stored days; rebuilt only
+    # when the store's index or the range changes
+    index_file = os.path.join(store.root, location, "index.json")
+    if not os.path.exists(index_file):
+        raise ValueError(f"No stored features for {location!r} in {store.root}; run train_flood_model.py first")
+    with open(index_file, "rb") as f:
+        digest = hashlib.sha256(f.read())
+    digest.update(f"{start_date}|{end_date}|{CACHE_FORMAT_VERSION}".encode())
+    path = os.path.join(cache_dir, f"{location}-{digest.hexdigest()[:12]}")
+    if os.path.exists(os.path.join(path, "meta.json")):
+        return path
+
+    daily = store.range(location, start_date, end_date)
+    tmp = path + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    np.save(os.path.join(tmp, "X.npy"), daily[FEATURE_COLUMNS].to_numpy(dtype=np.float64))
+    np.save(os.path.join(tmp, "days.npy"), daily["date"].to_numpy().astype("datetime64[D]").astype(np.int64))
+    # meta.json is written last, so a half-built cache is never used
+    meta = {"format": CACHE_FORMAT_VERSION, "location": location, "features": FEATURE_COLUMNS,
+            "rows": len(daily), "start": str(start_date), "end": str(end_date)}
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return path
+
+
+def load_matrices(path):
+    # (X, days, meta), the arrays memory-mapped read-only
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in ("X", "days")]
+    return (*arrays, meta)
+
+
+def fold_matrices(X, features, train, test):
+    # (X_train, y_train, X_test, y_test) for one fold: soil moisture
+    # scaled and the label computed with the training days' bounds only
+    (a, b), (c, d) = train, test
+    train_days = pd.DataFrame(np.asarray(X[a:b]), columns=features)
+    bounds = (train_days["Soil Moisture"].min(), train_days["Soil Moisture"].max())
+    rainfall_max = train_days["Rainfall"].max()
+
+    matrices = []
+    for days in (train_days, pd.DataFrame(np.asarray(X[c:d]), columns=features)):
+        days = add_flood_risk_label(normalize_soil_moisture(days, bounds), rainfall_max)
+        matrices += [days[features].to_numpy(dtype=np.float32), days[LABEL_COLUMN].to_numpy(dtype=np.float64)]
+    return matrices
+
+
+# --------------------------------------------------------------
+# Scoring one fold (worker side)
+# --------------------------------------------------------------
+def _formula_predict(X, features):
+    # The app's formula takes (rainfall, humidity, temperature, soil)
+    column = {name: i for i, name in enumerate(features)}
+    inputs = [X[:, column[name]] for name in ("Rainfall", "Humidity", "Temperature", "Soil Moisture")]
+    return calculate_flood_probability_batch(*inputs) * 100
+
+
+def evaluate_fold(matrices_path, fold, model_name, n_jobs=1):
+    if model_name not in MODELS:
+        raise ValueError(f"Unknown model {model_name!r}; expected one of {', '.join(MODELS)}")
+    X, days, meta = load_matrices(matrices_path)
+    (a, b), (c, d) = fold["train"], fold["test"]
+    X_train, y_train, X_test, y_test = fold_matrices(X, meta["features"], fold["train"], fold["test"])
+    stages = StageRecorder({"model": model_name, "fold": fold["fold"]})
+    if model_name == "forest":
+        with stages("fit", rows=b - a):
+            model = fit_forest(X_train, y_train, n_estimators=200, max_depth=12, n_jobs=n_jobs)
+        with stages("predict", rows=d - c):
+            y_pred = model.predict(X_test)
+    else:
+        with stages("predict", rows=d - c):
+            y_pred = _formula_predict(X_test, meta["features"])
+
+    as_date = lambda i: str(np.datetime64(int(days[i]), "D"))
+    timings = stages.timings
+    return {
+        "model": model_name,
+        "fold": fold["fold"],
+        "train_rows": b - a,
+        "test_rows": d - c,
+        "train_period": [as_date(a), as_date(b - 1)],
+        "test_period": [as_date(c), as_date(d - 1)],
+        "r2": float(r2_score(y_test, y_pred)) if d - c > 1 else None,
+        "rmse": float(np.sqrt(mean_squared_error(y_test, y_pred))),
+        "fit_s": timings.get("fit", 0.0),
+        "predict_s": timings["predict"],
+        "records": stages.records,
+    }
+
+
+# --------------------------------------------------------------
+# Harness
+# --------------------------------------------------------------
+def summarize(results):
+    # Per model: mean/std of R² and RMSE over folds, total timings
+    summary = {}
+    for model_name in dict.fromkeys(r["model"] for r in results):
+        rows = [r for r in results if r["model"] == model_name]
+        r2 = np.array([r["r2"] for r in rows if r["r2"] is not None], dtype=np.float64)
+        rmse = np.array([r["rmse"] for r in rows], dtype=np.float64)
+        summary[model_name] = {
+            "folds": len(rows),
+            "r2_mean": float(r2.mean()) if len(r2) else None,
+            "r2_std": float(r2.std()) if len(r2) else None,
+            "rmse_mean": float(rmse.mean()),
+            "rmse_std": float(rmse.std()),
+            "fit_s": float(sum(r["fit_s"] for r in rows)),
+            "predict_s": float(sum(r["predict_s"] for r in rows)),
+        }
+    return summary
+
+
+def evaluate_models(location=DEFAULT_LOCATION, models=MODELS, start_date=None, end_date=None, initial_days=365,
+                    horizon_days=90, step_days=None, gap_days=SOIL_MOISTURE_WINDOW, max_train_days=None,
+                    workers=None, features_dir=DEFAULT_STORE_DIR, cache_dir=CACHE_DIR, stages=None):
+    stages = stages or StageRecorder({"location": location})
+    store = FeatureStore(features_dir)
+    with stages("matrices") as stage:
+        path = feature_matrices(store, location, start_date, end_date, cache_dir)
+        _, days, meta = load_matrices(path)
+        stage.rows = meta["rows"]
+    folds = rolling_origin_folds(days, initial_days, horizon_days, step_days, gap_days, max_train_days)
+    if not folds:
+        raise ValueError(f"{meta['rows']} days of {location} are too few for a {initial_days}-day initial window "
+                         f"and a {horizon_days}-day horizon")
+
+    # Largest fits first, so the pool isn't left waiting on one long fold
+    tasks = sorted(((fold, m) for fold in folds for m in models),
+                   key=lambda t: (t[1] != "forest", -(t[0]["train"][1] - t[0]["train"][0])))
+    workers = min(len(tasks), workers or os.cpu_count() or 1)
+    n_jobs = tree_jobs(workers)
+    with stages("folds", rows=len(tasks)):
+        if workers == 1:
+            results = [evaluate_fold(path, fold, m, n_jobs) for fold, m in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(evaluate_fold, path, fold, m, n_jobs) for fold, m in tasks]
+                results = [f.result() for f in futures]
+
+    results.sort(key=lambda r: (models.index(r["model"]), r["fold"]))
+    for r in results:
+        stages.extend(r.pop("records"))
+    return {
+        "location": location,
+        "rows": meta["rows"],
+        "matrices": path,
+        "settings": {"initial_days": initial_days, "horizon_days": horizon_days, "step_days": step_days or horizon_days,
+                     "gap_days": gap_days, "max_train_days": max_train_days, "workers": workers},
+        "folds": results,
+        "summary": summarize(results),
+    }
+
+
+def print_report(report):
+    s = report["settings"]
+    window = "expanding" if s["max_train_days"] is None else f"sliding {s['max_train_days']}-day"
+    print(f"\n📊 {report['location']} — {report['rows']} days, {window} training window, "
+          f"test {s['horizon_days']} days every {s['step_days']} days, gap {s['gap_days']} days")
+    print(f"{'model':<8} {'fold':>4} {'train rows':>10} {'test period':<23} {'R²':>7} {'RMSE':>7} "
+          f"{'fit s':>7} {'predict s':>9}")
+    for r in report["folds"]:
+        r2 = f"{r['r2']:7.3f}" if r["r2"] is not None else f"{'-':>7}"
+        print(f"{r['model']:<8} {r['fold']:>4} {r['train_rows']:>10} {' → '.join(r['test_period']):<23} {r2} "
+              f"{r['rmse']:7.3f} {r['fit_s']:7.2f} {r['predict_s']:9.4f}")
+
+    print(f"\n{'model':<8} {'folds':>5} {'R² mean ± std':>16} {'RMSE mean ± std':>16} {'fit s':>7} {'predict s':>9}")
+    for name, m in report["summary"].items():
+        r2 = f"{m['r2_mean']:.3f} ± {m['r2_std']:.3f}" if m["r2_mean"] is not None else "-"
+        print(f"{name:<8} {m['folds']:>5} {r2:>16} {m['rmse_mean']:>8.3f} ± {m['rmse_std']:<5.3f} "
+              f"{m['fit_s']:7.2f} {m['predict_s']:9.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling-origin time-series evaluation of the flood models")
+    parser.add_argument("--location", default=DEFAULT_LOCATION, help="feature store location (slug)")
+    parser.add_argument("--models", nargs="+", choices=MODELS, default=list(MODELS))
+    parser.add_argument("--start", default=None, help="first day to use (default: first stored day)")
+    parser.add_argument("--end", default=None, help="last day to use (default: last stored day)")
+    parser.add_argument("--initial-days", type=int, default=365, help="training days before the first origin")
+    parser.add_argument("--horizon", type=int, default=90, help="test days per fold")
+    parser.add_argument("--step", type=int, default=None, help="days between origins (default: the horizon)")
+    parser.add_argument("--gap", type=int, default=SOIL_MOISTURE_WINDOW, help="days skipped between train and test")
+    parser.add_argument("--max-train-days", type=int, default=None, help="sliding instead of expanding window")
+    parser.add_argument("--workers", type=int, default=None, help="folds evaluated in parallel")
+    parser.add_argument("--features-dir", default=DEFAULT_STORE_DIR, help="feature store root")
+    parser.add_argument("--json", metavar="PATH", help="also write the report here")
+    parser.add_argument("--metrics", metavar="PATH", help="append per-stage JSON lines here ('-' for stdout)")
+    args = parser.parse_args()
+
+    stages = StageRecorder({"location": args.location})
+    start = time.perf_counter()
+    report = evaluate_models(args.location, tuple(args.models), args.start, args.end, args.initial_days, args.horizon,
+                             args.step, args.gap, args.max_train_days, args.workers, args.features_dir,
+                             stages=stages)
+    print_report(report)
+    print(f"\n⏱️ {len(report['folds'])} fold fits on {report['settings']['workers']} worker(s) in "
+          f"{time.perf_counter() - start:.2f}s (matrices: {report['matrices']})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📁 Report written to {args.json}")
+    if args.metrics:
+        stages.write_jsonl(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Model Registry
+# --------------------------------------------------------------
+# Loads a joblib-pickled estimator (flood_model.pkl) once per
+# process, memory-mapping its NumPy arrays, and shares it across
+# every Streamlit session and API thread. The file's mtime/size
+# is re-checked at most every `check_interval` seconds; when it
+# changes (e.g. train_flood_model.py wrote a new model) the new
+# estimator is loaded and swapped in without a restart.
+# ==============================================================
+
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import joblib
+
+logger = logging.getLogger("hydropredict.models")
+
+DEFAULT_MODEL_FILE = "flood_model.pkl"
+
+
+def _file_version(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+class ModelRegistry:
+    def __init__(self, path, check_interval=2.0, mmap_mode="r"):
+        self.path = os.path.abspath(path)
+        self.check_interval = check_interval
+        self.mmap_mode = mmap_mode
+
+        self._lock = threading.Lock()
+        self._model = None
+        self._stamp = None  # (mtime_ns, size) of the loaded file
+        self._last_check = float("-inf")
+
+        self.version = None
+        self.loaded_at = None
+        self.load_seconds = None
+        self.load_count = 0
+        self.load_errors = 0
+        self.last_error = None
+
+    def get(self):
+        # Returns the current model (or None if no model file exists),
+        # reloading first if the file changed since the last check
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self.refresh()
+        return self._model
+
+    def refresh(self, force=False):
+        with self._lock:
+            self._last_check = time.monotonic()
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                if self._model is None and self.last_error is None:
+                    self.last_error = f"{self.path} not found"
+                    logger.warning("Model file %s not found", self.path)
+                return False
+
+            stamp = (st.st_mtime_ns, st.st_size)
+            if stamp == self._stamp and not force:
+                return False
+
+            start = time.perf_counter()
+            try:
+                model = joblib.load(self.path, mmap_mode=self.mmap_mode)
+                version = _file_version(self.path)
+            except Exception as e:
+                # Usually a file still being written; keep serving the
+                # previous model and retry on the next check
+                self.load_errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.error("Failed to load model %s: %s", self.path, self.last_error)
+                return False
+
+            previous = self.version
+            self._model = model
+            self._stamp = stamp
+            self.version = version
+            self.loaded_at = time.time()
+            self.load_seconds = time.perf_counter() - start
+            self.load_count += 1
+            self.last_error = None
+
+        if previous is None:
+            logger.info("Loaded model %s (version %s) in %.3fs", self.path, version, self.load_seconds)
+        else:
+            logger.info("Hot-swapped model %s: %s → %s in %.3fs", self.path, previous, version, self.load_seconds)
+        return True
+
+    def metrics(self):
+        return {
+            "path": self.path,
+            "model_type": type(self._model).__name__ if self._model is not None else None,
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+            "load_count": self.load_count,
+            "load_errors": self.load_errors,
+            "last_error": self.last_error,
+        }
+
+
+# =====================================================
+# PROCESS-WIDE REGISTRIES
+# =====================================================
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(path=DEFAULT_MODEL_FILE, check_interval=2.0):
+    key = os.path.abspath(path)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = ModelRegistry(key, check_interval=check_interval)
+        return registry
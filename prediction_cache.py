@@ -0,0 +1,177 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Prediction Cache
+# --------------------------------------------------------------
+# Tab 2's inputs are whole numbers (rainfall 0–600 mm, humidity 0–100%,
+# temperature 10–45 °C, soil moisture 0–100%) and real requests cluster
+# around a handful of typical days, so the same four numbers get scored
+# over and over. PredictionCache memoizes the flood probability keyed
+# on the quantized (rainfall, humidity, temperature, soil) tuple:
+#
+#   - a bounded LRU (OrderedDict) per model, shared by every session
+#     in the server process (get_prediction_cache)
+#   - hit / miss / eviction / invalidation counters (metrics())
+#   - tagged with the model version: a lookup with a different version
+#     (the registry hot-swapped the model) empties the cache first
+#
+# The formula can also be served from a dense table. A table over the
+# whole input grid would hold 601 × 101 × 36 × 101 ≈ 221M entries
+# (1.6 GiB as float64) and still need the formula off the grid, but
+# the formula is a sum of one term per input, so four per-axis tables
+# (839 entries, built by flood_engine.formula_terms) added in the
+# formula's own order give bit-identical results for every grid point.
+#
+#   cache = get_prediction_cache("formula", dense=True)
+#   probability = cache.get((200, 70, 28, 40), calculate_flood_probability)
+#
+#   registry = get_registry("flood_features_model.pkl")
+#   model = registry.get()
+#   probability = get_prediction_cache("flood_features_model.pkl").get(
+#       inputs, lambda *x: predict_flood_probability_model(model, *x)[0], version=registry.version)
+# ==============================================================
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from flood_engine import LIGHT_RAIN_MM, formula_terms
+
+DEFAULT_MAX_ENTRIES = 4096
+
+# Tab 2's number_input bounds, i.e. the dense table's grid
+INPUT_RANGES = {
+    "rainfall": (0, 600),
+    "humidity": (0, 100),
+    "temperature": (10, 45),
+    "soil": (0, 100),
+}
+
+
+def quantize(inputs):
+    # Tab 2's resolution: whole units
+    return tuple(int(round(float(v))) for v in inputs)
+
+
+class FormulaTable:
+    # calculate_flood_probability over INPUT_RANGES from per-axis terms
+    def __init__(self):
+        axes = [np.arange(low, high + 1) for low, high in INPUT_RANGES.values()]
+        rainfall_term, humidity_term, soil_term, temperature_term = formula_terms(*axes)
+        # Python lists indexed by the input itself (temperature offset by
+        # its minimum): scalar lookups skip NumPy's per-call overhead
+        self._rainfall = rainfall_term.tolist()
+        self._humidity = humidity_term.tolist()
+        self._temperature = temperature_term.tolist()
+        self._soil = soil_term.tolist()
+        self._t_min = INPUT_RANGES["temperature"][0]
+
+    @property
+    def nbytes(self):
+        return 8 * (len(self._rainfall) + len(self._humidity) + len(self._temperature) + len(self._soil))
+
+    def lookup(self, key):
+        # The probability for a quantized key, or None off the grid
+        rainfall, humidity, temperature, soil = key
+        t = temperature - self._t_min
+        if not (0 <= rainfall < len(self._rainfall) and 0 <= humidity < len(self._humidity)
+                and 0 <= t < len(self._temperature) and 0 <= soil < len(self._soil)):
+            return None
+        if rainfall < LIGHT_RAIN_MM:
+            return 0.0
+        # Same order and clipping as calculate_flood_probability_batch
+        score = self._rainfall[rainfall] + self._humidity[humidity] + self._soil[soil] + self._temperature[t]
+        return min(max(score, 0.0), 1.0)
+
+
+class PredictionCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, dense_table=None):
+        self.max_entries = max_entries
+        self.dense_table = dense_table
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.version = None
+
+        self.hits = 0
+        self.misses = 0
+        self.dense_hits = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, inputs, compute, version=None):
+        # The cached probability for `inputs`, else compute(*key) on the
+        # quantized key, remembered under `version`
+        key = quantize(inputs)
+        if self.dense_table is not None:
+            probability = self.dense_table.lookup(key)
+            if probability is not None:
+                with self._lock:
+                    self.dense_hits += 1
+                return probability
+
+        with self._lock:
+            if version != self.version:
+                self._invalidate(version)
+            probability = self._entries.get(key)
+            if probability is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return probability
+            self.misses += 1
+
+        # Computed outside the lock, so one slow prediction doesn't hold
+        # up other sessions' hits; a concurrent miss just computes twice
+        probability = float(compute(*key))
+        with self._lock:
+            if version == self.version:
+                self._entries[key] = probability
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return probability
+
+    def _invalidate(self, version):
+        if self.version is not None or self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self.version = version
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.dense_hits
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "dense_hits": self.dense_hits,
+                "hit_rate": (self.hits + self.dense_hits) / lookups if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "dense_table_bytes": self.dense_table.nbytes if self.dense_table is not None else None,
+            }
+
+
+# =====================================================
+# PROCESS-WIDE CACHES
+# =====================================================
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_prediction_cache(name, max_entries=DEFAULT_MAX_ENTRIES, dense=False):
+    # One cache per model name; dense=True (formula only) adds the
+    # per-axis table in front of the LRU when the cache is created
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = PredictionCache(max_entries, FormulaTable() if dense else None)
+        return cache
+
+
+def prediction_cache_metrics():
+    with _caches_lock:
+        caches = dict(_caches)
+    return {name: cache.metrics() for name, cache in caches.items()}
@@ -0,0 +1,202 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Gridded City-Wide Risk Raster
+# --------------------------------------------------------------
+# Scores whole weather grids (rainfall, humidity, temperature, soil
+# moisture; H x W cells, optionally T timesteps) with the batch
+# flood formula, one tile of rows at a time so memory stays bounded
+# however large the grid is. The result is written as a compact
+# integer raster plus a JSON sidecar:
+#
+#   data/risk/mumbai.npy    (T, H, W) uint16, probability / 0.0001
+#   data/risk/mumbai.json   shape, bounds, scale, nodata, ...
+#
+# Row 0 is the northern edge (lat_max), column 0 the western edge.
+# The map tab overlays the latest timestep and the router drops
+# roads through cells at or above its flood threshold.
+#
+#   python risk_raster.py --input-dir grids/ --bounds 18.89 19.27 72.77 72.99
+# ==============================================================
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from flood_engine import calculate_flood_probability_batch
+
+DEFAULT_RASTER = os.path.join("data", "risk", "mumbai.npy")
+DEFAULT_TILE_ROWS = 128
+RASTER_FORMAT_VERSION = 1
+GRID_INPUTS = ("rainfall", "humidity", "temperature", "soil")
+
+# dtype -> (probability per step, nodata value)
+RASTER_DTYPES = {
+    "uint8": (0.01, 255),       # 1% steps
+    "uint16": (0.0001, 65535),  # 0.01% steps
+}
+
+
+def meta_path(raster_path):
+    return os.path.splitext(raster_path)[0] + ".json"
+
+
+def encode_probability(probability, dtype="uint16"):
+    scale, nodata = RASTER_DTYPES[dtype]
+    steps = np.rint(probability / scale)
+    return np.where(np.isnan(steps), nodata, steps).astype(dtype)
+
+
+def decode_probability(encoded, dtype="uint16"):
+    scale, nodata = RASTER_DTYPES[dtype]
+    probability = encoded.astype(np.float64) * scale
+    probability[encoded == nodata] = np.nan
+    return probability
+
+
+def _as_timesteps(grid):
+    grid = np.asarray(grid)
+    return grid[np.newaxis] if grid.ndim == 2 else grid
+
+
+def score_grids(rainfall, humidity, temperature, soil, out, dtype="uint16", tile_rows=DEFAULT_TILE_ROWS):
+    # Fills `out` (T, H, W) tile by tile; inputs may be memory maps
+    grids = [_as_timesteps(g) for g in (rainfall, humidity, temperature, soil)]
+    n_steps, n_rows, _ = out.shape
+    for t in range(n_steps):
+        for r0 in range(0, n_rows, tile_rows):
+            tile = [g[t, r0:r0 + tile_rows] for g in grids]
+            out[t, r0:r0 + tile_rows] = encode_probability(calculate_flood_probability_batch(*tile), dtype)
+    return out
+
+
+def write_risk_raster(path, rainfall, humidity, temperature, soil, bounds,
+                      dtype="uint16", tile_rows=DEFAULT_TILE_ROWS, source=None):
+    grids = [_as_timesteps(g) for g in (rainfall, humidity, temperature, soil)]
+    shape = grids[0].shape
+    for name, grid in zip(GRID_INPUTS, grids):
+        if grid.shape != shape:
+            raise ValueError(f"{name} grid has shape {grid.shape}, expected {shape}")
+    lat_min, lat_max, lon_min, lon_max = bounds
+    if not (lat_min < lat_max and lon_min < lon_max):
+        raise ValueError(f"Invalid bounds: {bounds}")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp.npy"
+    out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=shape)
+    score_grids(*grids, out=out, dtype=dtype, tile_rows=tile_rows)
+    out.flush()
+    del out
+
+    scale, nodata = RASTER_DTYPES[dtype]
+    meta = {
+        "format": RASTER_FORMAT_VERSION,
+        "dtype": dtype,
+        "scale": scale,
+        "nodata": nodata,
+        "shape": list(shape),
+        "bounds": [lat_min, lat_max, lon_min, lon_max],
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source": source,
+    }
+    # Both files are swapped in whole, the meta first; readers key on
+    # both mtimes (raster_stamp), so they re-read after each swap
+    tmp_meta = meta_path(path) + ".tmp"
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_meta, meta_path(path))
+    os.replace(tmp_path, path)
+    return meta
+
+
+class RiskRaster:
+    def __init__(self, path=DEFAULT_RASTER):
+        with open(meta_path(path), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.path = path
+        self.data = np.load(path, mmap_mode="r")
+        self.dtype = self.meta["dtype"]
+        self.lat_min, self.lat_max, self.lon_min, self.lon_max = self.meta["bounds"]
+        self.version = "-".join(map(str, raster_stamp(path)))
+
+    @property
+    def n_steps(self):
+        return self.data.shape[0]
+
+    def sample(self, lats, lons, t=-1):
+        # Risk % of the cell containing each point; NaN outside the raster
+        n_rows, n_cols = self.data.shape[1:]
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+        lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        rows = np.floor((self.lat_max - lats) / (self.lat_max - self.lat_min) * n_rows)
+        cols = np.floor((lons - self.lon_min) / (self.lon_max - self.lon_min) * n_cols)
+        inside = (rows >= 0) & (rows < n_rows) & (cols >= 0) & (cols < n_cols)
+
+        risk = np.full(len(lats), np.nan)
+        encoded = self.data[t][rows[inside].astype(np.intp), cols[inside].astype(np.intp)]
+        risk[inside] = decode_probability(encoded, self.dtype) * 100
+        return risk
+
+    def overlay_image(self, t=-1, max_side=512):
+        # Strided RGBA preview for the map: green (dry) -> yellow -> red,
+        # transparent where there is no data or no risk
+        step = max(1, int(np.ceil(max(self.data.shape[1:]) / max_side)))
+        probability = decode_probability(np.asarray(self.data[t, ::step, ::step]), self.dtype)
+        p = np.nan_to_num(probability, nan=0.0)
+
+        rgba = np.zeros(p.shape + (4,), dtype=np.uint8)
+        rgba[..., 0] = np.clip(p * 2, 0, 1) * 255
+        rgba[..., 1] = np.clip(2 - p * 2, 0, 1) * 255
+        rgba[..., 3] = np.where(np.isnan(probability) | (p == 0), 0, 160)
+        return rgba
+
+    def overlay_bounds(self):
+        return [[self.lat_min, self.lon_min], [self.lat_max, self.lon_max]]
+
+
+def raster_stamp(path=DEFAULT_RASTER):
+    # (raster mtime, meta mtime) in ns, or None without a raster; a
+    # cache key that changes whenever either file is replaced
+    try:
+        return os.stat(path).st_mtime_ns, os.stat(meta_path(path)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def load_risk_raster(path=DEFAULT_RASTER):
+    # None when no raster has been computed yet
+    if not (os.path.exists(path) and os.path.exists(meta_path(path))):
+        return None
+    return RiskRaster(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score gridded weather into a city-wide flood risk raster")
+    parser.add_argument("--input-dir", required=True,
+                        help="Directory with rainfall.npy, humidity.npy, temperature.npy and soil.npy "
+                             "(H x W or T x H x W, row 0 = north)")
+    parser.add_argument("--bounds", type=float, nargs=4, required=True,
+                        metavar=("LAT_MIN", "LAT_MAX", "LON_MIN", "LON_MAX"))
+    parser.add_argument("--output", default=DEFAULT_RASTER)
+    parser.add_argument("--dtype", choices=sorted(RASTER_DTYPES), default="uint16")
+    parser.add_argument("--tile-rows", type=int, default=DEFAULT_TILE_ROWS)
+    args = parser.parse_args()
+
+    grids = [np.load(os.path.join(args.input_dir, f"{name}.npy"), mmap_mode="r") for name in GRID_INPUTS]
+
+    print(f"🌧️ Scoring grids from {args.input_dir} ...")
+    start = time.perf_counter()
+    meta = write_risk_raster(args.output, *grids, bounds=args.bounds, dtype=args.dtype,
+                             tile_rows=args.tile_rows, source=os.path.abspath(args.input_dir))
+    elapsed = time.perf_counter() - start
+
+    cells = int(np.prod(meta["shape"]))
+    print(f"✅ Wrote {args.output} {tuple(meta['shape'])} {args.dtype} "
+          f"({os.path.getsize(args.output) / 2**20:.1f} MiB)")
+    print(f"⏱️ {cells:,} cells in {elapsed:.2f}s ({cells / elapsed:,.0f} cells/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Offline Evacuation Routing
+# --------------------------------------------------------------
+# Loads a local road network from two CSV files:
+#
+#   nodes.csv  node_id, lat, lon
+#   edges.csv  u, v, length_m        (undirected, u/v are node_ids)
+#
+# into a CSR adjacency matrix, then runs ONE multi-source Dijkstra
+# from every shelter at once. That single pass gives each road node
+# its nearest reachable shelter, the road distance to it and a
+# predecessor pointer, so a route query is just "snap to the nearest
+# node and follow predecessors" — no per-query search.
+#
+# A route's total_m is the road distance plus the straight-line legs
+# from the start point onto the graph and from the graph to the
+# shelter (snap_m).
+#
+# Roads through flooded nodes (risk at or above a threshold) can be
+# dropped before the precomputation.
+#
+#   graph = RoadGraph.from_csv("data/roads/nodes.csv", "data/roads/edges.csv")
+#   router = EvacuationRouter(graph, shelter_lats, shelter_lons)
+#   route = router.route(19.07, 72.88)
+# ==============================================================
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import dijkstra
+from sklearn.neighbors import BallTree
+
+from shelters import EARTH_RADIUS_KM
+
+DEFAULT_ROADS_DIR = os.path.join("data", "roads")
+DEFAULT_FLOOD_THRESHOLD = 70.0
+
+# A zero-weight entry can be dropped by sparse cleanups, which would
+# silently delete the road, so coincident nodes get a 1 mm edge instead
+MIN_EDGE_LENGTH_M = 1e-3
+
+
+def _file_digest(*paths):
+    digest = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class RoadGraph:
+    def __init__(self, lat, lon, edge_u, edge_v, edge_length, version=None):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.edge_u = np.asarray(edge_u, dtype=np.int32)
+        self.edge_v = np.asarray(edge_v, dtype=np.int32)
+        self.edge_length = np.maximum(np.asarray(edge_length, dtype=np.float64), MIN_EDGE_LENGTH_M)
+        self.version = version
+        self.adjacency = self._build_csr(self.edge_u, self.edge_v, self.edge_length)
+        self._node_tree = None
+
+    def _build_csr(self, u, v, length):
+        # Both directions, keeping only the shortest of any parallel edges
+        # (csr_array would otherwise sum duplicates)
+        rows = np.concatenate([u, v])
+        cols = np.concatenate([v, u])
+        weights = np.concatenate([length, length])
+        order = np.lexsort((weights, cols, rows))
+        rows, cols, weights = rows[order], cols[order], weights[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        n = len(self.lat)
+        return csr_array((weights[first], (rows[first], cols[first])), shape=(n, n))
+
+    @classmethod
+    def from_csv(cls, nodes_path, edges_path):
+        nodes = pd.read_csv(nodes_path)
+        edges = pd.read_csv(edges_path)
+        for path, frame, needed in ((nodes_path, nodes, {"node_id", "lat", "lon"}),
+                                    (edges_path, edges, {"u", "v", "length_m"})):
+            missing = needed - set(frame.columns)
+            if missing:
+                raise ValueError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+
+        # Map arbitrary node ids (e.g. OSM ids) to 0..n-1
+        node_ids = nodes["node_id"].to_numpy()
+        order = np.argsort(node_ids)
+        sorted_ids = node_ids[order]
+        u_pos = np.searchsorted(sorted_ids, edges["u"].to_numpy())
+        v_pos = np.searchsorted(sorted_ids, edges["v"].to_numpy())
+        u_pos = np.minimum(u_pos, len(sorted_ids) - 1)
+        v_pos = np.minimum(v_pos, len(sorted_ids) - 1)
+        known = (sorted_ids[u_pos] == edges["u"].to_numpy()) & (sorted_ids[v_pos] == edges["v"].to_numpy())
+        if not known.all():
+            raise ValueError(f"{edges_path} has {int((~known).sum())} edges with unknown node ids")
+
+        return cls(
+            nodes["lat"].to_numpy(), nodes["lon"].to_numpy(),
+            order[u_pos], order[v_pos], edges["length_m"].to_numpy(),
+            version=_file_digest(nodes_path, edges_path),
+        )
+
+    @property
+    def n_nodes(self):
+        return len(self.lat)
+
+    @property
+    def n_edges(self):
+        return len(self.edge_u)
+
+    def nearest_nodes(self, lats, lons):
+        # Snaps points to their closest road node (straight-line distance)
+        if self._node_tree is None:
+            self._node_tree = BallTree(np.radians(np.column_stack([self.lat, self.lon])), metric="haversine")
+        points = np.radians(np.column_stack([np.atleast_1d(lats), np.atleast_1d(lons)]))
+        dist, idx = self._node_tree.query(points, k=1)
+        return idx[:, 0], dist[:, 0] * EARTH_RADIUS_KM * 1000
+
+    def without_flooded(self, node_risk, threshold=DEFAULT_FLOOD_THRESHOLD):
+        # Drops every road touching a node whose flood risk (%) is at or
+        # above threshold; NaN risk counts as dry
+        flooded = np.asarray(node_risk, dtype=np.float64) >= threshold
+        keep = ~(flooded[self.edge_u] | flooded[self.edge_v])
+        graph = RoadGraph(self.lat, self.lon, self.edge_u[keep], self.edge_v[keep], self.edge_length[keep],
+                          version=None if self.version is None else f"{self.version}-{int(keep.sum())}")
+        graph._node_tree = self._node_tree
+        return graph
+
+
+class EvacuationRouter:
+    def __init__(self, graph, shelter_lats, shelter_lons):
+        self.graph = graph
+        self.shelter_nodes, self.shelter_snap_m = graph.nearest_nodes(shelter_lats, shelter_lons)
+        # One Dijkstra pass seeded from every shelter node at once
+        unique_nodes = np.unique(self.shelter_nodes)
+        self.distance_m, self.predecessor, self.source_node = dijkstra(
+            graph.adjacency, directed=True, indices=unique_nodes,
+            return_predecessors=True, min_only=True,
+        )
+        # Shelter row for each source node (the first shelter snapped to it)
+        self._shelter_at_node = {}
+        for i, node in enumerate(self.shelter_nodes):
+            self._shelter_at_node.setdefault(int(node), i)
+
+    def route(self, lat, lon):
+        # Returns None when no shelter is reachable by road (e.g. cut
+        # off by flooded roads)
+        nodes, snap_m = self.graph.nearest_nodes(lat, lon)
+        node = int(nodes[0])
+        if not np.isfinite(self.distance_m[node]):
+            return None
+
+        path = [node]
+        while self.predecessor[path[-1]] >= 0:
+            path.append(int(self.predecessor[path[-1]]))
+        path = np.asarray(path)
+
+        shelter = self._shelter_at_node[int(self.source_node[node])]
+        road_m = float(self.distance_m[node])
+        # Straight-line legs onto the graph and from its last node to the shelter
+        snap_m = float(snap_m[0] + self.shelter_snap_m[shelter])
+        return {
+            "shelter": shelter,
+            "road_m": road_m,
+            "snap_m": snap_m,
+            "total_m": road_m + snap_m,
+            "nodes": path,
+            "coords": np.column_stack([self.graph.lat[path], self.graph.lon[path]]),
+        }
+
+    def reachable_fraction(self):
+        return float(np.isfinite(self.distance_m).mean())
+
+
+def road_files_stamp(roads_dir=DEFAULT_ROADS_DIR):
+    # (nodes.csv mtime, edges.csv mtime) in ns, or None without a road
+    # network; a cheap cache key that changes when either file is edited
+    try:
+        return tuple(os.stat(os.path.join(roads_dir, name)).st_mtime_ns for name in ("nodes.csv", "edges.csv"))
+    except FileNotFoundError:
+        return None
+
+
+def load_road_graph(roads_dir=DEFAULT_ROADS_DIR):
+    # None when no road network has been provided
+    nodes_path = os.path.join(roads_dir, "nodes.csv")
+    edges_path = os.path.join(roads_dir, "edges.csv")
+    if not (os.path.exists(nodes_path) and os.path.exists(edges_path)):
+        return None
+    return RoadGraph.from_csv(nodes_path, edges_path)
@@ -0,0 +1,390 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Bulk Observation Scorer
+# --------------------------------------------------------------
+# Scores a CSV or Parquet file of observations (one row per ward/day,
+# say) with Tab 2's scoring — the formula or the trained flood.csv
+# model — and writes every input row back out with two extra columns:
+#
+#   Flood Risk (%)   rounded to 2 decimals, as Tab 2 shows it
+#   Safety Band      the safety guide's band for that risk, e.g. "40-50%"
+#
+# The input is never loaded whole. It is cut into chunks (CSV: blocks
+# of whole lines, split without parsing; Parquet: row groups), which a
+# process pool parses, scores and serializes; the parent only writes
+# the results, in input order, as they arrive. At most two chunks per
+# worker are in flight, so memory stays bounded by the chunk size.
+#
+# Input columns are found by Tab 2's labels ("Rainfall (mm)", ...) or
+# the daily feature names ("Rainfall", ...); --rainfall etc. override.
+# Rows with a missing or non-numeric input get empty output columns.
+# CSV -> Parquet writes the four inputs as float64 and every other
+# column as text, so chunks can't disagree on a type.
+# CSV inputs must not have line breaks inside quoted fields.
+#
+#   python score_file.py observations.csv risk_report.csv
+#   python score_file.py wards.parquet wards_scored.parquet --model trained --workers 8
+# ==============================================================
+
+import argparse
+import csv
+import io
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from flood_engine import SAFETY_BANDS, calculate_flood_probability_batch, predict_flood_probability_model, safety_band_id
+from instrumentation import StageRecorder
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FEATURES_MODEL_FILE = "flood_features_model.pkl"
+DEFAULT_CHUNK_ROWS = 200_000
+RISK_COLUMN = "Flood Risk (%)"
+BAND_COLUMN = "Safety Band"
+
+# Accepted input column names per score input, first match wins
+INPUT_COLUMNS = {
+    "rainfall": ("Rainfall (mm)", "Rainfall"),
+    "humidity": ("Humidity (%)", "Humidity"),
+    "temperature": ("Temperature (°C)", "Temperature"),
+    "soil": ("Soil Moisture (%)", "Soil Moisture"),
+}
+
+# Rounded risks are whole hundredths of a percent, so the band label
+# and the CSV text of every possible risk can be looked up, not formatted
+_RISK_STEPS = np.arange(10_001) / 100
+_BAND_LABELS = np.array(
+    [None if (b := safety_band_id(r)) < 0 else f"{SAFETY_BANDS[b][0]}-{SAFETY_BANDS[b][1]}%" for r in _RISK_STEPS],
+    dtype=object,
+)
+_CSV_SUFFIXES = [f",{r:.2f},{label or ''}\n".encode() for r, label in zip(_RISK_STEPS, _BAND_LABELS)]
+_CSV_MISSING = b",,\n"
+
+_settings = None
+
+
+def file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext in (".csv", ".txt"):
+        return "csv"
+    raise ValueError(f"{path}: expected a .csv or .parquet file")
+
+
+def resolve_columns(names, overrides=None):
+    # {input: column name} for the four score inputs
+    overrides = overrides or {}
+    columns = {}
+    for key, candidates in INPUT_COLUMNS.items():
+        if overrides.get(key):
+            candidates = (overrides[key],)
+        found = next((c for c in candidates if c in names), None)
+        if found is None:
+            raise ValueError(f"No {key} column; looked for {', '.join(map(repr, candidates))}")
+        columns[key] = found
+    return columns
+
+
+def load_scoring_model(spec):
+    # None for the formula, else a model with .predict: "trained" is
+    # Tab 2's flood.csv model; a .npz path is a compiled FlatForest
+    if spec == "formula":
+        return None
+    path = FEATURES_MODEL_FILE if spec == "trained" else spec
+    if path.endswith(".npz"):
+        from forest_compiler import load_flat_forest
+        return load_flat_forest(path)
+    from model_registry import get_registry
+    return get_registry(path).get()
+
+
+def score_inputs(model, rainfall, humidity, temperature, soil):
+    # Risk percentages rounded as Tab 2 rounds them; NaN where an input
+    # is missing
+    inputs = np.column_stack([rainfall, humidity, temperature, soil]).astype(np.float64)
+    valid = np.isfinite(inputs).all(axis=1)
+    probability = np.full(len(inputs), np.nan)
+    if valid.any():
+        rows = inputs[valid].T
+        if model is None:
+            probability[valid] = calculate_flood_probability_batch(*rows)
+        else:
+            probability[valid] = predict_flood_probability_model(model, *rows)
+    return np.round(probability * 100, 2)
+
+
+def _risk_steps(risk):
+    steps = np.zeros(len(risk), dtype=np.int64)
+    finite = np.isfinite(risk)
+    steps[finite] = np.rint(risk[finite] * 100).astype(np.int64)
+    return np.where(finite, steps, -1)
+
+
+# --------------------------------------------------------------
+# Chunks (parent side)
+# --------------------------------------------------------------
+def read_csv_header(path):
+    with open(path, "rb") as f:
+        line = f.readline()
+    return line, next(csv.reader([line.decode("utf-8-sig")]))
+
+
+def csv_blocks(path, chunk_rows):
+    # Byte blocks of about chunk_rows whole lines, header excluded; the
+    # block size is estimated from the first MiB of rows
+    with open(path, "rb") as f:
+        f.readline()
+        start = f.tell()
+        sample = f.read(1024 * 1024)
+        f.seek(start)
+        bytes_per_row = len(sample) / max(1, sample.count(b"\n"))
+        block_bytes = max(1, int(bytes_per_row * chunk_rows))
+        while True:
+            block = f.read(block_bytes)
+            if not block:
+                return
+            if not block.endswith(b"\n"):
+                block += f.readline()
+            yield ("csv", block)
+
+
+def parquet_groups(path, chunk_rows):
+    # Row-group lists of about chunk_rows rows (at least one group each)
+    import pyarrow.parquet as pq
+
+    meta = pq.ParquetFile(path).metadata
+    group, rows = [], 0
+    for i in range(meta.num_row_groups):
+        group.append(i)
+        rows += meta.row_group(i).num_rows
+        if rows >= chunk_rows:
+            yield ("parquet", group)
+            group, rows = [], 0
+    if group:
+        yield ("parquet", group)
+
+
+# --------------------------------------------------------------
+# Scoring (worker side)
+# --------------------------------------------------------------
+def init_worker(settings):
+    global _settings
+    _settings = dict(settings, model=load_scoring_model(settings["model"]))
+
+
+def output_schema(names, columns):
+    # CSV -> Parquet: one schema for every chunk, whatever pandas would
+    # infer from each: score inputs float64, every other column string
+    import pyarrow as pa
+
+    inputs = set(columns.values())
+    return pa.schema(
+        [(name, pa.float64() if name in inputs else pa.string()) for name in names]
+        + [(RISK_COLUMN, pa.float64()), (BAND_COLUMN, pa.string())]
+    )
+
+
+def score_chunk(job):
+    # One chunk in, (rows, serialized output) out: CSV bytes without a
+    # header, or a pyarrow Table
+    import pandas as pd
+
+    kind, payload = job
+    s = _settings
+    inputs = list(s["columns"].values())
+
+    if kind == "csv":
+        lines = [line for line in payload.split(b"\n") if line.rstrip(b"\r")]
+        text = io.BytesIO(b"\n".join(lines))
+        if s["output"] == "csv":
+            # Input lines are written back untouched, so only the four
+            # score columns are parsed
+            frame = pd.read_csv(text, header=None, names=s["names"], usecols=inputs, skip_blank_lines=False)
+        else:
+            frame = pd.read_csv(text, header=None, names=s["names"], dtype=str, skip_blank_lines=False)
+        values = [pd.to_numeric(frame[c], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+                  for c in inputs]
+    else:
+        # Kept as Arrow so every row group keeps the file's own schema
+        import pyarrow.parquet as pq
+        table = pq.ParquetFile(s["input"]).read_row_groups(payload)
+        values = [pd.to_numeric(table.column(c).to_pandas(), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+                  for c in inputs]
+    steps = _risk_steps(score_inputs(s["model"], *values))
+
+    if kind == "csv" and s["output"] == "csv":
+        suffixes = [_CSV_SUFFIXES[i] if i >= 0 else _CSV_MISSING for i in steps.tolist()]
+        return len(lines), b"".join(map(bytes.__add__, [line.rstrip(b"\r") for line in lines], suffixes))
+
+    risk = np.where(steps >= 0, steps / 100, np.nan)
+    bands = np.append(_BAND_LABELS, None)[steps]
+    if kind == "csv":
+        import pyarrow as pa
+        for column, column_values in zip(inputs, values):
+            frame[column] = column_values
+        frame[RISK_COLUMN] = risk
+        frame[BAND_COLUMN] = bands
+        return len(frame), pa.Table.from_pandas(frame, schema=output_schema(s["names"], s["columns"]),
+                                                preserve_index=False)
+
+    if s["output"] == "csv":
+        frame = table.to_pandas()
+        frame[RISK_COLUMN] = risk
+        frame[BAND_COLUMN] = pd.array(bands, dtype="string")
+        return len(frame), frame.to_csv(index=False, header=False, lineterminator="\n").encode()
+    import pyarrow as pa
+    table = table.append_column(RISK_COLUMN, pa.array(risk, pa.float64(), from_pandas=True))
+    return table.num_rows, table.append_column(BAND_COLUMN, pa.array(bands, pa.string()))
+
+
+# --------------------------------------------------------------
+# Driver
+# --------------------------------------------------------------
+class _OutputWriter:
+    # Appends chunk results to <path>.tmp and moves it into place on close
+    def __init__(self, path, fmt, csv_header=None):
+        self.path = path
+        self.tmp = path + ".tmp"
+        self.fmt = fmt
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(self.tmp, "wb") if fmt == "csv" else None
+        self.writer = None
+        if csv_header is not None:
+            self.file.write(csv_header)
+
+    def write(self, result):
+        if self.fmt == "csv":
+            self.file.write(result)
+            return
+        import pyarrow.parquet as pq
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.tmp, result.schema)
+        self.writer.write_table(result.cast(self.writer.schema))
+
+    def abort(self):
+        # Drops the partial output after a failed run
+        try:
+            if self.file is not None:
+                self.file.close()
+            if self.writer is not None:
+                self.writer.close()
+        finally:
+            if os.path.exists(self.tmp):
+                os.remove(self.tmp)
+
+    def close(self, empty_columns=()):
+        if self.fmt == "csv":
+            self.file.close()
+        else:
+            if self.writer is None:
+                import pandas as pd
+                pd.DataFrame(columns=list(empty_columns)).to_parquet(self.tmp, index=False)
+            else:
+                self.writer.close()
+        os.replace(self.tmp, self.path)
+
+
+def _children_peak_kib():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def score_file(input_path, output_path, model="formula", workers=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+               overrides=None, stages=None):
+    # Scores input_path into output_path; returns the number of rows
+    workers = workers or os.cpu_count() or 1
+    stages = stages if stages is not None else StageRecorder()
+    in_fmt, out_fmt = file_format(input_path), file_format(output_path)
+
+    if in_fmt == "csv":
+        header_line, names = read_csv_header(input_path)
+        jobs = csv_blocks(input_path, chunk_rows)
+    else:
+        import pyarrow.parquet as pq
+        names = pq.ParquetFile(input_path).schema_arrow.names
+        jobs = parquet_groups(input_path, chunk_rows)
+    settings = {"input": input_path, "names": names, "columns": resolve_columns(names, overrides),
+                "output": out_fmt, "model": model}
+    out_names = [*names, RISK_COLUMN, BAND_COLUMN]
+    csv_header = None
+    if out_fmt == "csv":
+        if in_fmt == "csv":
+            csv_header = header_line.rstrip(b"\r\n") + f",{RISK_COLUMN},{BAND_COLUMN}\n".encode()
+        else:
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerow(out_names)
+            csv_header = buffer.getvalue().encode()
+
+    writer = _OutputWriter(output_path, out_fmt, csv_header)
+    try:
+        with stages("score", rows=0) as stage:
+            def write(result):
+                rows, data = result
+                stage.rows += rows
+                writer.write(data)
+
+            if workers == 1:
+                init_worker(settings)
+                for job in jobs:
+                    write(score_chunk(job))
+            else:
+                with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(settings,)) as pool:
+                    pending = deque()
+                    for job in jobs:
+                        pending.append(pool.submit(score_chunk, job))
+                        if len(pending) >= 2 * workers:
+                            write(pending.popleft().result())
+                    while pending:
+                        write(pending.popleft().result())
+            writer.close(out_names)
+    except BaseException:
+        writer.abort()
+        raise
+
+    record = stages.records[-1]
+    record["workers"] = workers
+    children = _children_peak_kib() if workers > 1 else None
+    record["worker_peak_rss_mib"] = round(children / 1024, 1) if children else None
+    return record["rows"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file of observations with Tab 2's flood model")
+    parser.add_argument("input", help="observations (.csv or .parquet)")
+    parser.add_argument("output", help="scored copy (.csv or .parquet)")
+    parser.add_argument("--model", default="formula",
+                        help="'formula' (default), 'trained' (flood_features_model.pkl), or a .pkl/.npz model path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="scoring processes (1 = in-process)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="approximate rows per chunk")
+    for key in INPUT_COLUMNS:
+        parser.add_argument(f"--{key}", metavar="COLUMN", help=f"input column holding {key}")
+    parser.add_argument("--metrics", metavar="PATH", help="append the run's JSON line here ('-' for stdout)")
+    args = parser.parse_args()
+
+    stages = StageRecorder(context={"input": args.input, "model": args.model})
+    print(f"🌧️ Scoring {args.input} with the {args.model} model on {args.workers} worker(s) ...")
+    rows = score_file(args.input, args.output, model=args.model, workers=args.workers, chunk_rows=args.chunk_rows,
+                      overrides={key: getattr(args, key) for key in INPUT_COLUMNS}, stages=stages)
+    record = stages.records[-1]
+
+    print(f"✅ Wrote {args.output} ({os.path.getsize(args.output) / 2**20:.1f} MiB)")
+    print(f"⏱️ {rows:,} rows in {record['wall_s']:.2f}s ({rows / max(record['wall_s'], 1e-9):,.0f} rows/s)")
+    peak = f"🧠 Peak RSS: {record['peak_rss_mib']} MiB"
+    if record["worker_peak_rss_mib"]:
+        peak += f" (largest worker {record['worker_peak_rss_mib']} MiB)"
+    print(peak)
+    if args.metrics:
+        stages.write_jsonl(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Evacuation Map Rendering
+# --------------------------------------------------------------
+# Builds the Tab 5 folium map (user position, nearest shelters, the
+# evacuation route if a road graph is loaded, and optionally every
+# shelter and the city-wide risk raster) and renders it to a standalone HTML
+# string. The app caches that string per (shelter-set version,
+# position, k), so reruns that don't change the map re-send the
+# same payload instead of rebuilding and re-serializing it.
+#
+# Up to MARKER_LIMIT shelters are drawn as individual markers. Larger
+# sets go through FastMarkerCluster, which ships one compact
+# [lat, lon, name] array and creates/clusters markers in the browser,
+# so the payload grows by a few dozen bytes per shelter instead of
+# ~1 KB of generated JavaScript per marker.
+#
+# Popups are HTML and the map runs in a script-enabled iframe, so
+# shelter names from the CSV are always HTML-escaped first.
+# ==============================================================
+
+from html import escape
+
+import folium
+from folium.plugins import FastMarkerCluster
+
+MAP_ZOOM = 13
+MARKER_LIMIT = 50
+
+# Runs in the browser for each [lat, lon, name] row of FastMarkerCluster
+_CLUSTER_CALLBACK = """
+function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.bindPopup(row[2]);
+    return marker;
+}
+"""
+
+
+def add_all_shelters(m, shelters):
+    if len(shelters) <= MARKER_LIMIT:
+        layer = folium.FeatureGroup(name="All shelters")
+        for s in shelters.itertuples(index=False):
+            folium.CircleMarker([s.lat, s.lon], radius=4, popup=escape(str(s.name)), color="green", fill=True).add_to(layer)
+        layer.add_to(m)
+        return m
+    coords = shelters[["lat", "lon"]].to_numpy(dtype=float).round(6).tolist()
+    rows = [[lat, lon, escape(name)] for (lat, lon), name in zip(coords, shelters["name"].astype(str))]
+    FastMarkerCluster(rows, callback=_CLUSTER_CALLBACK, name="All shelters").add_to(m)
+    return m
+
+
+def add_risk_overlay(m, raster):
+    folium.raster_layers.ImageOverlay(
+        image=raster.overlay_image(),
+        bounds=raster.overlay_bounds(),
+        name="Flood risk",
+        opacity=0.6,
+    ).add_to(m)
+    return m
+
+
+def build_shelter_map(store, lat, lon, k=3, show_all=False, route=None, risk_raster=None):
+    m = folium.Map(location=[lat, lon], zoom_start=MAP_ZOOM)
+    if risk_raster is not None:
+        add_risk_overlay(m, risk_raster)
+    if show_all:
+        add_all_shelters(m, store.shelters)
+
+    if route is not None:
+        folium.PolyLine(
+            route["coords"].tolist(),
+            color="blue",
+            weight=5,
+            tooltip=f"Route: {route['total_m'] / 1000:.2f} km ({route['road_m'] / 1000:.2f} km by road)"
+        ).add_to(m)
+
+    folium.Marker(
+        [lat, lon],
+        popup="You are here",
+        icon=folium.Icon(color="red", icon="user")
+    ).add_to(m)
+
+    for s in store.nearest_frame(lat, lon, k).itertuples(index=False):
+        folium.Marker(
+            [s.lat, s.lon],
+            popup=f"{escape(str(s.name))} ({s.distance_km:.2f} km)",
+            icon=folium.Icon(color="green", icon="home")
+        ).add_to(m)
+    return m
+
+
+def render_map_html(m):
+    return m.get_root().render()
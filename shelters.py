@@ -0,0 +1,70 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Shelter Store with Spatial Index
+# --------------------------------------------------------------
+# Loads evacuation shelters from a CSV (area, name, lat, lon) and
+# answers "nearest k shelters to these lat/lon points" for many
+# points at once, using a BallTree on great-circle (haversine)
+# distance instead of scanning every shelter per query.
+#
+#   store = ShelterStore.from_csv("shelters.csv")
+#   dist_km, idx = store.nearest([19.07, 19.12], [72.88, 72.90], k=3)
+# ==============================================================
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_SHELTERS_CSV = "shelters.csv"
+DEFAULT_AREAS_CSV = "areas.csv"
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class ShelterStore:
+    def __init__(self, shelters, version=None, leaf_size=40):
+        self.shelters = shelters.reset_index(drop=True)
+        self.version = version
+        coords = np.radians(self.shelters[["lat", "lon"]].to_numpy(dtype=np.float64))
+        self._tree = BallTree(coords, metric="haversine", leaf_size=leaf_size)
+
+    @classmethod
+    def from_csv(cls, path=DEFAULT_SHELTERS_CSV):
+        with open(path, "rb") as f:
+            raw = f.read()
+        shelters = pd.read_csv(path)
+        missing = {"name", "lat", "lon"} - set(shelters.columns)
+        if missing:
+            raise ValueError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+        return cls(shelters, version=hashlib.blake2b(raw, digest_size=8).hexdigest())
+
+    def __len__(self):
+        return len(self.shelters)
+
+    def nearest(self, lats, lons, k=3):
+        # Returns (distances_km, indices), both shaped (n_points, k) and
+        # sorted nearest first; indices refer to rows of self.shelters
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+        lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        k = min(k, len(self))
+        points = np.radians(np.column_stack([lats, lons]))
+        dist, idx = self._tree.query(points, k=k, sort_results=True)
+        return dist * EARTH_RADIUS_KM, idx
+
+    def nearest_frame(self, lat, lon, k=3):
+        # Nearest k shelters to one point as a table, for display
+        dist, idx = self.nearest(lat, lon, k)
+        rows = self.shelters.iloc[idx[0]].copy()
+        rows["distance_km"] = dist[0]
+        return rows.reset_index(drop=True)
+
+
+def load_area_centers(path=DEFAULT_AREAS_CSV):
+    areas = pd.read_csv(path)
+    return {row.area: [row.lat, row.lon] for row in areas.itertuples(index=False)}
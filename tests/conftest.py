@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fake_open_meteo import start_fake_server  # noqa: E402
+
+
+@pytest.fixture
+def fake_server():
+    # Factory: start_fake_server(**kwargs), shut down after the test
+    servers = []
+
+    def start(**kwargs):
+        server, base_url = start_fake_server(**kwargs)
+        servers.append(server)
+        return server, base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+from benchmarks.fake_open_meteo import canned_hourly
+from daily_features import build_daily_features_streaming
+from train_flood_model import add_soil_moisture_proxy, build_daily_features
+from weather_store import HOURLY_VARIABLES
+
+
+@pytest.fixture
+def hourly_csv(tmp_path):
+    weather = pd.DataFrame(canned_hourly("2023-05-01", "2023-08-31", HOURLY_VARIABLES))
+    path = tmp_path / "weather_data.csv"
+    weather.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("chunksize", [100, 1_000, 1_000_000])
+def test_streaming_from_csv_matches_the_batch_path(hourly_csv, chunksize):
+    # Chunk sizes that aren't whole days split days across chunks
+    expected = add_soil_moisture_proxy(build_daily_features(pd.read_csv(hourly_csv, parse_dates=["time"])))
+    got = build_daily_features_streaming(str(hourly_csv), chunksize=chunksize)
+    assert len(got) == 123
+    pd.testing.assert_frame_equal(got, expected, check_exact=True)
@@ -0,0 +1,97 @@
+import http.client
+import json
+import threading
+
+import numpy as np
+import pytest
+
+import flood_api
+from flood_api import make_server
+
+
+@pytest.fixture(scope="module")
+def api():
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_port
+    server.shutdown()
+    server.server_close()
+
+
+def _post(port, path, body, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        if headers is None:
+            conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+        else:
+            # Hand-written headers, so Content-Length can be anything
+            conn.putrequest("POST", path)
+            for name, value in headers.items():
+                conn.putheader(name, value)
+            conn.endheaders(body)
+        response = conn.getresponse()
+        raw = response.read()
+        return response.status, json.loads(raw)
+    finally:
+        conn.close()
+
+
+def test_score_one(api):
+    status, body = _post(api, "/score", json.dumps({"rainfall": 200, "humidity": 70, "temperature": 28, "soil": 40}))
+    assert status == 200
+    assert body["risk_percent"] == 47.19 and body["band"] == [40, 50]
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/score", '{"rainfall": null, "humidity": 70, "temperature": 28, "soil": 40}'),
+    ("/score", '{"rainfall": NaN, "humidity": 70, "temperature": 28, "soil": 40}'),
+    ("/score", '{"rainfall": 200, "humidity": Infinity, "temperature": 28, "soil": 40}'),
+    ("/score", '{"rainfall": 200, "humidity": 70, "temperature": "nan", "soil": 40}'),
+    ("/score/batch", '{"rainfall": [200, null], "humidity": [70, 70], "temperature": [28, 28], "soil": [40, 40]}'),
+    ("/score/batch", '{"rainfall": [200, 1], "humidity": [70, 70], "temperature": [28, -Infinity], "soil": [40, 40]}'),
+])
+def test_non_finite_inputs_are_rejected(api, path, body):
+    status, reply = _post(api, path, body)
+    assert status == 400
+    assert reply == {"error": "inputs must be finite numbers"}
+
+
+@pytest.mark.parametrize("length", ["-1", "abc", "1.5"])
+def test_bad_content_length_is_rejected(api, length):
+    status, reply = _post(api, "/score", b"{}", headers={"Content-Length": length})
+    assert status == 400
+    assert reply == {"error": "invalid Content-Length"}
+
+
+@pytest.mark.parametrize("body", [b'\xff\xfe{"x":1}', b"[" * 100_000 + b"]" * 100_000, b"{"])
+def test_undecodable_body_is_rejected(api, body):
+    status, reply = _post(api, "/score", body)
+    assert status == 400
+    assert reply == {"error": "request body is not valid JSON"}
+
+
+def test_unexpected_error_returns_500(api, monkeypatch):
+    def broken(payload):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(flood_api.ROUTES, "/score", broken)
+    status, reply = _post(api, "/score", b"{}")
+    assert status == 500
+    assert reply == {"error": "internal error"}
+
+    # The server keeps answering afterwards
+    monkeypatch.undo()
+    status, _ = _post(api, "/score", json.dumps({"rainfall": 200, "humidity": 70, "temperature": 28, "soil": 40}))
+    assert status == 200
+
+
+def test_single_and_batch_round_half_way_values_alike(api):
+    # Inputs whose probability × 100 lands near a 0.005 boundary
+    rng = np.random.default_rng(5)
+    inputs = {"rainfall": rng.uniform(5, 600, 400).round(3).tolist(), "humidity": rng.uniform(0, 100, 400).tolist(),
+              "temperature": rng.uniform(10, 45, 400).tolist(), "soil": rng.uniform(0, 100, 400).tolist()}
+    _, batch = _post(api, "/score/batch", json.dumps(inputs))
+    for i in range(0, 400, 40):
+        _, one = _post(api, "/score", json.dumps({k: v[i] for k, v in inputs.items()}))
+        assert one["risk_percent"] == batch["risk_percent"][i]
+        assert one["band"] == batch["band"][i]
@@ -0,0 +1,153 @@
+import time
+
+import pytest
+import requests
+
+import live_weather
+from live_weather import MUMBAI, LivePoller, TTLCache
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _poller(base, **kwargs):
+    return LivePoller(*MUMBAI, url=f"{base}/v1/forecast", cache=TTLCache(), **kwargs)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+def test_etag_revalidation_reuses_the_stored_reading(fake_server):
+    server, base = fake_server(update_period=3600)
+    poller = _poller(base)
+
+    poller.poll_once()
+    first = poller.latest()
+    poller.poll_once()
+    second = poller.latest()
+
+    assert server.request_headers[1]["If-None-Match"] == poller._etag
+    assert server.not_modified == 1
+    assert poller.stats["updated"] == 1 and poller.stats["not_modified"] == 1
+    assert second["values"] == first["values"]
+    assert second["fresh"]
+    assert second["fetched_at"] >= first["fetched_at"]
+
+
+def test_if_modified_since_revalidates_without_an_etag(fake_server):
+    server, base = fake_server(update_period=3600)
+    server.send_etag = False
+    poller = _poller(base)
+
+    poller.poll_once()
+    poller.poll_once()
+
+    headers = server.request_headers[1]
+    assert "If-None-Match" not in headers
+    assert headers["If-Modified-Since"] == poller._last_modified
+    assert server.not_modified == 1
+    assert poller.stats["not_modified"] == 1
+
+
+def test_changed_reading_replaces_the_stored_one(fake_server):
+    # A new update bucket means a new ETag, so the 200 overwrites the value
+    server, base = fake_server(update_period=3600)
+    poller = _poller(base)
+    poller.poll_once()
+    old_etag = poller._etag
+
+    server.update_period = 0.001
+    time.sleep(0.01)
+    poller.poll_once()
+
+    assert poller._etag != old_etag
+    assert poller.stats["updated"] == 2 and server.not_modified == 0
+
+
+def test_backoff_delay_grows_exponentially_with_jitter_and_is_capped(monkeypatch):
+    for jitter in (0.5, 1.0):
+        monkeypatch.setattr(live_weather.random, "uniform", lambda a, b, j=jitter: j)
+        delays = [live_weather.backoff_delay(n) for n in range(1, 12)]
+        base = [min(live_weather.MAX_BACKOFF, live_weather.RETRY_BASE * 2 ** (n - 1)) for n in range(1, 12)]
+        assert delays == [b * jitter for b in base]
+    assert base[0] == live_weather.RETRY_BASE and base[-1] == live_weather.MAX_BACKOFF
+
+    monkeypatch.undo()
+    for n in range(1, 12):
+        full = min(live_weather.MAX_BACKOFF, live_weather.RETRY_BASE * 2 ** (n - 1))
+        assert 0.5 * full <= live_weather.backoff_delay(n) <= full
+
+
+def test_poller_backs_off_on_server_errors_then_recovers(fake_server, monkeypatch):
+    server, base = fake_server(fail_requests={1, 2, 3}, update_period=3600)
+    monkeypatch.setattr(live_weather, "RETRY_BASE", 0.01)
+    monkeypatch.setattr(live_weather.random, "uniform", lambda a, b: 1.0)
+    delays = []
+    real_delay = live_weather.backoff_delay
+    monkeypatch.setattr(live_weather, "backoff_delay", lambda n: delays.append(real_delay(n)) or delays[-1])
+
+    poller = _poller(base, interval=60).start()
+    try:
+        _wait_for(lambda: poller.stats["updated"] == 1)
+    finally:
+        poller.stop()
+
+    assert poller.stats["errors"] == 3
+    assert "503" in poller.stats["last_error"]
+    assert delays == [0.01, 0.02, 0.04]
+    assert len(server.requests) == 4
+    assert poller.latest()["fresh"]
+
+
+def test_stale_reading_is_served_while_upstream_is_down(fake_server, monkeypatch):
+    server, base = fake_server(update_period=3600)
+    clock = FakeClock()
+    monkeypatch.setattr(live_weather.time, "time", clock)
+    poller = _poller(base, ttl=60)
+    poller.poll_once()
+    reading = poller.latest()
+
+    server.fail_requests = set(range(2, 100))
+    clock.now += 61
+    with pytest.raises(requests.HTTPError):
+        poller.poll_once()
+
+    stale = poller.latest()
+    assert stale["values"] == reading["values"]
+    assert stale["fetched_at"] == reading["fetched_at"]
+    assert not stale["fresh"]
+
+    server.fail_requests = set()
+    poller.poll_once()
+    assert poller.latest()["fresh"]
+
+
+def test_ttl_cache_expiry_and_touch(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(live_weather.time, "time", clock)
+    cache = TTLCache()
+    assert cache.get("k") is None
+
+    cache.set("k", {"v": 1}, ttl=10)
+    assert cache.get("k") == ({"v": 1}, clock.now, True)
+
+    clock.now += 9.9
+    assert cache.get("k")[2]
+    clock.now += 0.1
+    value, fetched_at, fresh = cache.get("k")
+    assert value == {"v": 1} and not fresh
+
+    cache.touch("k", ttl=10)
+    assert cache.get("k") == ({"v": 1}, clock.now, True)
+    cache.touch("missing", ttl=10)
+    assert cache.get("missing") is None
@@ -0,0 +1,55 @@
+import numpy as np
+
+from model_evaluation import fold_matrices, rolling_origin_folds
+from train_flood_model import FEATURE_COLUMNS
+
+
+def _raw_days(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.gamma(0.5, 20.0, n),     # Rainfall
+        rng.uniform(24, 32, n),      # Temperature
+        rng.uniform(60, 95, n),      # Humidity
+        rng.uniform(0.0, 15.0, n),   # Soil Moisture (raw rolling rainfall)
+    ])
+
+
+def test_training_matrices_do_not_depend_on_the_test_period():
+    X = _raw_days(400)
+    train, test = (0, 300), (307, 400)
+    X_train, y_train, X_test, y_test = fold_matrices(X, FEATURE_COLUMNS, train, test)
+
+    # A record storm and a soaked soil after the origin change nothing
+    # the model is trained on
+    future = X.copy()
+    future[350, 0] = 5000.0
+    future[360, 3] = 500.0
+    X_train2, y_train2, X_test2, y_test2 = fold_matrices(future, FEATURE_COLUMNS, train, test)
+    np.testing.assert_array_equal(X_train, X_train2)
+    np.testing.assert_array_equal(y_train, y_train2)
+    assert not np.array_equal(y_test, y_test2)
+
+
+def test_test_days_are_scaled_with_training_bounds():
+    X = _raw_days(200)
+    X[150:, 3] += 20.0  # wetter than anything seen in training
+    X_train, y_train, X_test, y_test = fold_matrices(X, FEATURE_COLUMNS, (0, 100), (107, 200))
+    soil = FEATURE_COLUMNS.index("Soil Moisture")
+
+    assert X_train[:, soil].min() == 0 and np.isclose(X_train[:, soil].max(), 100)
+    assert X_test[:, soil].max() > 100
+
+    rain, humidity = X[:100, 0], X[:100, 2]
+    low, high = X[:100, 3].min(), X[:100, 3].max()
+    expected = (0.6 * rain / (rain.max() + 1e-9) + 0.3 * (X[:100, 3] - low) / (high - low + 1e-9)
+                + 0.1 * humidity / 100) * 100
+    np.testing.assert_allclose(y_train, expected)
+
+
+def test_rolling_origin_folds_keep_the_gap():
+    days = np.arange(1000)
+    folds = rolling_origin_folds(days, initial_days=365, horizon_days=90, gap_days=7)
+    assert len(folds) == 6
+    for fold in folds:
+        (a, b), (c, d) = fold["train"], fold["test"]
+        assert a == 0 and c - b == 7 and d - c == 90
@@ -0,0 +1,32 @@
+import os
+
+import numpy as np
+
+from risk_raster import load_risk_raster, meta_path, raster_stamp, write_risk_raster
+
+BOUNDS = (18.89, 19.27, 72.77, 72.99)
+
+
+def _grids(shape, rainfall):
+    return np.full(shape, rainfall), np.full(shape, 80.0), np.full(shape, 28.0), np.full(shape, 40.0)
+
+
+def test_rewrite_swaps_both_files_and_changes_the_stamp(tmp_path):
+    path = str(tmp_path / "risk" / "mumbai.npy")
+    assert raster_stamp(path) is None and load_risk_raster(path) is None
+
+    write_risk_raster(path, *_grids((4, 6), 200.0), BOUNDS)
+    first = raster_stamp(path)
+    raster = load_risk_raster(path)
+    assert raster.data.shape == (1, 4, 6) and raster.meta["shape"] == [1, 4, 6]
+
+    os.utime(path, ns=(0, 0))
+    os.utime(meta_path(path), ns=(0, 0))
+    write_risk_raster(path, *_grids((2, 8, 3), 300.0), BOUNDS)
+    second = raster_stamp(path)
+    assert second[0] != first[0] and second[1] != first[1]
+
+    raster = load_risk_raster(path)
+    assert raster.data.shape == (2, 8, 3) and raster.meta["shape"] == [2, 8, 3]
+    assert raster.version == f"{second[0]}-{second[1]}"
+    assert sorted(os.listdir(tmp_path / "risk")) == ["mumbai.json", "mumbai.npy"]
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pytest
+
+from routing import EvacuationRouter, RoadGraph, load_road_graph, road_files_stamp
+from shelters import EARTH_RADIUS_KM
+
+
+def _metres(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * 1000 * np.arcsin(np.sqrt(h))
+
+
+@pytest.fixture
+def line_graph():
+    # Three nodes along a parallel, 1 km of road between neighbours
+    return RoadGraph([19.0, 19.0, 19.0], [72.80, 72.81, 72.82], [0, 1], [1, 2], [1000.0, 1000.0])
+
+
+def test_route_total_includes_both_snap_legs(line_graph):
+    shelter = (19.001, 72.8201)
+    router = EvacuationRouter(line_graph, [shelter[0]], [shelter[1]])
+    start = (18.999, 72.7999)
+    route = router.route(*start)
+
+    to_graph = _metres(*start, 19.0, 72.80)
+    from_graph = _metres(19.0, 72.82, *shelter)
+    assert route["road_m"] == 2000.0
+    assert route["snap_m"] == pytest.approx(to_graph + from_graph, rel=1e-6)
+    assert route["total_m"] == pytest.approx(2000.0 + to_graph + from_graph, rel=1e-6)
+    np.testing.assert_array_equal(route["nodes"], [0, 1, 2])
+
+
+def test_road_files_stamp_changes_when_a_file_is_edited(tmp_path):
+    assert road_files_stamp(str(tmp_path)) is None
+    (tmp_path / "nodes.csv").write_text("node_id,lat,lon\n1,19.0,72.80\n2,19.0,72.81\n")
+    (tmp_path / "edges.csv").write_text("u,v,length_m\n1,2,1000\n")
+    os.utime(tmp_path / "edges.csv", ns=(0, 0))
+    before = road_files_stamp(str(tmp_path))
+
+    (tmp_path / "edges.csv").write_text("u,v,length_m\n1,2,1500\n")
+    after = road_files_stamp(str(tmp_path))
+    assert after[0] == before[0] and after[1] != before[1]
+    assert load_road_graph(str(tmp_path)).edge_length.max() == 1500.0
@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+import pytest
+
+from flood_engine import (
+    SAFETY_BANDS,
+    find_safety_band,
+    safety_band_id,
+    safety_band_ids,
+    safety_guidance_batch,
+    safety_guide,
+)
+
+
+def first_match_band(risk_percent):
+    # The original linear scan over safety_guide the index replaced
+    for (low, high), guide in safety_guide.items():
+        if low <= risk_percent <= high:
+            return (low, high), guide
+    return None
+
+
+@pytest.mark.parametrize("risk, band", [
+    (0, (0, 10)),
+    (10, (0, 10)),
+    (10.01, (10, 20)),
+    (20, (10, 20)),
+    (99.99, (90, 100)),
+    (100, (90, 100)),
+])
+def test_band_edges(risk, band):
+    assert SAFETY_BANDS[safety_band_id(risk)] == band
+    assert SAFETY_BANDS[int(safety_band_ids([risk])[0])] == band
+    assert find_safety_band(risk) == (band, safety_guide[band])
+
+
+@pytest.mark.parametrize("risk", [math.nan, -0.01, -5, 100.01, 250, math.inf, -math.inf])
+def test_out_of_range_has_no_band(risk):
+    assert safety_band_id(risk) == -1
+    assert find_safety_band(risk) is None
+    assert first_match_band(risk) is None
+
+    batch = safety_guidance_batch([risk])
+    assert batch["band_id"][0] == -1
+    assert np.isnan(batch["low"][0]) and np.isnan(batch["high"][0])
+    assert batch["before"][0] is None and batch["during"][0] is None and batch["after"][0] is None
+
+
+def test_scalar_batch_and_find_agree_on_a_dense_grid():
+    grid = np.concatenate([
+        np.round(np.arange(-5, 105.001, 0.01), 2),
+        np.arange(0, 101, dtype=np.float64),
+        [np.nextafter(b, np.inf) for _, b in SAFETY_BANDS],
+        [np.nan],
+    ])
+    ids = safety_band_ids(grid)
+    batch = safety_guidance_batch(grid)
+    np.testing.assert_array_equal(batch["band_id"], ids)
+
+    for risk, band_id, before in zip(grid.tolist(), ids.tolist(), batch["before"]):
+        assert safety_band_id(risk) == band_id
+        expected = first_match_band(risk)
+        assert find_safety_band(risk) == expected
+        if expected is None:
+            assert band_id == -1 and before is None
+        else:
+            assert SAFETY_BANDS[band_id] == expected[0]
+            assert before == expected[1]["Before"]
+
+
+def test_batch_keeps_the_input_shape():
+    risk = np.array([[0.0, 55.5], [101.0, np.nan]])
+    batch = safety_guidance_batch(risk)
+    np.testing.assert_array_equal(batch["band_id"], [[0, 5], [-1, -1]])
+    np.testing.assert_array_equal(batch["low"], [[0, 50], [np.nan, np.nan]])
+    assert batch["during"].shape == (2, 2)
@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+import score_file
+from score_file import BAND_COLUMN, RISK_COLUMN
+
+HEADER = "id,Rainfall (mm),Humidity (%),Temperature (°C),Soil Moisture (%)"
+
+
+@pytest.fixture
+def mixed_csv(tmp_path):
+    # The first chunks look all-integer to pandas; the last one doesn't
+    rows = [HEADER] + [f"{i},{200 + i % 5},80,28,40" for i in range(300)]
+    rows += ["W1,100.5,80,28,40", "W2,abc,80,28,"]
+    path = tmp_path / "observations.csv"
+    path.write_text("\n".join(rows) + "\n")
+    return path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_csv_to_parquet_with_chunks_of_different_dtypes(tmp_path, mixed_csv, workers):
+    out = tmp_path / "scored.parquet"
+    assert score_file.score_file(str(mixed_csv), str(out), workers=workers, chunk_rows=100) == 302
+
+    frame = pd.read_parquet(out)
+    assert frame["Rainfall (mm)"].dtype == "float64"
+    assert frame["id"].tolist()[-2:] == ["W1", "W2"]
+    assert frame["Rainfall (mm)"].iloc[-2] == 100.5
+    assert frame[RISK_COLUMN].iloc[-2] == 43.56 and frame[BAND_COLUMN].iloc[-2] == "40-50%"
+    assert pd.isna(frame[RISK_COLUMN].iloc[-1]) and pd.isna(frame[BAND_COLUMN].iloc[-1])
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["observations.csv", "scored.parquet"]
+
+
+def test_csv_to_csv_matches_csv_to_parquet(tmp_path, mixed_csv):
+    score_file.score_file(str(mixed_csv), str(tmp_path / "a.csv"), workers=1, chunk_rows=100)
+    score_file.score_file(str(mixed_csv), str(tmp_path / "b.parquet"), workers=1, chunk_rows=100)
+    a = pd.read_csv(tmp_path / "a.csv")
+    b = pd.read_parquet(tmp_path / "b.parquet")
+    pd.testing.assert_series_equal(a[RISK_COLUMN], b[RISK_COLUMN])
+    assert a[BAND_COLUMN].fillna("").tolist() == b[BAND_COLUMN].fillna("").tolist()
+
+
+def test_failed_run_leaves_no_partial_output(tmp_path, mixed_csv, monkeypatch):
+    written = []
+    write = score_file._OutputWriter.write
+
+    def failing_write(self, result):
+        written.append(result)
+        if len(written) == 2:
+            raise OSError("disk full")
+        write(self, result)
+
+    monkeypatch.setattr(score_file._OutputWriter, "write", failing_write)
+    for name in ("scored.parquet", "scored.csv"):
+        written.clear()
+        with pytest.raises(OSError):
+            score_file.score_file(str(mixed_csv), str(tmp_path / name), workers=1, chunk_rows=100)
+    assert [p.name for p in tmp_path.iterdir()] == ["observations.csv"]
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shelter_map import MARKER_LIMIT, build_shelter_map, render_map_html
+from shelters import ShelterStore
+
+PAYLOAD = '<img src=x onerror="alert(1)"><script>alert(2)</script>'
+
+
+def _store(n):
+    rng = np.random.default_rng(0)
+    names = [PAYLOAD] + [f"Shelter {i} & Co" for i in range(1, n)]
+    return ShelterStore(pd.DataFrame({
+        "name": names,
+        "lat": 19.07 + rng.uniform(-0.05, 0.05, n),
+        "lon": 72.88 + rng.uniform(-0.05, 0.05, n),
+    }))
+
+
+@pytest.mark.parametrize("n", [5, MARKER_LIMIT + 10])
+def test_shelter_names_are_escaped_in_popups(n):
+    store = _store(n)
+    lat, lon = store.shelters.loc[0, ["lat", "lon"]]
+    html = render_map_html(build_shelter_map(store, lat, lon, k=3, show_all=True))
+    # The cluster rows are embedded as JSON, which spells & < > as \u0026-style escapes
+    html = html.replace("\\u0026", "&").replace("\\u003c", "<").replace("\\u003e", ">")
+
+    assert "<script>alert(2)" not in html
+    assert 'onerror="alert(1)"' not in html and 'onerror=\\"alert(1)\\"' not in html
+    assert "&lt;script&gt;alert(2)&lt;/script&gt;" in html
+    assert "Shelter 1 &amp; Co" in html
@@ -0,0 +1,116 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+import requests
+
+import weather_store
+from benchmarks.fake_open_meteo import canned_hourly
+from weather_store import HOURLY_VARIABLES, WeatherStore
+
+LAT, LON = 19.075984, 72.877656
+START, END = date(2023, 1, 1), date(2023, 6, 30)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    # Records fetch_hourly's backoff delays instead of sleeping
+    delays = []
+    monkeypatch.setattr(weather_store.time, "sleep", delays.append)
+    return delays
+
+
+def _sync(store, url, start=START, end=END):
+    return store.sync(LAT, LON, start, end, url=url, log=lambda msg: None)
+
+
+def _archive_requests(server):
+    return [q for path, q in server.requests if path == "/v1/archive"]
+
+
+def test_cold_sync_stores_one_partition_per_month(tmp_path, fake_server, sleeps):
+    server, base = fake_server()
+    store = WeatherStore("mumbai", root=str(tmp_path))
+
+    fetched = _sync(store, f"{base}/v1/archive")
+
+    assert len(fetched) == 6
+    assert len(_archive_requests(server)) == 6
+    assert [p.rsplit("/", 1)[-1] for p in store.partitions()] == [f"2023-{m:02d}.parquet" for m in range(1, 7)]
+    stored = store.load()
+    expected = canned_hourly(START, END, HOURLY_VARIABLES)
+    assert len(stored) == len(expected["time"])
+    assert stored["precipitation"].tolist() == expected["precipitation"]
+
+
+def test_interrupted_sync_resumes_without_refetching(tmp_path, fake_server, sleeps):
+    # Request 3 and both of its retries fail, so the first sync dies
+    # after storing two months
+    server, base = fake_server(fail_requests={3, 4, 5})
+    url = f"{base}/v1/archive"
+    store = WeatherStore("mumbai", root=str(tmp_path))
+
+    with pytest.raises(requests.HTTPError):
+        _sync(store, url)
+    assert len(store.partitions()) == 2
+    assert not [p for p in tmp_path.rglob("*.tmp")]
+
+    before = len(server.requests)
+    fetched = _sync(store, url)
+
+    assert [d.month for d in fetched] == [3, 4, 5, 6]
+    assert [q["start_date"] for q in _archive_requests(server)[before:]] == [f"2023-{m:02d}-01" for m in range(3, 7)]
+    assert len(store.load()) == len(canned_hourly(START, END, HOURLY_VARIABLES)["time"])
+
+
+def test_resync_when_up_to_date_makes_no_requests(tmp_path, fake_server, sleeps):
+    server, base = fake_server()
+    url = f"{base}/v1/archive"
+    store = WeatherStore("mumbai", root=str(tmp_path))
+    _sync(store, url)
+    mtimes = {p: (tmp_path / p).stat().st_mtime_ns for p in store.partitions()}
+
+    before = len(server.requests)
+    assert _sync(store, url) == []
+    assert len(server.requests) == before
+    assert {p: (tmp_path / p).stat().st_mtime_ns for p in store.partitions()} == mtimes
+
+
+def test_catch_up_after_archive_lag_refetches_only_incomplete_month(tmp_path, fake_server, sleeps):
+    # The archive has only published up to mid-June
+    server, base = fake_server(available_until=date(2023, 6, 15))
+    url = f"{base}/v1/archive"
+    store = WeatherStore("mumbai", root=str(tmp_path))
+    _sync(store, url)
+    assert store.load()["time"].max() == pd.Timestamp("2023-06-15 23:00")
+    assert store.missing_months(START, END) == [(date(2023, 6, 1), date(2023, 6, 30))]
+
+    server.available_until = None
+    before = len(server.requests)
+    fetched = _sync(store, url)
+
+    assert fetched == [date(2023, 6, 1)]
+    assert [q["start_date"] for q in _archive_requests(server)[before:]] == ["2023-06-01"]
+    assert store.load()["time"].max() == pd.Timestamp("2023-06-30 23:00")
+    assert store.missing_months(START, END) == []
+
+
+def test_server_errors_are_retried_with_exponential_backoff(fake_server, sleeps):
+    server, base = fake_server(fail_requests={1, 2})
+
+    df = weather_store.fetch_hourly(LAT, LON, date(2023, 1, 1), date(2023, 1, 31), url=f"{base}/v1/archive",
+                                    retries=3, backoff=0.5)
+
+    assert len(server.requests) == 3
+    assert sleeps == [0.5, 1.0]
+    assert len(df) == 31 * 24
+
+
+def test_server_errors_give_up_after_the_last_retry(fake_server, sleeps):
+    server, base = fake_server(fail_requests={1, 2, 3})
+
+    with pytest.raises(requests.HTTPError):
+        weather_store.fetch_hourly(LAT, LON, date(2023, 1, 1), date(2023, 1, 31), url=f"{base}/v1/archive",
+                                   retries=3, backoff=1.0)
+    assert len(server.requests) == 3
+    assert sleeps == [1.0, 2.0]
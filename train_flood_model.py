@@ -2,151 +2,419 @@
 # 🌧️ Flood Risk Predictor - Real Data Trainer
 # Author: Kanav Chhabra
 # --------------------------------------------------------------
-# This script automatically downloads Mumbai's real weather data
-# from the Open-Meteo API, processes it into daily features,
-# builds a Random Forest model, and saves flood_model.pkl
+# This script automatically downloads real weather data from the
+# Open-Meteo API for every location in locations.json, processes
+# it into daily features, builds a Random Forest model per
+# location, and saves the models (Mumbai → flood_model.pkl)
+#
+#   python train_flood_model.py
+#   python train_flood_model.py --config locations.json --fit-workers 4
+#   python train_flood_model.py --no-chart --profile cprofile
+#
+# Daily features are kept in the feature store (data/features/), which
+# only builds days it doesn't have yet.
+#
+# Every stage (fetch, features, load, soil moisture, label, fit, evaluate,
+# save, chart) is appended to data/train_metrics.jsonl as one JSON
+# line with wall/CPU seconds, peak RSS and row counts.
 # ==============================================================
 
+import argparse
+import json
 import os
-import requests
+import re
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
 import pandas as pd
 import numpy as np
-from datetime import datetime
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import KFold, RandomizedSearchCV, train_test_split
 from sklearn.metrics import r2_score, mean_squared_error
 import joblib
 
+from daily_features import normalize_soil_moisture
+from feature_store import FeatureStore
+from flood_dataset import TARGET_COLUMN, load_flood_csv
+from flood_engine import FEATURES
+from forest_compiler import export_flat_forest
+from forest_training import fit_forest, fit_forest_sharded, to_float32, tree_jobs, write_shards_from_csv
+from instrumentation import PROFILERS, DEFAULT_PROFILE_DIR, StageRecorder
+from weather_store import WeatherStore
+
 # --------------------------------------------------------------
 # 📍 CONFIGURATION
 # --------------------------------------------------------------
-CITY_NAME = "Mumbai"
-LAT, LON = 19.075984, 72.877656  # Mumbai coordinates
+CONFIG_FILE = "locations.json"
 START_DATE = "2018-01-01"
 END_DATE = datetime.today().strftime("%Y-%m-%d")
 
 DATA_DIR = "data"
-os.makedirs(DATA_DIR, exist_ok=True)
+WEATHER_DIR = os.path.join(DATA_DIR, "weather")
+FEATURES_DIR = os.path.join(DATA_DIR, "features")
+MODELS_DIR = "models"
+
+FEATURE_COLUMNS = ["Rainfall", "Temperature", "Humidity", "Soil Moisture"]
+
+FLOOD_CSV = "flood.csv"
+FEATURES_MODEL_FILE = "flood_features_model.pkl"
+SHARDS_DIR = os.path.join(DATA_DIR, "shards")
+METRICS_FILE = os.path.join(DATA_DIR, "train_metrics.jsonl")
+
+
+def slugify(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def load_locations(path):
+    # Each entry needs name/lat/lon; model_file is optional and
+    # defaults to models/<slug>.pkl
+    with open(path, encoding="utf-8") as f:
+        locations = json.load(f)["locations"]
+    for loc in locations:
+        loc["slug"] = slugify(loc["name"])
+        loc.setdefault("model_file", os.path.join(MODELS_DIR, f"{loc['slug']}.pkl"))
+    return locations
 
-WEATHER_CSV = os.path.join(DATA_DIR, "mumbai_hourly_weather.csv")
-MODEL_FILE = "flood_model.pkl"
 
 # --------------------------------------------------------------
 # ☁️ STEP 1: Download real hourly weather data
 # --------------------------------------------------------------
-def fetch_weather_data(lat, lon, start_date, end_date, file_path):
-    print(f"📡 Fetching real weather data for {CITY_NAME} ({start_date} → {end_date})...")
-    url = "https://archive-api.open-meteo.com/v1/archive"
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "start_date": start_date,
-        "end_date": end_date,
-        "hourly": "temperature_2m,relativehumidity_2m,precipitation",
-        "timezone": "Asia/Kolkata"
-    }
-
-    response = requests.get(url, params=params, timeout=60)
-    response.raise_for_status()
-    data = response.json()
-
-    df = pd.DataFrame({
-        "time": data["hourly"]["time"],
-        "temperature_2m": data["hourly"]["temperature_2m"],
-        "relativehumidity_2m": data["hourly"]["relativehumidity_2m"],
-        "precipitation": data["hourly"]["precipitation"]
-    })
-    df["time"] = pd.to_datetime(df["time"])
-    df.to_csv(file_path, index=False)
-    print(f"✅ Data saved to {file_path}")
-    return df
+# Only months missing from the local Parquet store are requested, so
+# re-runs pick up new days instead of reusing a stale download.
+def fetch_weather_data(location, start_date, end_date, store_dir=WEATHER_DIR):
+    print(f"📡 Syncing real weather data for {location['name']} ({start_date} → {end_date})...")
+    store = WeatherStore(location["slug"], store_dir)
+    store.sync(location["lat"], location["lon"], start_date, end_date)
+    return store
 
-if not os.path.exists(WEATHER_CSV):
-    weather = fetch_weather_data(LAT, LON, START_DATE, END_DATE, WEATHER_CSV)
-else:
-    weather = pd.read_csv(WEATHER_CSV, parse_dates=["time"])
 
 # --------------------------------------------------------------
 # 🌤️ STEP 2: Convert hourly → daily features
 # --------------------------------------------------------------
-weather["date"] = weather["time"].dt.date
-daily = weather.groupby("date").agg(
-    Rainfall=("precipitation", "sum"),
-    Temperature=("temperature_2m", "mean"),
-    Humidity=("relativehumidity_2m", "mean")
-).reset_index()
+# Batch reference path; the pipeline uses the streaming builder in
+# daily_features.py, which produces an identical frame for STEP 2 + 3
+def build_daily_features(weather):
+    weather = weather.copy()
+    weather["date"] = weather["time"].dt.date
+    daily = weather.groupby("date").agg(
+        Rainfall=("precipitation", "sum"),
+        Temperature=("temperature_2m", "mean"),
+        Humidity=("relativehumidity_2m", "mean")
+    ).reset_index()
+
+    daily["date"] = pd.to_datetime(daily["date"])
+    return daily
 
-daily["date"] = pd.to_datetime(daily["date"])
 
 # --------------------------------------------------------------
 # 🌱 STEP 3: Soil Moisture Proxy (if real not available)
 # --------------------------------------------------------------
-daily["Soil Moisture"] = (
-    daily["Rainfall"].rolling(7, min_periods=1).mean()
-)
-# Normalize to 0–100
-daily["Soil Moisture"] = 100 * (
-    daily["Soil Moisture"] - daily["Soil Moisture"].min()
-) / (daily["Soil Moisture"].max() - daily["Soil Moisture"].min() + 1e-9)
+def add_soil_moisture_proxy(daily):
+    daily["Soil Moisture"] = (
+        daily["Rainfall"].rolling(7, min_periods=1).mean()
+    )
+    # Normalize to 0–100
+    daily["Soil Moisture"] = 100 * (
+        daily["Soil Moisture"] - daily["Soil Moisture"].min()
+    ) / (daily["Soil Moisture"].max() - daily["Soil Moisture"].min() + 1e-9)
+    return daily
+
 
 # --------------------------------------------------------------
 # 🌊 STEP 4: Create Flood Risk Label (temporary proxy)
 # --------------------------------------------------------------
 # This will be replaced by real flood incident data later.
-daily["Flood Risk (%)"] = (
-    0.6 * (daily["Rainfall"] / (daily["Rainfall"].max() + 1e-9))
-    + 0.3 * (daily["Soil Moisture"] / 100)
-    + 0.1 * (daily["Humidity"] / 100)
-) * 100
+def add_flood_risk_label(daily, rainfall_max=None):
+    # rainfall_max defaults to these days' own maximum
+    rainfall_max = daily["Rainfall"].max() if rainfall_max is None else rainfall_max
+    daily["Flood Risk (%)"] = (
+        0.6 * (daily["Rainfall"] / (rainfall_max + 1e-9))
+        + 0.3 * (daily["Soil Moisture"] / 100)
+        + 0.1 * (daily["Humidity"] / 100)
+    ) * 100
+    return daily
+
 
 # --------------------------------------------------------------
 # 🧠 STEP 5: Train Random Forest Model
 # --------------------------------------------------------------
-X = daily[["Rainfall", "Temperature", "Humidity", "Soil Moisture"]]
-y = daily["Flood Risk (%)"]
+def train_model(daily, stages=None, n_jobs=-1):
+    stages = stages or StageRecorder()
+    X = to_float32(daily[FEATURE_COLUMNS])
+    y = daily["Flood Risk (%)"].to_numpy()
 
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-model = RandomForestRegressor(
-    n_estimators=200,
-    max_depth=12,
-    random_state=42
-)
-model.fit(X_train, y_train)
+    with stages("fit", rows=len(X_train)):
+        model = fit_forest(X_train, y_train, n_estimators=200, max_depth=12, n_jobs=n_jobs)
 
-y_pred = model.predict(X_test)
-r2 = r2_score(y_test, y_pred)
-rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+    with stages("evaluate", rows=len(X_test)):
+        y_pred = model.predict(X_test)
+    metrics = {
+        "r2": r2_score(y_test, y_pred),
+        "rmse": float(np.sqrt(mean_squared_error(y_test, y_pred))),
+    }
+    return model, metrics
 
-print("\n📊 Model Evaluation:")
-print(f"   R² Score: {r2:.3f}")
-print(f"   RMSE: {rmse:.3f}")
 
 # --------------------------------------------------------------
 # 💾 STEP 6: Save Model and Processed Data
 # --------------------------------------------------------------
-joblib.dump(model, MODEL_FILE)
-daily.to_csv(os.path.join(DATA_DIR, "mumbai_daily_features.csv"), index=False)
+# The daily features themselves are already in the feature store
+def save_outputs(location, model, features_dir=FEATURES_DIR):
+    model_file = location["model_file"]
+    flat_file = os.path.splitext(model_file)[0] + "_flat.npz"
+    os.makedirs(os.path.dirname(model_file) or ".", exist_ok=True)
+
+    joblib.dump(model, model_file)
+    export_flat_forest(model, flat_file)
+    return {"model": model_file, "flat_model": flat_file, "features": os.path.join(features_dir, location["slug"])}
 
-print(f"\n✅ Model saved as '{MODEL_FILE}'")
-print(f"✅ Daily dataset saved to '{DATA_DIR}/mumbai_daily_features.csv'")
 
 # --------------------------------------------------------------
 # 🧭 STEP 7: Feature Importance (Optional Insight)
 # --------------------------------------------------------------
-import matplotlib.pyplot as plt
-import seaborn as sns
+def plot_feature_importance(location, model):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    chart_file = os.path.join(DATA_DIR, f"{location['slug']}_feature_importance.png")
+    sns.barplot(
+        x=model.feature_importances_,
+        y=FEATURE_COLUMNS,
+        palette="viridis"
+    )
+    plt.title(f"Feature Importance in Flood Prediction — {location['name']}")
+    plt.xlabel("Importance")
+    plt.tight_layout()
+    plt.savefig(chart_file)
+    plt.close()
+    return chart_file
+
+
+# --------------------------------------------------------------
+# 🏭 PIPELINE
+# --------------------------------------------------------------
+def fit_location(location, start_date, end_date, store_dir=WEATHER_DIR, chart=True, profile=None,
+                 profile_dir=DEFAULT_PROFILE_DIR, n_jobs=-1, features_dir=FEATURES_DIR):
+    # Runs STEP 2–7 for one location; executed in a worker process, so
+    # the stage records travel back with the result
+    stages = StageRecorder({"location": location["name"]}, profile, profile_dir)
+    features = FeatureStore(features_dir)
+    with stages("features") as stage:
+        # STEP 2 + the rolling half of STEP 3, for days not stored yet
+        weather = WeatherStore(location["slug"], store_dir)
+        stage.rows = features.update_from_weather(location["slug"], weather, start_date, end_date)
+    with stages("load") as stage:
+        daily = features.range(location["slug"], start_date, end_date)
+        stage.rows = len(daily)
+    with stages("soil_moisture", rows=len(daily)):
+        daily = normalize_soil_moisture(daily)
+    with stages("label", rows=len(daily)):
+        daily = add_flood_risk_label(daily)
+    model, metrics = train_model(daily, stages, n_jobs)
+    with stages("save", rows=len(daily)):
+        outputs = save_outputs(location, model, features_dir)
+    outputs["chart"] = None
+    if chart:
+        with stages("chart"):
+            outputs["chart"] = plot_feature_importance(location, model)
+    return {
+        "location": location["name"],
+        "rows": len(daily),
+        "metrics": metrics,
+        "outputs": outputs,
+        "timings": stages.timings,
+        "records": stages.records,
+    }
+
+
+def run_pipeline(locations, start_date, end_date, fetch_workers=8, fit_workers=None, store_dir=WEATHER_DIR,
+                 chart=True, profile=None, profile_dir=DEFAULT_PROFILE_DIR):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    stages = StageRecorder({"location": "all"}, profile, profile_dir)
+
+    with stages("fetch", rows=len(locations)):
+        with ThreadPoolExecutor(max_workers=fetch_workers) as pool:
+            list(pool.map(lambda loc: fetch_weather_data(loc, start_date, end_date, store_dir), locations))
+
+    # Locations fit side by side, so each forest gets its share of the cores
+    workers = min(len(locations), fit_workers or os.cpu_count() or 1)
+    n_jobs = tree_jobs(workers)
+    with stages("fit_all", rows=len(locations)):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(fit_location, loc, start_date, end_date, store_dir, chart, profile, profile_dir,
+                                   n_jobs)
+                       for loc in locations]
+            results = [f.result() for f in futures]
+
+    for r in results:
+        stages.extend(r["records"])
+    return results, stages
+
+
+# --------------------------------------------------------------
+# 🗂️ FLOOD.CSV MODE: train on the app's FEATURES columns
+# --------------------------------------------------------------
+# The app maps (rainfall, humidity, temperature, soil) onto these 10
+# columns with map_user_inputs_to_features_batch, so this model can
+# score the same inputs as the formula model.
+SEARCH_SPACE = {
+    "n_estimators": [100, 200, 300],
+    "max_depth": [8, 12, 16, None],
+    "min_samples_leaf": [1, 2, 5, 10],
+    "max_features": [0.33, 0.5, 1.0],
+}
+
+
+def train_flood_csv_model(csv_path=FLOOD_CSV, n_iter=8, cv_folds=3, search_rows=20_000, n_jobs=-1, stages=None,
+                          shard_rows=None):
+    # shard_rows streams the CSV into memory-mapped shards of that many
+    # rows instead of loading it, holds the last shard out for
+    # evaluation and grows the forest shard by shard (larger-than-RAM data)
+    stages = stages or StageRecorder({"location": "flood.csv"})
+    if shard_rows:
+        with stages("shard") as stage:
+            shards = write_shards_from_csv(csv_path, SHARDS_DIR, FEATURES, TARGET_COLUMN, shard_rows)
+            stage.rows = shards.n_rows
+        if len(shards) < 2:
+            raise ValueError(f"{csv_path} fits in one shard of {shard_rows} rows; drop --out-of-core")
+        train_shards = shards.subset(range(len(shards) - 1))
+        X_train, y_train = next(iter(train_shards))  # the search only needs a sample
+        X_test, y_test = next(iter(shards.subset([len(shards) - 1])))
+    else:
+        with stages("load") as stage:
+            df = load_flood_csv(csv_path, columns=FEATURES + [TARGET_COLUMN])
+            X = df[FEATURES].to_numpy(dtype=np.float32)
+            y = df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+            stage.rows = len(X)
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # Each candidate forest is single-threaded while the search fans its
+    # (candidate × fold) fits out over every core
+    rows = min(search_rows, len(X_train))
+    with stages("search", rows=rows):
+        search = RandomizedSearchCV(
+            RandomForestRegressor(random_state=42, n_jobs=1),
+            SEARCH_SPACE,
+            n_iter=n_iter,
+            cv=KFold(cv_folds, shuffle=True, random_state=42),
+            scoring="neg_root_mean_squared_error",
+            n_jobs=n_jobs,
+            random_state=42,
+            refit=False,
+        )
+        search.fit(X_train[:rows], y_train[:rows])
+
+    # The final refit parallelises over trees instead
+    if shard_rows:
+        with stages("fit", rows=train_shards.n_rows):
+            model = fit_forest_sharded(train_shards, **search.best_params_, n_jobs=n_jobs)
+    else:
+        with stages("fit", rows=len(X_train)):
+            model = fit_forest(X_train, y_train, **search.best_params_, n_jobs=n_jobs)
+
+    with stages("evaluate", rows=len(X_test)):
+        y_pred = model.predict(X_test)
+    metrics = {
+        "r2": r2_score(y_test, y_pred),
+        "rmse": float(np.sqrt(mean_squared_error(y_test, y_pred))),
+        "best_params": search.best_params_,
+        "search_rmse": float(-search.best_score_),
+    }
+    return model, metrics, stages.timings
+
+
+def run_flood_csv_mode(args):
+    print(f"🗂️ Training on {args.flood_csv} using {len(FEATURES)} FEATURES columns...")
+    stages = StageRecorder({"location": "flood.csv"}, args.profile, args.profile_dir)
+    model, metrics, timings = train_flood_csv_model(
+        args.flood_csv, n_iter=args.search_iter, cv_folds=args.cv_folds, search_rows=args.search_rows,
+        stages=stages, shard_rows=args.out_of_core,
+    )
+    with stages("save"):
+        joblib.dump(model, FEATURES_MODEL_FILE)
+        flat_file = os.path.splitext(FEATURES_MODEL_FILE)[0] + "_flat.npz"
+        export_flat_forest(model, flat_file)
+    write_metrics(stages, args.metrics)
+
+    print("\n📊 Model Evaluation:")
+    print(f"   Best params: {metrics['best_params']} (CV RMSE {metrics['search_rmse']:.4f})")
+    print(f"   R² Score: {metrics['r2']:.3f}")
+    print(f"   RMSE: {metrics['rmse']:.4f}")
+    print(f"\n✅ Model saved as '{FEATURES_MODEL_FILE}' (flat: '{flat_file}')")
+    print("\n⏱️ Wall time per stage:")
+    for name, seconds in stages.timings.items():
+        print(f"   {name:<8} {seconds:8.2f}s")
+
+
+def write_metrics(stages, path):
+    # One run_id ties together the lines of a run in the appended file
+    if not path:
+        return
+    run_id = uuid.uuid4().hex[:12]
+    for record in stages.records:
+        record["run_id"] = run_id
+    stages.write_jsonl(path)
+    if path != "-":
+        print(f"\n🧾 {len(stages.records)} stage records appended to '{path}' (run {run_id})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train per-location flood risk models")
+    parser.add_argument("--config", default=CONFIG_FILE, help="JSON file with a 'locations' list")
+    parser.add_argument("--start", default=START_DATE)
+    parser.add_argument("--end", default=END_DATE)
+    parser.add_argument("--fetch-workers", type=int, default=8, help="concurrent Open-Meteo downloads")
+    parser.add_argument("--fit-workers", type=int, default=None, help="processes for feature building and fitting")
+    parser.add_argument("--flood-csv", nargs="?", const=FLOOD_CSV, default=None, metavar="PATH",
+                        help=f"train on flood.csv's FEATURES columns instead (writes {FEATURES_MODEL_FILE})")
+    parser.add_argument("--search-iter", type=int, default=8, help="hyperparameter candidates (flood.csv mode)")
+    parser.add_argument("--cv-folds", type=int, default=3, help="folds per candidate (flood.csv mode)")
+    parser.add_argument("--search-rows", type=int, default=20_000, help="rows used by the search (flood.csv mode)")
+    parser.add_argument("--out-of-core", type=int, default=None, metavar="ROWS",
+                        help="stream the CSV into memory-mapped shards of ROWS rows and fit shard by shard "
+                             "(flood.csv mode, for data larger than RAM)")
+    parser.add_argument("--metrics", default=METRICS_FILE, metavar="PATH",
+                        help="append per-stage JSON lines here ('-' for stdout, '' to disable)")
+    parser.add_argument("--profile", choices=PROFILERS, default=None, help="also profile every stage")
+    parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR, help="where --profile dumps go")
+    parser.add_argument("--no-chart", dest="chart", action="store_false",
+                        help="skip the feature-importance chart (never imports matplotlib/seaborn)")
+    args = parser.parse_args()
+
+    if args.flood_csv:
+        run_flood_csv_mode(args)
+        return
+
+    locations = load_locations(args.config)
+    wall_start = time.perf_counter()
+    results, stages = run_pipeline(
+        locations, args.start, args.end, args.fetch_workers, args.fit_workers,
+        chart=args.chart, profile=args.profile, profile_dir=args.profile_dir,
+    )
+
+    for r in results:
+        print(f"\n📊 {r['location']} — {r['rows']} days")
+        print(f"   R² Score: {r['metrics']['r2']:.3f}")
+        print(f"   RMSE: {r['metrics']['rmse']:.3f}")
+        print(f"   ✅ Model saved as '{r['outputs']['model']}' (flat: '{r['outputs']['flat_model']}')")
+        print(f"   ✅ Daily features stored in '{r['outputs']['features']}'")
+        if r["outputs"]["chart"]:
+            print(f"   📈 Feature importance chart saved as '{r['outputs']['chart']}'")
+        print("   ⏱️ " + "  ".join(f"{k}={v:.2f}s" for k, v in r["timings"].items()))
 
-sns.barplot(
-    x=model.feature_importances_,
-    y=X.columns,
-    palette="viridis"
-)
-plt.title("Feature Importance in Flood Prediction")
-plt.xlabel("Importance")
-plt.tight_layout()
-plt.savefig(os.path.join(DATA_DIR, "feature_importance.png"))
-plt.close()
+    print("\n⏱️ Wall time per stage:")
+    for record in (r for r in stages.records if r["location"] == "all"):
+        print(f"   {record['stage']:<7} {record['wall_s']:8.2f}s")
+    print(f"   {'total':<7} {time.perf_counter() - wall_start:8.2f}s")
+    write_metrics(stages, args.metrics)
 
-print(f"📈 Feature importance chart saved as 'data/feature_importance.png'")
 
+if __name__ == "__main__":
+    main()
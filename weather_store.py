@@ -0,0 +1,149 @@
+# ==============================================================
+# 🌊 HydroPredict AI - Incremental Weather Ingestion
+# --------------------------------------------------------------
+# Keeps a local, month-partitioned Parquet copy of the Open-Meteo
+# hourly archive for one location:
+#
+#   data/weather/<location>/2018-01.parquet
+#   data/weather/<location>/2018-02.parquet
+#   ...
+#
+# sync() only requests months that are missing or incomplete, one
+# month per request, and writes each month atomically as soon as it
+# arrives, so an interrupted run resumes where it stopped.
+# ==============================================================
+
+import os
+import time
+from datetime import timedelta
+
+import pandas as pd
+import requests
+
+ARCHIVE_URL = os.environ.get("OPEN_METEO_ARCHIVE_URL", "https://archive-api.open-meteo.com/v1/archive")
+HOURLY_VARIABLES = ["temperature_2m", "relativehumidity_2m", "precipitation"]
+TIMEZONE = "Asia/Kolkata"
+DEFAULT_STORE_DIR = os.path.join("data", "weather")
+
+
+def month_ranges(start_date, end_date):
+    # Yields (first_day, last_day) for each calendar month in the range,
+    # clipped to start_date/end_date
+    start = pd.Timestamp(start_date).date()
+    end = pd.Timestamp(end_date).date()
+    current = start
+    while current <= end:
+        next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+        yield current, min(next_month - timedelta(days=1), end)
+        current = next_month
+
+
+def fetch_hourly(lat, lon, start_date, end_date, session=None, url=None, retries=3, backoff=1.0, timeout=60):
+    session = session or requests
+    params = {
+        "latitude": lat,
+        "longitude": lon,
+        "start_date": str(start_date),
+        "end_date": str(end_date),
+        "hourly": ",".join(HOURLY_VARIABLES),
+        "timezone": TIMEZONE,
+    }
+    for attempt in range(retries):
+        try:
+            response = session.get(url or ARCHIVE_URL, params=params, timeout=timeout)
+            response.raise_for_status()
+            hourly = response.json()["hourly"]
+            break
+        except (requests.RequestException, KeyError, ValueError):
+            if attempt == retries - 1:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+    df = pd.DataFrame({"time": pd.to_datetime(hourly["time"])})
+    for name in HOURLY_VARIABLES:
+        df[name] = pd.Series(hourly[name], dtype="float64")
+    # The archive lags real time by a few days and returns nulls for
+    # hours it doesn't have yet; drop them so the month stays incomplete
+    has_data = df[HOURLY_VARIABLES].notna().any(axis=1).to_numpy()
+    if has_data.any():
+        df = df.iloc[: has_data.nonzero()[0][-1] + 1]
+    else:
+        df = df.iloc[:0]
+    return df.reset_index(drop=True)
+
+
+class WeatherStore:
+    def __init__(self, location, root=DEFAULT_STORE_DIR):
+        self.location = location
+        self.path = os.path.join(root, location)
+        os.makedirs(self.path, exist_ok=True)
+
+    def _partition_file(self, month_start):
+        return os.path.join(self.path, f"{month_start:%Y-%m}.parquet")
+
+    def partitions(self):
+        return sorted(
+            os.path.join(self.path, name)
+            for name in os.listdir(self.path)
+            if name.endswith(".parquet")
+        )
+
+    def _is_complete(self, first_day, last_day):
+        path = self._partition_file(first_day)
+        if not os.path.exists(path):
+            return False
+        times = pd.read_parquet(path, columns=["time"])["time"]
+        if times.empty:
+            return False
+        return times.iloc[0] <= pd.Timestamp(first_day) and times.iloc[-1] >= pd.Timestamp(last_day) + pd.Timedelta(hours=23)
+
+    def missing_months(self, start_date, end_date):
+        return [(a, b) for a, b in month_ranges(start_date, end_date) if not self._is_complete(a, b)]
+
+    def write_month(self, first_day, df):
+        path = self._partition_file(first_day)
+        tmp = path + ".tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    def sync(self, lat, lon, start_date, end_date, url=None, log=print):
+        missing = self.missing_months(start_date, end_date)
+        if not missing:
+            log(f"✅ Weather store for {self.location} is up to date ({start_date} → {end_date})")
+            return []
+
+        log(f"📡 Fetching {len(missing)} month(s) of weather data for {self.location}...")
+        fetched = []
+        with requests.Session() as session:
+            for first_day, last_day in missing:
+                df = fetch_hourly(lat, lon, first_day, last_day, session=session, url=url)
+                if df.empty:
+                    continue
+                self.write_month(first_day, df)
+                fetched.append(first_day)
+        log(f"✅ Stored {len(fetched)} month(s) under {self.path}")
+        return fetched
+
+    def iter_months(self, start_date=None, end_date=None, columns=None):
+        # Yields one time-ordered hourly frame per stored month, trimmed to
+        # [start_date, end_date]; months outside the range are not read
+        start = pd.Timestamp(start_date) if start_date is not None else None
+        stop = pd.Timestamp(end_date) + pd.Timedelta(days=1) if end_date is not None else None
+        for path in self.partitions():
+            month = pd.Timestamp(os.path.basename(path)[:7] + "-01")
+            if stop is not None and month >= stop:
+                continue
+            if start is not None and month + pd.offsets.MonthBegin(1) <= start:
+                continue
+            df = pd.read_parquet(path, columns=columns)
+            if start is not None:
+                df = df[df["time"] >= start]
+            if stop is not None:
+                df = df[df["time"] < stop]
+            yield df.reset_index(drop=True)
+
+    def load(self, start_date=None, end_date=None, columns=None):
+        frames = list(self.iter_months(start_date, end_date, columns))
+        if not frames:
+            return pd.DataFrame(columns=["time", *HOURLY_VARIABLES])
+        return pd.concat(frames, ignore_index=True)